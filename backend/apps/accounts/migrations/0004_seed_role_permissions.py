@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+PERMISSIONS = {
+    'applications.assign': ('Assign applications to checkers', ['ADMIN']),
+    'applications.change_status': ('Change application status', ['CHECKER', 'ADMIN']),
+    'documents.verify': ('Verify or reject documents', ['CHECKER', 'ADMIN']),
+}
+
+ROLE_NAMES = {
+    'STUDENT': 'Applicant',
+    'CHECKER': 'Reviewer',
+    'ADMIN': 'Administrator',
+}
+
+
+def seed_role_permissions(apps, schema_editor):
+    Role = apps.get_model('accounts', 'Role')
+    Permission = apps.get_model('accounts', 'Permission')
+    RolePermission = apps.get_model('accounts', 'RolePermission')
+
+    for code, (description, role_codes) in PERMISSIONS.items():
+        permission, _ = Permission.objects.get_or_create(code=code, defaults={'description': description})
+        for role_code in role_codes:
+            role, _ = Role.objects.get_or_create(code=role_code, defaults={'name': ROLE_NAMES[role_code]})
+            RolePermission.objects.get_or_create(role=role, permission=permission)
+
+
+def remove_role_permissions(apps, schema_editor):
+    Permission = apps.get_model('accounts', 'Permission')
+    Permission.objects.filter(code__in=PERMISSIONS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_profile_photo_userpreference_usersession'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_role_permissions, remove_role_permissions),
+    ]
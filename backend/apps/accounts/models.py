@@ -1,9 +1,11 @@
 import uuid
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from .session_activity import session_activity
+
 
 class UserRole(models.TextChoices):
     STUDENT = 'STUDENT', 'Student'
@@ -53,14 +55,51 @@ class RolePermission(models.Model):
         return f"{self.role.code} -> {self.permission.code}"
 
 
-def get_default_role():
-    role, _ = Role.objects.get_or_create(
-        code=UserRole.STUDENT,
-        defaults={'name': 'Applicant'}
-    )
+# Process-local copy of the (tiny, rarely changing) roles table, keyed by id
+# for role checks and by code for assigning roles. Role saves and deletes
+# clear it (signals.py); a lookup miss reloads it.
+_role_cache = {'by_id': {}, 'by_code': {}}
+
+
+def clear_role_cache():
+    _role_cache['by_id'] = {}
+    _role_cache['by_code'] = {}
+
+
+def _load_roles():
+    _role_cache['by_id'] = {role.id: role for role in Role.objects.all()}
+
+
+def _remember_role(role):
+    _role_cache['by_code'][role.code] = role
+
+
+def get_cached_role(role_id):
+    """Return the Role for an id from the process-local cache"""
+    if role_id is None:
+        return None
+    role = _role_cache['by_id'].get(role_id)
+    if role is None:
+        _load_roles()
+        role = _role_cache['by_id'].get(role_id)
     return role
 
 
+def get_role(code, name=None):
+    """Return the Role for a code from the cache, creating it if missing"""
+    role = _role_cache['by_code'].get(code)
+    if role is None:
+        role, _ = Role.objects.get_or_create(code=code, defaults={'name': name or code.title()})
+        # Only reuse the row once it is known to be committed, so a rolled
+        # back transaction cannot leave a dangling foreign key in the cache.
+        transaction.on_commit(lambda: _remember_role(role))
+    return role
+
+
+def get_default_role():
+    return get_role(UserRole.STUDENT, 'Applicant')
+
+
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
     
@@ -72,7 +111,7 @@ class UserManager(BaseUserManager):
         if role is None:
             role = get_default_role()
         elif isinstance(role, str):
-            role, _ = Role.objects.get_or_create(code=role, defaults={'name': role.title()})
+            role = get_role(role)
         user = self.model(email=email, role=role, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
@@ -124,21 +163,28 @@ class User(AbstractBaseUser, PermissionsMixin):
         ordering = ['-date_joined']
     
     def __str__(self):
-        role_code = self.role.code if self.role else 'UNKNOWN'
-        return f"{self.email} ({role_code})"
+        return f"{self.email} ({self.role_code or 'UNKNOWN'})"
     
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
     
+    @property
+    def role_code(self):
+        """Role code without a query when the role is not loaded yet"""
+        if User.role.is_cached(self):
+            return self.role.code if self.role else None
+        role = get_cached_role(self.role_id)
+        return role.code if role else None
+    
     def is_student(self):
-        return bool(self.role and self.role.code == UserRole.STUDENT)
+        return self.role_code == UserRole.STUDENT
     
     def is_checker(self):
-        return bool(self.role and self.role.code == UserRole.CHECKER)
+        return self.role_code == UserRole.CHECKER
     
     def is_admin(self):
-        return bool(self.role and self.role.code == UserRole.ADMIN)
+        return self.role_code == UserRole.ADMIN
 
     def save(self, *args, **kwargs):
         if self.role_id is None:
@@ -229,6 +275,36 @@ class UserPreference(models.Model):
         return f"Preferences: {self.user.email}"
 
 
+class UserSessionQuerySet(models.QuerySet):
+    def revoke(self):
+        """
+        Revoke the active sessions in this queryset and blacklist their
+        refresh tokens.
+
+        Runs a constant number of queries however many sessions match: one
+        to collect them, one UPDATE, one to find the outstanding tokens and
+        one ``bulk_create`` of blacklist entries. Returns the number revoked.
+        """
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        # Buffered activity may hold newer refresh jtis than the table
+        session_activity.flush()
+
+        sessions = dict(self.filter(is_active=True).values_list('id', 'refresh_jti'))
+        if not sessions:
+            return 0
+
+        UserSession.objects.filter(id__in=sessions).update(is_active=False, revoked_at=timezone.now())
+        token_ids = OutstandingToken.objects.filter(
+            jti__in=sessions.values()
+        ).values_list('id', flat=True)
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+            ignore_conflicts=True
+        )
+        return len(sessions)
+
+
 class UserSession(models.Model):
     """Track active user sessions for session management"""
 
@@ -240,11 +316,13 @@ class UserSession(models.Model):
     device_label = models.CharField(max_length=120, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
-    last_seen_at = models.DateTimeField(auto_now=True)
+    last_seen_at = models.DateTimeField(default=timezone.now)
     revoked_at = models.DateTimeField(null=True, blank=True)
 
     is_active = models.BooleanField(default=True)
 
+    objects = UserSessionQuerySet.as_manager()
+
     class Meta:
         db_table = 'user_sessions'
         ordering = ['-last_seen_at']
@@ -254,6 +332,6 @@ class UserSession(models.Model):
         ]
 
     def revoke(self):
+        UserSession.objects.filter(pk=self.pk).revoke()
         self.is_active = False
         self.revoked_at = timezone.now()
-        self.save(update_fields=['is_active', 'revoked_at'])
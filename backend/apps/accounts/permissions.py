@@ -1,4 +1,7 @@
 from rest_framework import permissions
+from rest_framework.exceptions import PermissionDenied
+
+from .rbac import permission_matrix
 
 
 class IsAdminRole(permissions.BasePermission):
@@ -14,3 +17,31 @@ class IsReviewerRole(permissions.BasePermission):
 class IsStudentRole(permissions.BasePermission):
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_authenticated and request.user.is_student())
+
+
+class HasPermission(permissions.BasePermission):
+    """
+    Require RBAC permission codes, e.g. ``permission_classes = [HasPermission('applications.assign')]``.
+
+    Checked against the compiled role -> permission matrix, so no queries run per request.
+    Authenticated users without the permission get ``403 {"error": message}``, the
+    shape the API used before these checks moved here; anonymous requests get 401.
+    """
+    message = PermissionDenied.default_detail
+
+    def __init__(self, *codes, message=None):
+        self.codes = frozenset(codes)
+        if message:
+            self.message = message
+
+    def __call__(self):
+        # DRF instantiates permission_classes entries; hand back the configured instance.
+        return self
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        if not permission_matrix.has_permissions(user.role_id, self.codes):
+            raise PermissionDenied({'error': self.message})
+        return True
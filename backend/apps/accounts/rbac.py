@@ -0,0 +1,65 @@
+"""
+Compiled role -> permission matrix.
+
+The ``role_permissions`` table is loaded into each process as
+``{role_id: frozenset(permission codes)}`` so permission checks cost no
+queries. The compiled matrix lives at most ``MATRIX_TTL`` seconds before it
+is rebuilt with one query over that (tiny) table. A change made anywhere,
+even through ``QuerySet.update()`` or raw SQL, reaches every process
+within the TTL, whatever cache backend is configured. Saves and deletes of
+roles, permissions and role permissions also invalidate the local process
+straight away (see signals.py).
+"""
+import time
+from threading import Lock
+
+from django.db import transaction
+
+MATRIX_TTL = 5
+
+
+class PermissionMatrix:
+    def __init__(self, ttl=MATRIX_TTL):
+        self.ttl = ttl
+        self._matrix = None
+        self._compiled_at = 0.0
+        self._lock = Lock()
+
+    def _compile(self):
+        from .models import RolePermission
+
+        matrix = {}
+        for role_id, code in RolePermission.objects.values_list('role_id', 'permission__code'):
+            matrix.setdefault(role_id, set()).add(code)
+        return {role_id: frozenset(codes) for role_id, codes in matrix.items()}
+
+    def _current(self):
+        now = time.monotonic()
+        matrix = self._matrix
+        if matrix is not None and now - self._compiled_at < self.ttl:
+            return matrix
+
+        with self._lock:
+            if self._matrix is None or now - self._compiled_at >= self.ttl:
+                self._matrix = self._compile()
+                self._compiled_at = now
+            return self._matrix
+
+    def permissions_for(self, role_id):
+        return self._current().get(role_id, frozenset())
+
+    def has_permissions(self, role_id, codes):
+        return frozenset(codes) <= self.permissions_for(role_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._matrix = None
+
+
+permission_matrix = PermissionMatrix()
+
+
+def invalidate_permission_matrix():
+    """Recompile in this process now and again once the write commits"""
+    permission_matrix.invalidate()
+    transaction.on_commit(permission_matrix.invalidate)
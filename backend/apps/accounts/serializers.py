@@ -1,13 +1,14 @@
-from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
 from django.contrib.auth import get_user_model
 from .models import (
     StudentProfile, CheckerProfile, UserRole, Role, Permission, RolePermission,
-    UserPreference, UserSession
+    UserPreference, UserSession, get_role
 )
+from .session_activity import session_activity
 
 User = get_user_model()
 
@@ -19,7 +20,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
 
-        refresh = RefreshToken(data['refresh'])
+        refresh = RefreshToken(data['refresh'], verify=False)
         request = self.context.get('request')
         user_agent = request.META.get('HTTP_USER_AGENT', '') if request else ''
         ip_address = ''
@@ -35,6 +36,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             device_label=request.META.get('HTTP_SEC_CH_UA', '') if request else '',
         )
 
+        # The session id rides along in the refresh token (and survives
+        # rotation), so refreshes can record activity without a lookup.
+        refresh['sid'] = str(session.id)
+        data['refresh'] = str(refresh)
         data['session_id'] = str(session.id)
         return data
 
@@ -43,21 +48,33 @@ class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
 
-        refresh = RefreshToken(attrs['refresh'])
-        try:
-            session = UserSession.objects.get(refresh_jti=refresh['jti'])
-        except UserSession.DoesNotExist:
-            return data
-
-        session.last_seen_at = timezone.now()
-        session.save(update_fields=['last_seen_at'])
+        # Already verified by super(); with rotation the old token is now
+        # blacklisted, so decode without verifying again.
+        refresh = RefreshToken(data.get('refresh', attrs['refresh']), verify=False)
+        session_id = refresh.get('sid')
+        if session_id is not None:
+            # The row, not the blacklist, is authoritative: buffered rotation
+            # means the blacklisted jti may not be the newest one.
+            is_active = UserSession.objects.filter(pk=session_id).values_list('is_active', flat=True).order_by().first()
+        else:
+            # Tokens issued before the "sid" claim existed
+            previous = RefreshToken(attrs['refresh'], verify=False)
+            session_id, is_active = UserSession.objects.filter(
+                refresh_jti=previous['jti']
+            ).values_list('id', 'is_active').first() or (None, None)
+            if session_id is None:
+                return data
+        if not is_active:
+            raise InvalidToken('Session has been revoked')
+
+        session_activity.touch(session_id, refresh['jti'])
         return data
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Basic user serializer"""
     full_name = serializers.CharField(read_only=True)
-    role = serializers.CharField(source='role.code', read_only=True)
+    role = serializers.CharField(source='role_code', read_only=True)
     profile_photo_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -120,7 +137,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
         role_code = validated_data.pop('role', UserRole.STUDENT)
-        role, _ = Role.objects.get_or_create(code=role_code, defaults={'name': role_code.title()})
+        role = get_role(role_code)
         
         user = User.objects.create_user(
             password=password,
@@ -149,7 +166,7 @@ class AdminUserCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         password = validated_data.pop('password')
         role_code = validated_data.pop('role')
-        role, _ = Role.objects.get_or_create(code=role_code, defaults={'name': role_code.title()})
+        role = get_role(role_code)
         user = User.objects.create_user(password=password, role=role, **validated_data)
         if role_code == UserRole.STUDENT:
             StudentProfile.objects.get_or_create(user=user)
@@ -175,7 +192,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
     student_profile = StudentProfileSerializer(read_only=True)
     checker_profile = CheckerProfileSerializer(read_only=True)
     full_name = serializers.CharField(read_only=True)
-    role = serializers.CharField(source='role.code', read_only=True)
+    role = serializers.CharField(source='role_code', read_only=True)
     profile_photo_url = serializers.SerializerMethodField()
     preferences = serializers.SerializerMethodField()
     
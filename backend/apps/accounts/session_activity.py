@@ -0,0 +1,102 @@
+"""
+Write-coalescing for ``UserSession.last_seen_at``.
+
+Token refreshes record activity in a process-local buffer instead of saving
+the session row. The buffer is flushed with a single
+``UPDATE ... FROM (VALUES ...)`` when it reaches ``SESSION_ACTIVITY_MAX_BUFFER``
+entries, and otherwise by a timer ``SESSION_ACTIVITY_FLUSH_INTERVAL`` seconds
+after the first buffered entry, so ``last_seen_at`` is never more than that
+interval behind. Pending entries are also flushed at interpreter exit.
+
+The flush carries the latest refresh ``jti`` of each session as well, so
+``refresh_jti`` follows token rotation with the same bounded lag. Because of
+that lag, blacklisting the stored jti is not enough to stop a revoked
+session: refreshes also check the session row's ``is_active`` flag, which
+the flush never sets back.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActivityBuffer:
+    def __init__(self, flush_interval=None, max_size=None):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def get_flush_interval(self):
+        if self.flush_interval is not None:
+            return self.flush_interval
+        return getattr(settings, 'SESSION_ACTIVITY_FLUSH_INTERVAL', 30)
+
+    def get_max_size(self):
+        if self.max_size is not None:
+            return self.max_size
+        return getattr(settings, 'SESSION_ACTIVITY_MAX_BUFFER', 500)
+
+    def touch(self, session_id, refresh_jti, seen_at=None):
+        """Record activity for a session; flushes inline once the buffer is full"""
+        seen_at = seen_at or timezone.now()
+        with self._lock:
+            current = self._pending.get(session_id)
+            if current is None or current[0] <= seen_at:
+                self._pending[session_id] = (seen_at, refresh_jti)
+            full = len(self._pending) >= self.get_max_size()
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.get_flush_interval(), self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connection; don't leak it.
+            connection.close()
+
+    def flush(self):
+        """Write all pending entries in one statement; returns rows updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        values = []
+        params = []
+        for session_id, (seen_at, refresh_jti) in pending.items():
+            values.append('(%s::uuid, %s::timestamptz, %s)')
+            params.extend([str(session_id), seen_at, refresh_jti])
+
+        sql = (
+            'UPDATE user_sessions AS s '
+            'SET last_seen_at = v.seen_at, refresh_jti = v.refresh_jti '
+            f'FROM (VALUES {", ".join(values)}) AS v(id, seen_at, refresh_jti) '
+            'WHERE s.id = v.id AND s.is_active AND s.last_seen_at <= v.seen_at'
+        )
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.rowcount
+        except Exception:
+            logger.exception('Failed to flush %d session activity entries', len(pending))
+            return 0
+
+
+session_activity = SessionActivityBuffer()
+atexit.register(session_activity.flush)
+
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Permission, Role, RolePermission, clear_role_cache
+from .rbac import invalidate_permission_matrix
+
+
+# Signals rather than save()/delete() overrides, so queryset deletes (admin
+# bulk actions) are covered too; bulk_create/update() fall back to MATRIX_TTL
+@receiver([post_save, post_delete], sender=Role)
+def role_changed(sender, instance, **kwargs):
+    clear_role_cache()
+    invalidate_permission_matrix()
+
+
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=RolePermission)
+def permission_changed(sender, instance, **kwargs):
+    invalidate_permission_matrix()
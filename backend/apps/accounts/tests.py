@@ -0,0 +1,292 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import (
+    Permission, Role, RolePermission, User, UserRole, UserSession, clear_role_cache, get_default_role
+)
+from .rbac import MATRIX_TTL, permission_matrix
+from .session_activity import session_activity
+
+
+class RoleResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+
+    def setUp(self):
+        clear_role_cache()
+
+    def test_jwt_requests_do_not_query_roles_once_cached(self):
+        client = APIClient()
+        token = RefreshToken.for_user(self.admin).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        client.get('/api/auth/users/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/auth/users/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['role'], UserRole.ADMIN)
+        self.assertFalse([q for q in ctx.captured_queries if 'FROM "roles"' in q['sql']])
+
+    def test_role_checks_on_fresh_instance_use_cache(self):
+        user = User.objects.get(pk=self.admin.pk)
+        user.is_admin()
+        user = User.objects.get(pk=self.admin.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_admin())
+            self.assertFalse(user.is_student())
+
+    def test_default_role_is_cached_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            role = get_default_role()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_default_role(), role)
+
+
+class PermissionMatrixTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+
+    def setUp(self):
+        permission_matrix.invalidate()
+        self.addCleanup(permission_matrix.invalidate)
+        self.client = APIClient()
+
+    def test_seeded_permissions_gate_assignment(self):
+        self.client.force_authenticate(user=self.checker)
+        response = self.client.post('/api/applications/999/assign/', {'checker_id': self.checker.pk})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {'error': 'Only admins can assign applications'})
+
+        self.client.force_authenticate(user=None)
+        response = self.client.post('/api/applications/999/assign/', {'checker_id': self.checker.pk})
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/applications/999/assign/', {'checker_id': self.checker.pk})
+        self.assertEqual(response.status_code, 404)
+
+    def test_checks_are_query_free_once_compiled(self):
+        permission_matrix.has_permissions(self.admin.role_id, ['applications.assign'])
+        with self.assertNumQueries(0):
+            self.assertTrue(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+            self.assertFalse(permission_matrix.has_permissions(self.checker.role_id, ['applications.assign']))
+
+    def test_role_permission_write_invalidates_matrix(self):
+        self.assertFalse(permission_matrix.has_permissions(self.checker.role_id, ['applications.assign']))
+        RolePermission.objects.create(
+            role=Role.objects.get(code=UserRole.CHECKER),
+            permission=Permission.objects.get(code='applications.assign')
+        )
+        self.assertTrue(permission_matrix.has_permissions(self.checker.role_id, ['applications.assign']))
+
+    def test_changes_without_signals_are_seen_within_the_ttl(self):
+        clock = 'apps.accounts.rbac.time.monotonic'
+        with mock.patch(clock, return_value=1000.0):
+            self.assertTrue(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+
+        # Another process revoking the permission: no signal reaches this one
+        RolePermission.objects.filter(
+            role__code=UserRole.ADMIN, permission__code='applications.assign'
+        )._raw_delete(RolePermission.objects.db)
+
+        with mock.patch(clock, return_value=1000.0 + MATRIX_TTL - 1):
+            self.assertTrue(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+        with mock.patch(clock, return_value=1000.0 + MATRIX_TTL):
+            self.assertFalse(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+
+    def test_queryset_delete_invalidates_matrix(self):
+        self.assertTrue(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+        RolePermission.objects.filter(role__code=UserRole.ADMIN, permission__code='applications.assign').delete()
+        self.assertFalse(permission_matrix.has_permissions(self.admin.role_id, ['applications.assign']))
+
+
+class SessionActivityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Sam', last_name='Student', role=UserRole.STUDENT
+        )
+
+    def setUp(self):
+        session_activity.flush()
+        self.addCleanup(session_activity.flush)
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            '/api/auth/login/', {'email': self.user.email, 'password': 'pass12345'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_refresh_does_not_write_session(self):
+        tokens = self.login()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        # Only the revocation check by primary key; activity is buffered
+        session_queries = [q['sql'] for q in ctx.captured_queries if 'user_sessions' in q['sql']]
+        self.assertEqual(len(session_queries), 1)
+        self.assertTrue(session_queries[0].startswith('SELECT'))
+
+    def test_flush_updates_last_seen_and_rotated_jti(self):
+        tokens = self.login()
+        session = UserSession.objects.get(pk=tokens['session_id'])
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        rotated = RefreshToken(response.data['refresh'], verify=False)
+        self.assertEqual(rotated['sid'], tokens['session_id'])
+
+        self.assertEqual(session_activity.flush(), 1)
+        session.refresh_from_db()
+        self.assertEqual(session.refresh_jti, rotated['jti'])
+        self.assertGreater(session.last_seen_at, session.created_at)
+
+    def test_many_refreshes_coalesce_into_one_row_update(self):
+        tokens = self.login()
+        for _ in range(3):
+            response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+            tokens['refresh'] = response.data['refresh']
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(session_activity.flush(), 1)
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]), 1)
+        session = UserSession.objects.get(pk=tokens['session_id'])
+        self.assertEqual(session.refresh_jti, RefreshToken(tokens['refresh'], verify=False)['jti'])
+
+    def test_flush_skips_revoked_sessions(self):
+        tokens = self.login()
+        self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        UserSession.objects.get(pk=tokens['session_id']).revoke()
+        self.assertEqual(session_activity.flush(), 0)
+
+
+class SessionRevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.students = [
+            User.objects.create_user(
+                email=f'student{i}@example.com', password='pass12345',
+                first_name='Sam', last_name='Student', role=UserRole.STUDENT
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        session_activity.flush()
+        self.addCleanup(session_activity.flush)
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    def login(self, user):
+        response = APIClient().post(
+            '/api/auth/login/', {'email': user.email, 'password': 'pass12345'}, format='json'
+        )
+        return response.data
+
+    def test_revoke_others_blacklists_refresh_tokens(self):
+        student = self.students[0]
+        current = self.login(student)
+        others = [self.login(student) for _ in range(3)]
+        self.client.force_authenticate(user=student)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/auth/sessions/revoke-others/', {'current_session_id': current['session_id']}, format='json'
+            )
+
+        self.assertEqual(response.data['message'], 'Revoked 3 sessions')
+        self.assertEqual(BlacklistedToken.objects.count(), 3)
+        self.assertTrue(UserSession.objects.get(pk=current['session_id']).is_active)
+        for tokens in others:
+            response = APIClient().post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+            self.assertEqual(response.status_code, 401)
+
+    def test_revoke_all_for_role_runs_constant_queries(self):
+        for student in self.students:
+            self.login(student)
+            self.login(student)
+        self.login(self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/auth/sessions/revoke-all/', {'role': UserRole.STUDENT}, format='json')
+
+        self.assertEqual(response.data['revoked'], 6)
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(UserSession.objects.filter(is_active=True).count(), 1)
+
+    def test_revoke_all_for_user(self):
+        self.login(self.students[0])
+        self.login(self.students[1])
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            '/api/auth/sessions/revoke-all/', {'user_id': self.students[0].pk}, format='json'
+        )
+
+        self.assertEqual(response.data['revoked'], 1)
+        self.assertTrue(UserSession.objects.get(user=self.students[1]).is_active)
+
+    def test_revoke_all_requires_admin_and_target(self):
+        self.client.force_authenticate(user=self.students[0])
+        response = self.client.post('/api/auth/sessions/revoke-all/', {'role': UserRole.STUDENT}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/auth/sessions/revoke-all/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/auth/sessions/revoke-all/', {'user_id': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'user_id must be an integer'})
+
+    def test_refresh_rejected_after_revocation_despite_buffered_rotation(self):
+        tokens = self.login(self.students[0])
+        response = APIClient().post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        rotated = response.data['refresh']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSession.objects.filter(pk=tokens['session_id']).revoke()
+
+        response = APIClient().post('/api/auth/token/refresh/', {'refresh': rotated}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_checks_the_session_row_not_the_cache(self):
+        tokens = self.login(self.students[0])
+        response = APIClient().post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        rotated = response.data['refresh']
+
+        # As if revoked by another process: nothing reaches this one's cache
+        UserSession.objects.filter(pk=tokens['session_id']).update(is_active=False, revoked_at=timezone.now())
+        cache.clear()
+
+        response = APIClient().post('/api/auth/token/refresh/', {'refresh': rotated}, format='json')
+        self.assertEqual(response.status_code, 401)
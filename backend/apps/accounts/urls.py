@@ -4,7 +4,7 @@ from .views import (
     CheckerProfileView, ChangePasswordView, UserListView,
     CustomTokenObtainPairView, RoleListView, PermissionListView, RolePermissionListView,
     ChangeEmailView, ProfilePhotoView, UserPreferenceView,
-    UserSessionListView, UserSessionRevokeView, UserSessionRevokeOthersView,
+    UserSessionListView, UserSessionRevokeView, UserSessionRevokeOthersView, UserSessionRevokeAllView,
     CustomTokenRefreshView
 )
 
@@ -25,6 +25,7 @@ urlpatterns = [
     path('sessions/', UserSessionListView.as_view(), name='user-sessions'),
     path('sessions/revoke/<uuid:session_id>/', UserSessionRevokeView.as_view(), name='session-revoke'),
     path('sessions/revoke-others/', UserSessionRevokeOthersView.as_view(), name='session-revoke-others'),
+    path('sessions/revoke-all/', UserSessionRevokeAllView.as_view(), name='session-revoke-all'),
     
     # User Management (Admin)
     path('users/', UserListView.as_view(), name='user-list'),
@@ -13,7 +13,9 @@ from .serializers import (
     UserSessionSerializer, CustomTokenRefreshSerializer
 )
 from .permissions import IsAdminRole
-from .models import StudentProfile, CheckerProfile, Role, Permission, RolePermission, UserPreference, UserSession
+from .models import (
+    StudentProfile, CheckerProfile, Role, Permission, RolePermission, UserPreference, UserSession, UserRole
+)
 
 User = get_user_model()
 
@@ -130,19 +132,45 @@ class UserSessionRevokeOthersView(APIView):
 
     def post(self, request):
         current_session_id = request.data.get('current_session_id')
-        sessions = UserSession.objects.filter(user=request.user, is_active=True)
+        sessions = UserSession.objects.filter(user=request.user)
         if current_session_id:
             sessions = sessions.exclude(id=current_session_id)
-        count = 0
-        for session in sessions:
-            session.revoke()
-            count += 1
+        count = sessions.revoke()
         return Response({'message': f'Revoked {count} sessions'}, status=status.HTTP_200_OK)
 
 
+class UserSessionRevokeAllView(APIView):
+    """Revoke every session of a user or of all users with a role (admin only)"""
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        user_id = request.data.get('user_id')
+        role = request.data.get('role')
+        if bool(user_id) == bool(role):
+            return Response(
+                {'error': 'Provide either user_id or role'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if user_id:
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                return Response({'error': 'user_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            user = get_object_or_404(User, id=user_id)
+            sessions = UserSession.objects.filter(user=user)
+        else:
+            if role not in UserRole.values:
+                return Response({'error': 'Invalid role'}, status=status.HTTP_400_BAD_REQUEST)
+            sessions = UserSession.objects.filter(user__role__code=role)
+
+        count = sessions.revoke()
+        return Response({'message': f'Revoked {count} sessions', 'revoked': count}, status=status.HTTP_200_OK)
+
+
 class UserListView(generics.ListCreateAPIView):
     """List and create users (admin only)"""
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('role').all()
     permission_classes = [IsAdminRole]
 
     def get_serializer_class(self):
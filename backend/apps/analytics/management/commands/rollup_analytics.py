@@ -0,0 +1,34 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.rollups import run_backfill, run_incremental_rollup
+
+
+class Command(BaseCommand):
+    help = 'Compute AnalyticsDaily rollups incrementally, or backfill a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backfill', action='store_true', help='Recompute every day in the range')
+        parser.add_argument('--since', help='Backfill start date (YYYY-MM-DD), defaults to the first event')
+        parser.add_argument('--until', help='Backfill end date (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Days computed per backfill chunk')
+
+    def handle(self, *args, **options):
+        if not options['backfill']:
+            if options['since'] or options['until']:
+                raise CommandError('--since/--until require --backfill')
+            written = run_incremental_rollup()
+            self.stdout.write(self.style.SUCCESS(f'Updated {written} daily rollups'))
+            return
+
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days must be positive')
+        try:
+            since = date.fromisoformat(options['since']) if options['since'] else None
+            until = date.fromisoformat(options['until']) if options['until'] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        written = run_backfill(since, until, chunk_days=options['chunk_days'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {written} daily rollups'))
@@ -1,3 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User, UserRole
+from apps.applications.models import Application, ApplicationEvent, ApplicationEventType, ApplicationStatus
+from apps.reviews.models import Review
+from .models import AnalyticsDaily
+from .rollups import contiguous_ranges, run_backfill, run_incremental_rollup
+
+
+class AnalyticsRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT,
+            date_joined=cls.now - timedelta(days=3)
+        )
+        cls.application = Application.objects.create(
+            student=cls.student, program_name='Computer Science',
+            academic_year='2026-2027', intake_period='Fall 2026',
+            status=ApplicationStatus.SUBMITTED
+        )
+        ApplicationEvent.objects.create(
+            application=cls.application, event_type=ApplicationEventType.SUBMITTED,
+            from_status=ApplicationStatus.DRAFT, to_status=ApplicationStatus.SUBMITTED,
+            actor=cls.student, created_at=cls.now - timedelta(days=2)
+        )
+        review = Review.objects.create(
+            application=cls.application, checker=cls.checker,
+            is_complete=True, submitted_at=cls.now - timedelta(days=1)
+        )
+        Review.objects.filter(pk=review.pk).update(created_at=cls.now - timedelta(days=1, minutes=90))
+
+    def test_backfill_computes_each_day(self):
+        today = timezone.localdate(self.now)
+        written = run_backfill(today - timedelta(days=5), today, chunk_days=2)
+
+        self.assertEqual(written, 6)
+        rows = {row.date: row for row in AnalyticsDaily.objects.all()}
+        self.assertEqual(rows[timezone.localdate(self.now - timedelta(days=3))].new_applicants, 1)
+        self.assertEqual(rows[timezone.localdate(self.now - timedelta(days=2))].total_applications, 1)
+        reviewed = rows[timezone.localdate(self.now - timedelta(days=1))]
+        self.assertEqual(reviewed.reviews_completed, 1)
+        self.assertEqual(float(reviewed.avg_review_time_minutes), 90.0)
+
+    def test_incremental_run_only_touches_new_days(self):
+        run_incremental_rollup()
+        first_day = AnalyticsDaily.objects.order_by('date').first()
+        AnalyticsDaily.objects.filter(pk=first_day.pk).update(new_applicants=99)
+
+        User.objects.create_user(
+            email='late@example.com', password='pass12345',
+            first_name='Late', last_name='Comer', role=UserRole.STUDENT
+        )
+        written = run_incremental_rollup()
+
+        self.assertEqual(written, 1)
+        self.assertEqual(AnalyticsDaily.objects.get(pk=first_day.pk).new_applicants, 99)
+        self.assertEqual(AnalyticsDaily.objects.get(date=timezone.localdate()).new_applicants, 1)
+
+    def test_management_command(self):
+        call_command('rollup_analytics', '--backfill', '--chunk-days', '1', stdout=StringIO())
+        self.assertTrue(AnalyticsDaily.objects.exists())
 
-# Create your tests here.
+    def test_contiguous_ranges(self):
+        today = timezone.localdate()
+        days = {today, today - timedelta(days=1), today - timedelta(days=5)}
+        self.assertEqual(contiguous_ranges(days), [
+            (today - timedelta(days=5), today - timedelta(days=4)),
+            (today - timedelta(days=1), today + timedelta(days=1)),
+        ])
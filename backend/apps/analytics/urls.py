@@ -1,7 +1,10 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import AnalyticsDailyViewSet
+from .views import AnalyticsDailyViewSet, AnalyticsSummaryView
 
 router = DefaultRouter()
 router.register(r'daily', AnalyticsDailyViewSet, basename='analytics-daily')
 
-urlpatterns = router.urls
+urlpatterns = [
+    path('summary/', AnalyticsSummaryView.as_view(), name='analytics-summary'),
+] + router.urls
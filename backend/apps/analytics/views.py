@@ -1,5 +1,8 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from apps.accounts.permissions import IsAdminRole
+from apps.applications.stats import get_summary
 from .models import AnalyticsDaily
 from .serializers import AnalyticsDailySerializer
 
@@ -8,3 +11,11 @@ class AnalyticsDailyViewSet(viewsets.ReadOnlyModelViewSet):
 	queryset = AnalyticsDaily.objects.all()
 	serializer_class = AnalyticsDailySerializer
 	permission_classes = [IsAdminRole]
+
+
+class AnalyticsSummaryView(APIView):
+	"""Dashboard summary computed server-side for the caller's scope"""
+	permission_classes = [permissions.IsAuthenticated]
+
+	def get(self, request):
+		return Response(get_summary(request.user), status=status.HTTP_200_OK)
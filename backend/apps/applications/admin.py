@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Application, ApplicationTimeline
+from .models import Application, ApplicationEvent
 
 
 @admin.register(Application)
@@ -11,10 +11,13 @@ class ApplicationAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
-@admin.register(ApplicationTimeline)
-class ApplicationTimelineAdmin(admin.ModelAdmin):
-    list_display = ('application', 'event_type', 'user', 'created_at')
+@admin.register(ApplicationEvent)
+class ApplicationEventAdmin(admin.ModelAdmin):
+    list_display = ('application', 'event_type', 'from_status', 'to_status', 'actor', 'created_at')
     list_filter = ('event_type',)
     search_fields = ('application__id', 'description')
-    raw_id_fields = ('application', 'user')
+    raw_id_fields = ('application', 'actor')
     date_hierarchy = 'created_at'
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,130 @@
+"""
+Bulk assignment of applications to checkers.
+
+``bulk_assign`` locks the requested applications, picks a checker for each one
+and applies all the assignments as one ``transition_many`` batch, so the
+applications, their status history and timeline entries, and one notification
+per assignment are written with bulk queries in one transaction.
+
+When several checkers are candidates, each application goes to the checker
+with the lowest load, where load starts at ``CheckerProfile.active_reviews``
+and grows with every application handed out in the same call.
+"""
+import heapq
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User, UserRole
+from apps.notifications.models import NotificationType
+from .models import Application, ApplicationEventType, ApplicationStatus
+from .transitions import Transition, transition_many
+
+MAX_BULK_ASSIGN = 5000
+ASSIGNABLE_STATUSES = (ApplicationStatus.SUBMITTED,)
+
+
+def get_candidate_checkers(checker_ids=None):
+    """
+    Checkers eligible for assignment.
+
+    With ``checker_ids`` returns exactly those checkers (availability is the
+    caller's call); otherwise every checker whose profile is available.
+    """
+    checkers = User.objects.filter(role__code=UserRole.CHECKER).select_related('checker_profile')
+    if checker_ids is None:
+        checkers = checkers.filter(checker_profile__is_available=True)
+    else:
+        checkers = checkers.filter(pk__in=checker_ids)
+    return list(checkers)
+
+
+def checker_load(checker):
+    if hasattr(checker, 'checker_profile'):
+        return checker.checker_profile.active_reviews
+    return 0
+
+
+def assign_applications(applications, choose, assigned_by=None):
+    """
+    Assign locked ``applications`` in order and write the results in bulk.
+
+    ``choose(application)`` returns the checker to use, or ``None`` to leave
+    the application alone. Must run inside a transaction. Returns
+    ``{application_id: checker or None}``.
+    """
+    now = timezone.now()
+    chosen = {}
+    transitions = []
+
+    for application in applications:
+        checker = choose(application)
+        chosen[application.pk] = checker
+        if checker is None:
+            continue
+        transitions.append(Transition(
+            application,
+            ApplicationStatus.UNDER_REVIEW,
+            note='Application assigned to checker',
+            event_type=ApplicationEventType.ASSIGNED,
+            description=f'Application assigned to {checker.full_name}',
+            changes={'assigned_checker': checker, 'review_started_at': now},
+            notification={
+                'user': checker,
+                'notification_type': NotificationType.REVIEW_ASSIGNED,
+                'title': 'New Application Assigned',
+                'message': f'Application #{application.id} for {application.program_name} has been assigned to you.',
+            },
+        ))
+
+    if transitions:
+        transition_many(transitions, assigned_by)
+    return chosen
+
+
+def bulk_assign(application_ids, checkers, assigned_by):
+    """
+    Assign applications to the least-loaded of ``checkers``.
+
+    Returns one result dict per distinct application id, in request order:
+    ``{'application_id', 'status': 'assigned', 'checker_id'}`` or
+    ``{'application_id', 'status': 'failed', 'error'}``.
+    """
+    application_ids = list(dict.fromkeys(application_ids))
+    checkers_by_id = {checker.pk: checker for checker in checkers}
+    heap = [(checker_load(checker), checker.pk) for checker in checkers]
+    heapq.heapify(heap)
+
+    def least_loaded(application):
+        load, checker_id = heapq.heappop(heap)
+        heapq.heappush(heap, (load + 1, checker_id))
+        return checkers_by_id[checker_id]
+
+    with transaction.atomic():
+        applications = Application.objects.select_for_update().in_bulk(application_ids)
+        errors = {}
+        eligible = []
+        for application_id in application_ids:
+            application = applications.get(application_id)
+            if application is None:
+                errors[application_id] = 'Application not found'
+            elif application.status not in ASSIGNABLE_STATUSES:
+                errors[application_id] = f'Application is {application.status}, not awaiting assignment'
+            elif not heap:
+                errors[application_id] = 'No checker available'
+            else:
+                eligible.append(application)
+
+        chosen = assign_applications(eligible, least_loaded, assigned_by)
+
+    results = []
+    for application_id in application_ids:
+        if application_id in errors:
+            results.append({'application_id': application_id, 'status': 'failed', 'error': errors[application_id]})
+        else:
+            results.append({
+                'application_id': application_id,
+                'status': 'assigned',
+                'checker_id': chosen[application_id].pk
+            })
+    return results
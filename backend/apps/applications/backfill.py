@@ -0,0 +1,120 @@
+"""
+Backfill of ``application_events`` from the pre-event-log tables.
+
+Before the event log, every status change wrote one row to
+``application_timeline`` and a near-identical one to
+``application_status_history``. ``backfill_chunk`` moves the legacy rows of
+a range of applications into ``application_events``, merging each history
+row with the timeline row written by the same change, and deletes what it
+copied in the same transaction. Each chunk is therefore independent: an
+interrupted run is resumed by running the command again.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+
+from .models import (
+    Application, ApplicationEvent, ApplicationEventType, LegacyApplicationStatusHistory,
+    LegacyApplicationTimeline
+)
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Both legacy rows of one change were written in the same request
+MERGE_WINDOW = timedelta(seconds=5)
+
+
+def legacy_event_type(name, has_status):
+    try:
+        return ApplicationEventType.from_name(name)
+    except ValueError:
+        return ApplicationEventType.STATUS_UPDATED if has_status else ApplicationEventType.NOTE
+
+
+def find_timeline_match(history, timeline_rows):
+    for row in timeline_rows:
+        if (
+            row.previous_status == history.from_status
+            and row.new_status == history.to_status
+            and row.user_id == history.changed_by_id
+            and abs(row.created_at - history.changed_at) <= MERGE_WINDOW
+        ):
+            return row
+    return None
+
+
+def merge_application(timeline_rows, history_rows):
+    """Events for one application's legacy rows, oldest first"""
+    unmatched = sorted(timeline_rows, key=lambda row: (row.created_at, row.pk))
+    events = []
+    for history in sorted(history_rows, key=lambda row: (row.changed_at, row.pk)):
+        row = find_timeline_match(history, unmatched)
+        if row is None:
+            events.append(ApplicationEvent(
+                application_id=history.application_id,
+                event_type=ApplicationEventType.STATUS_UPDATED,
+                from_status=history.from_status,
+                to_status=history.to_status,
+                actor_id=history.changed_by_id,
+                description=f'Status changed from {history.from_status} to {history.to_status}',
+                note=history.note,
+                created_at=history.changed_at,
+            ))
+            continue
+        unmatched.remove(row)
+        events.append(ApplicationEvent(
+            application_id=row.application_id,
+            event_type=legacy_event_type(row.event_type, has_status=True),
+            from_status=history.from_status,
+            to_status=history.to_status,
+            actor_id=row.user_id,
+            description=row.description,
+            note=history.note,
+            created_at=row.created_at,
+        ))
+
+    for row in unmatched:
+        events.append(ApplicationEvent(
+            application_id=row.application_id,
+            event_type=legacy_event_type(row.event_type, has_status=bool(row.new_status)),
+            from_status=row.previous_status,
+            to_status=row.new_status,
+            actor_id=row.user_id,
+            description=row.description,
+            created_at=row.created_at,
+        ))
+    events.sort(key=lambda event: event.created_at)
+    return events
+
+
+def backfill_chunk(after_id=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Move the legacy rows of the next ``chunk_size`` applications after ``after_id``.
+
+    Returns ``(last_application_id, events_written)``, or ``(None, 0)`` once
+    every application has been processed.
+    """
+    application_ids = list(
+        Application.objects.filter(pk__gt=after_id).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+    )
+    if not application_ids:
+        return None, 0
+
+    with transaction.atomic():
+        timeline = {}
+        for row in LegacyApplicationTimeline.objects.select_for_update().filter(application_id__in=application_ids):
+            timeline.setdefault(row.application_id, []).append(row)
+        history = {}
+        for row in LegacyApplicationStatusHistory.objects.select_for_update().filter(
+            application_id__in=application_ids
+        ):
+            history.setdefault(row.application_id, []).append(row)
+
+        events = []
+        for application_id in application_ids:
+            events.extend(merge_application(timeline.get(application_id, []), history.get(application_id, [])))
+        ApplicationEvent.objects.bulk_create(events)
+
+        LegacyApplicationTimeline.objects.filter(application_id__in=application_ids).delete()
+        LegacyApplicationStatusHistory.objects.filter(application_id__in=application_ids).delete()
+    return application_ids[-1], len(events)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.applications.backfill import DEFAULT_CHUNK_SIZE, backfill_chunk
+
+
+class Command(BaseCommand):
+    help = 'Copy the legacy application timeline and status history tables into the event log'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Applications migrated per transaction'
+        )
+
+    def handle(self, *args, **options):
+        after_id = 0
+        total = 0
+        while True:
+            after_id, written = backfill_chunk(after_id, options['chunk_size'])
+            if after_id is None:
+                break
+            total += written
+            if written:
+                self.stdout.write(f'up to application {after_id}: {written} events')
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total} events'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.scheduling import run_scheduler
+
+
+class Command(BaseCommand):
+    help = 'Assign waiting SUBMITTED applications to the least-loaded matching checkers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Applications examined per run')
+        parser.add_argument('--max-load', type=int, help='Open applications a checker may hold')
+
+    def handle(self, *args, **options):
+        for option in ('batch_size', 'max_load'):
+            if options[option] is not None and options[option] < 1:
+                raise CommandError(f'--{option.replace("_", "-")} must be positive')
+
+        result = run_scheduler(batch_size=options['batch_size'], max_load=options['max_load'])
+        if result is None:
+            self.stdout.write('Another scheduler run is in progress; nothing to do')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Assigned {result["assigned"]} applications ({result["waiting"]} left waiting)'
+        ))
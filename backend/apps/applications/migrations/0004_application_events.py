@@ -0,0 +1,117 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    """
+    Replace application_timeline and application_status_history with the
+    application_events log. The old tables are renamed to *_legacy and kept
+    until ``manage.py backfill_application_events`` has copied them over.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('applications', '0003_application_version'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='ApplicationTimeline',
+            new_name='LegacyApplicationTimeline',
+        ),
+        migrations.RenameModel(
+            old_name='ApplicationStatusHistory',
+            new_name='LegacyApplicationStatusHistory',
+        ),
+        migrations.AlterModelTable(
+            name='legacyapplicationtimeline',
+            table='application_timeline_legacy',
+        ),
+        migrations.AlterModelTable(
+            name='legacyapplicationstatushistory',
+            table='application_status_history_legacy',
+        ),
+        migrations.AlterModelOptions(
+            name='legacyapplicationtimeline',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='legacyapplicationstatushistory',
+            options={},
+        ),
+        migrations.RemoveIndex(
+            model_name='legacyapplicationstatushistory',
+            name='application_applica_378995_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='legacyapplicationstatushistory',
+            name='application_changed_f7519b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='legacyapplicationstatushistory',
+            name='application_changed_6b262f_idx',
+        ),
+        migrations.AlterField(
+            model_name='legacyapplicationtimeline',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.application'),
+        ),
+        migrations.AlterField(
+            model_name='legacyapplicationtimeline',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='legacyapplicationstatushistory',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.application'),
+        ),
+        migrations.AlterField(
+            model_name='legacyapplicationstatushistory',
+            name='changed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='ApplicationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.PositiveSmallIntegerField(choices=[(1, 'created'), (2, 'submitted'), (3, 'assigned'), (4, 'status_updated'), (5, 'review_submitted'), (6, 'note')])),
+                ('from_status', models.CharField(blank=True, max_length=30)),
+                ('to_status', models.CharField(blank=True, max_length=30)),
+                ('description', models.TextField(blank=True)),
+                ('note', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='applications.application')),
+            ],
+            options={
+                'db_table': 'application_events',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['application', 'created_at', 'id'], name='app_events_app_created_idx'), models.Index(fields=['to_status', 'created_at'], name='app_events_status_created_idx'), models.Index(fields=['actor'], name='app_events_actor_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationTimeline',
+            fields=[],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('applications.applicationevent',),
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusHistory',
+            fields=[],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('applications.applicationevent',),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_TRIGGERS = """
+CREATE FUNCTION applications_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    SELECT
+        setweight(to_tsvector('simple', coalesce(u.first_name, '') || ' ' || coalesce(u.last_name, '')
+                                        || ' ' || coalesce(u.email, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.program_name, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(NEW.personal_statement, '') || ' '
+                                            || coalesce(NEW.additional_info, '')), 'C')
+    INTO NEW.search_vector
+    FROM users u
+    WHERE u.id = NEW.student_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER applications_search_vector
+BEFORE INSERT OR UPDATE OF student_id, program_name, personal_statement, additional_info
+ON applications
+FOR EACH ROW EXECUTE FUNCTION applications_search_vector_refresh();
+
+-- Writing student_id back to itself fires the trigger above
+CREATE FUNCTION users_applications_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE applications SET student_id = student_id WHERE student_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER users_applications_search_vector
+AFTER UPDATE OF first_name, last_name, email
+ON users
+FOR EACH ROW
+WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name
+      OR OLD.last_name IS DISTINCT FROM NEW.last_name
+      OR OLD.email IS DISTINCT FROM NEW.email)
+EXECUTE FUNCTION users_applications_search_vector_refresh();
+"""
+
+DROP_SEARCH_TRIGGERS = """
+DROP TRIGGER IF EXISTS users_applications_search_vector ON users;
+DROP FUNCTION IF EXISTS users_applications_search_vector_refresh();
+DROP TRIGGER IF EXISTS applications_search_vector ON applications;
+DROP FUNCTION IF EXISTS applications_search_vector_refresh();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGERS, DROP_SEARCH_TRIGGERS),
+        # Fill existing rows before building the index
+        migrations.RunSQL('UPDATE applications SET student_id = student_id', migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='applications_search_gin'),
+        ),
+    ]
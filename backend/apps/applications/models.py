@@ -1,6 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 from apps.accounts.models import User, UserRole
 from apps.universities.models import Program
+from apps.common.concurrency import VersionedModel
+
+
+# Timeline / status history entries embedded in application detail responses
+RECENT_EVENTS = 10
 
 
 class ApplicationStatus(models.TextChoices):
@@ -22,7 +31,7 @@ class ApplicationStage(models.TextChoices):
     COMPLETED = 'COMPLETED', 'Completed'
 
 
-class Application(models.Model):
+class Application(VersionedModel):
     """Main application model for student submissions"""
     
     student = models.ForeignKey(
@@ -81,6 +90,10 @@ class Application(models.Model):
     # Flags
     is_complete = models.BooleanField(default=False)
     requires_attention = models.BooleanField(default=False)
+
+    # Maintained by database triggers from the student's name and email and
+    # the text fields above; see search.py
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         db_table = 'applications'
@@ -89,6 +102,7 @@ class Application(models.Model):
             models.Index(fields=['student', 'status']),
             models.Index(fields=['assigned_checker', 'status']),
             models.Index(fields=['status', 'current_stage']),
+            GinIndex(fields=['search_vector'], name='applications_search_gin'),
         ]
     
     def __str__(self):
@@ -102,62 +116,139 @@ class Application(models.Model):
     def checker_name(self):
         return self.assigned_checker.full_name if self.assigned_checker else "Unassigned"
 
+    # The recent_* and *_count attributes below are normally filled in by the
+    # detail serializer's query plan; these fallbacks cover other callers.
+
+    @cached_property
+    def recent_timeline(self):
+        return list(
+            ApplicationTimeline.objects.filter(application=self).select_related('actor')[:RECENT_EVENTS]
+        )
+
+    @cached_property
+    def recent_status_history(self):
+        return list(
+            ApplicationStatusHistory.objects.filter(application=self).select_related('actor')[:RECENT_EVENTS]
+        )
+
+    @cached_property
+    def timeline_count(self):
+        return ApplicationTimeline.objects.filter(application=self).count()
+
+    @cached_property
+    def status_history_count(self):
+        return ApplicationStatusHistory.objects.filter(application=self).count()
+
+
+class ApplicationEventType(models.IntegerChoices):
+    # Labels are the event type names exposed by the API
+    CREATED = 1, 'created'
+    SUBMITTED = 2, 'submitted'
+    ASSIGNED = 3, 'assigned'
+    STATUS_UPDATED = 4, 'status_updated'
+    REVIEW_SUBMITTED = 5, 'review_submitted'
+    NOTE = 6, 'note'
+
+    @classmethod
+    def from_name(cls, name):
+        for member in cls:
+            if member.label == name:
+                return member
+        raise ValueError(f'Unknown application event type: {name}')
+
+
+class ApplicationEvent(models.Model):
+    """
+    Append-only log of everything that happens to an application.
+
+    A status change is a single row carrying both the timeline description and
+    the status history note; ``ApplicationTimeline`` and
+    ``ApplicationStatusHistory`` are read views over this table.
+    """
 
-class ApplicationTimeline(models.Model):
-    """Track all status changes and important events"""
-    
     application = models.ForeignKey(
         Application,
         on_delete=models.CASCADE,
-        related_name='timeline'
+        related_name='events'
     )
-    
-    event_type = models.CharField(max_length=50)
-    description = models.TextField()
-    
-    previous_status = models.CharField(max_length=30, blank=True)
-    new_status = models.CharField(max_length=30, blank=True)
-    
-    user = models.ForeignKey(
+    event_type = models.PositiveSmallIntegerField(choices=ApplicationEventType.choices)
+    from_status = models.CharField(max_length=30, blank=True)
+    to_status = models.CharField(max_length=30, blank=True)
+    actor = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
         null=True,
-        blank=True
+        blank=True,
+        related_name='+'
     )
-    
-    created_at = models.DateTimeField(auto_now_add=True)
-    
+    description = models.TextField(blank=True)
+    note = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
     class Meta:
-        db_table = 'application_timeline'
-        ordering = ['-created_at']
-    
+        db_table = 'application_events'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['application', 'created_at', 'id'], name='app_events_app_created_idx'),
+            models.Index(fields=['to_status', 'created_at'], name='app_events_status_created_idx'),
+            models.Index(fields=['actor'], name='app_events_actor_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.application.id} - {self.event_type} - {self.created_at}"
+        return f"{self.application_id} - {self.get_event_type_display()} - {self.created_at}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Application events are append-only')
+        super().save(*args, **kwargs)
 
-class ApplicationStatusHistory(models.Model):
-    """Explicit status history for applications"""
 
-    application = models.ForeignKey(
-        Application,
-        on_delete=models.CASCADE,
-        related_name='status_history'
-    )
+class StatusChangeManager(models.Manager):
+    # Creation events only carry the initial status; they are not a change
+    def get_queryset(self):
+        return super().get_queryset().exclude(from_status='')
+
+
+class ApplicationTimeline(ApplicationEvent):
+    """Every event of an application, as shown on its timeline"""
+
+    class Meta:
+        proxy = True
+
+
+class ApplicationStatusHistory(ApplicationEvent):
+    """The status-changing events of an application"""
+
+    objects = StatusChangeManager()
+
+    class Meta:
+        proxy = True
+
 
+class LegacyApplicationTimeline(models.Model):
+    """Pre-event-log timeline table, kept until ``backfill_application_events`` has run"""
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='+')
+    event_type = models.CharField(max_length=50)
+    description = models.TextField()
+    previous_status = models.CharField(max_length=30, blank=True)
+    new_status = models.CharField(max_length=30, blank=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'application_timeline_legacy'
+
+
+class LegacyApplicationStatusHistory(models.Model):
+    """Pre-event-log status history table, kept until ``backfill_application_events`` has run"""
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='+')
     from_status = models.CharField(max_length=30)
     to_status = models.CharField(max_length=30)
-    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     note = models.TextField(blank=True)
     changed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        db_table = 'application_status_history'
-        ordering = ['-changed_at']
-        indexes = [
-            models.Index(fields=['application']),
-            models.Index(fields=['changed_by']),
-            models.Index(fields=['changed_at']),
-        ]
-
-    def __str__(self):
-        return f"Application {self.application_id}: {self.from_status} -> {self.to_status}"
+        db_table = 'application_status_history_legacy'
@@ -0,0 +1,165 @@
+"""
+Automatic assignment of submitted applications.
+
+``run_scheduler`` is meant to run periodically (``manage.py
+schedule_assignments`` from cron). Each run:
+
+1. takes a transaction-scoped Postgres advisory lock, so overlapping runs
+   (several cron hosts, a slow previous run) do nothing instead of
+   double-assigning;
+2. reads the live load of every available checker with one grouped count of
+   open applications per ``assigned_checker``, rather than trusting the
+   ``CheckerProfile.active_reviews`` counter;
+3. hands each unassigned ``SUBMITTED`` application, oldest first, to the
+   least-loaded checker whose ``specialization`` matches the program,
+   falling back to generalists (no specialization) and then to anyone.
+   Specialization terms match whole words, so "Law" matches "LLB Law" but
+   not "Lawn Management".
+
+Loads live in min-heaps, one per distinct program, that share a single load
+table. Entries go stale when a checker receives work through another heap;
+stale entries are re-pushed with the current load when popped, which is
+cheap because loads only ever grow during a run.
+"""
+import heapq
+import re
+import zlib
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+
+from .assignment import assign_applications, get_candidate_checkers
+from .models import Application, ApplicationStatus
+from .stats import PENDING_STATUSES
+
+ADVISORY_LOCK_KEY = zlib.crc32(b'applications.scheduler')
+SPECIALIZATION_SEPARATORS = re.compile(r'[,;/\n]+')
+WORD_RE = re.compile(r'\w+')
+
+
+def live_loads(checker_ids):
+    """{checker_id: open applications assigned to them}"""
+    loads = dict.fromkeys(checker_ids, 0)
+    rows = (
+        Application.objects
+        .filter(assigned_checker__in=checker_ids, status__in=PENDING_STATUSES)
+        .values('assigned_checker')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        loads[row['assigned_checker']] = row['total']
+    return loads
+
+
+def words(text):
+    return tuple(WORD_RE.findall(text.lower()))
+
+
+def specialization_terms(checker):
+    """The checker's specialization terms, each as a tuple of lowercase words"""
+    profile = getattr(checker, 'checker_profile', None)
+    if profile is None or not profile.specialization:
+        return ()
+    terms = (words(term) for term in SPECIALIZATION_SEPARATORS.split(profile.specialization))
+    return tuple(term for term in terms if term)
+
+
+def term_matches(term, program_words):
+    """Whether the words of ``term`` appear consecutively in ``program_words``"""
+    size = len(term)
+    return any(program_words[i:i + size] == term for i in range(len(program_words) - size + 1))
+
+
+def program_label(application):
+    if application.program_id:
+        return application.program.name
+    return application.program_name
+
+
+class CheckerPool:
+    """Least-loaded checker selection with specialization matching"""
+
+    def __init__(self, checkers, loads, max_load=None):
+        self.checkers = {checker.pk: checker for checker in checkers}
+        self.terms = {checker.pk: specialization_terms(checker) for checker in checkers}
+        self.loads = loads
+        self.max_load = max_load
+        self._heaps = {}
+
+    def candidates(self, program):
+        program_words = words(program)
+        specialists = [
+            pk for pk, terms in self.terms.items()
+            if any(term_matches(term, program_words) for term in terms)
+        ]
+        if specialists:
+            return specialists
+        generalists = [pk for pk, terms in self.terms.items() if not terms]
+        return generalists or list(self.checkers)
+
+    def heap_for(self, program):
+        key = program.lower()
+        if key not in self._heaps:
+            heap = [(self.loads[pk], pk) for pk in self.candidates(key)]
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        return self._heaps[key]
+
+    def pick(self, application):
+        heap = self.heap_for(program_label(application))
+        while heap:
+            load, pk = heap[0]
+            current = self.loads[pk]
+            if load != current:
+                heapq.heapreplace(heap, (current, pk))
+                continue
+            if self.max_load is not None and load >= self.max_load:
+                return None
+            heapq.heapreplace(heap, (load + 1, pk))
+            self.loads[pk] = load + 1
+            return self.checkers[pk]
+        return None
+
+
+def try_advisory_lock():
+    """Take the scheduler lock for the current transaction; False if another run holds it"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [ADVISORY_LOCK_KEY])
+        return cursor.fetchone()[0]
+
+
+def run_scheduler(batch_size=None, max_load=None):
+    """
+    Assign up to ``batch_size`` waiting applications.
+
+    Returns ``None`` when another run holds the lock, otherwise
+    ``{'assigned': n, 'waiting': m}`` where ``waiting`` counts applications
+    examined but left unassigned (every candidate at ``max_load``).
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'ASSIGNMENT_BATCH_SIZE', 500)
+    if max_load is None:
+        max_load = getattr(settings, 'ASSIGNMENT_MAX_LOAD', None)
+
+    with transaction.atomic():
+        if not try_advisory_lock():
+            return None
+
+        checkers = get_candidate_checkers()
+        if not checkers:
+            return {'assigned': 0, 'waiting': 0}
+
+        applications = list(
+            Application.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('program')
+            .filter(status=ApplicationStatus.SUBMITTED, assigned_checker__isnull=True)
+            .order_by('submitted_at', 'id')[:batch_size]
+        )
+        pool = CheckerPool(checkers, live_loads([checker.pk for checker in checkers]), max_load)
+        chosen = assign_applications(applications, pool.pick)
+
+    assigned = sum(1 for checker in chosen.values() if checker is not None)
+    return {'assigned': assigned, 'waiting': len(chosen) - assigned}
@@ -0,0 +1,35 @@
+"""
+Full-text search over applications.
+
+``applications.search_vector`` is kept up to date by two Postgres triggers
+(migration 0005): one recomputes it whenever an application's searchable
+columns are written, the other refreshes a student's applications when their
+name or email changes. Names and emails are indexed with the ``simple``
+configuration and weighted highest; the program name and free-text fields
+use ``english`` stemming. Matching goes through the GIN index on the column,
+so a search never scans the table.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+SEARCH_PARAM = 'q'
+MAX_QUERY_LENGTH = 200
+
+
+def build_query(text):
+    # Names are indexed unstemmed, prose stemmed: match either form
+    return (
+        SearchQuery(text, config='simple', search_type='websearch')
+        | SearchQuery(text, config='english', search_type='websearch')
+    )
+
+
+def search_applications(queryset, text):
+    """Filter ``queryset`` to applications matching ``text``, best matches first"""
+    query = build_query(text[:MAX_QUERY_LENGTH])
+    return (
+        queryset
+        .filter(search_vector=query)
+        .annotate(search_rank=SearchRank(F('search_vector'), query))
+        .order_by('-search_rank', '-created_at', '-id')
+    )
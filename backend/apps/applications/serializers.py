@@ -1,19 +1,33 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Application, ApplicationTimeline, ApplicationStatus, ApplicationStatusHistory
+from apps.common.concurrency import VersionedSerializerMixin
+from apps.common.conditional import related_count
+from apps.common.query_plans import QueryPlan
+from .assignment import MAX_BULK_ASSIGN
+from .models import Application, ApplicationTimeline, ApplicationStatus, ApplicationStatusHistory, RECENT_EVENTS
 
 
 class ApplicationTimelineSerializer(serializers.ModelSerializer):
     """Timeline event serializer"""
-    user_name = serializers.CharField(source='user.full_name', read_only=True)
-    
+    event_type = serializers.CharField(source='get_event_type_display', read_only=True)
+    previous_status = serializers.CharField(source='from_status', read_only=True)
+    new_status = serializers.CharField(source='to_status', read_only=True)
+    user = serializers.PrimaryKeyRelatedField(source='actor', read_only=True)
+    user_name = serializers.CharField(source='actor.full_name', read_only=True)
+
     class Meta:
         model = ApplicationTimeline
-        fields = '__all__'
-        read_only_fields = ['created_at']
+        fields = [
+            'id', 'user_name', 'event_type', 'description', 'previous_status', 'new_status',
+            'created_at', 'application', 'user'
+        ]
+        read_only_fields = fields
 
 
 class ApplicationStatusHistorySerializer(serializers.ModelSerializer):
-    changed_by_name = serializers.CharField(source='changed_by.full_name', read_only=True, allow_null=True)
+    changed_by = serializers.PrimaryKeyRelatedField(source='actor', read_only=True)
+    changed_by_name = serializers.CharField(source='actor.full_name', read_only=True, allow_null=True)
+    changed_at = serializers.DateTimeField(source='created_at', read_only=True)
 
     class Meta:
         model = ApplicationStatusHistory
@@ -37,6 +51,17 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['student_name', 'checker_name', 'created_at', 'updated_at']
 
+    query_plan = QueryPlan(
+        select_related=['student', 'assigned_checker'],
+        only=[
+            'id', 'student', 'program', 'program_name', 'academic_year', 'intake_period',
+            'status', 'current_stage', 'assigned_checker', 'submitted_at', 'created_at',
+            'updated_at', 'is_complete', 'requires_attention',
+            'student__first_name', 'student__last_name',
+            'assigned_checker__first_name', 'assigned_checker__last_name',
+        ]
+    )
+
 
 class ApplicationDetailSerializer(serializers.ModelSerializer):
     """Detailed view serializer for applications"""
@@ -44,17 +69,41 @@ class ApplicationDetailSerializer(serializers.ModelSerializer):
     checker_name = serializers.CharField(read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     stage_display = serializers.CharField(source='get_current_stage_display', read_only=True)
-    timeline = ApplicationTimelineSerializer(many=True, read_only=True)
-    status_history = ApplicationStatusHistorySerializer(many=True, read_only=True)
+    timeline = ApplicationTimelineSerializer(source='recent_timeline', many=True, read_only=True)
+    timeline_count = serializers.IntegerField(read_only=True)
+    status_history = ApplicationStatusHistorySerializer(source='recent_status_history', many=True, read_only=True)
+    status_history_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Application
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = [
             'student', 'created_at', 'updated_at', 'submitted_at',
             'review_started_at', 'review_completed_at', 'student_name', 'checker_name'
         ]
 
+    # Only the latest RECENT_EVENTS of each; the full lists are paginated
+    # under /applications/<pk>/timeline/ and /status-history/
+    query_plan = QueryPlan(
+        select_related=['student', 'assigned_checker'],
+        prefetch_related=[
+            Prefetch(
+                'events',
+                queryset=ApplicationTimeline.objects.select_related('actor')[:RECENT_EVENTS],
+                to_attr='recent_timeline'
+            ),
+            Prefetch(
+                'events',
+                queryset=ApplicationStatusHistory.objects.select_related('actor')[:RECENT_EVENTS],
+                to_attr='recent_status_history'
+            ),
+        ],
+        annotations={
+            'timeline_count': related_count(ApplicationTimeline.objects.all(), 'application'),
+            'status_history_count': related_count(ApplicationStatusHistory.objects.all(), 'application'),
+        }
+    )
+
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     """Create application serializer"""
@@ -76,7 +125,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ApplicationUpdateSerializer(serializers.ModelSerializer):
+class ApplicationUpdateSerializer(VersionedSerializerMixin, serializers.ModelSerializer):
     """Update application serializer (for students)"""
     
     class Meta:
@@ -87,9 +136,25 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
-class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
+class ApplicationStatusUpdateSerializer(VersionedSerializerMixin, serializers.ModelSerializer):
     """Update application status (for checkers/admins)"""
     
     class Meta:
         model = Application
         fields = ['status', 'current_stage']
+
+
+class BulkAssignSerializer(serializers.Serializer):
+    """Bulk assignment request: explicit checkers or auto mode"""
+    application_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BULK_ASSIGN
+    )
+    checker_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, required=False
+    )
+    auto = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['auto'] == ('checker_ids' in attrs):
+            raise serializers.ValidationError('Provide either checker_ids or auto=true')
+        return attrs
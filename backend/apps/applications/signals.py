@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.reviews.models import Review
+from .models import Application
+from .stats import invalidate_summaries
+
+
+@receiver(post_init, sender=Application)
+def remember_assigned_checker(sender, instance, **kwargs):
+    # __dict__ so deferred loads don't fetch the column
+    instance._loaded_assigned_checker_id = instance.__dict__.get('assigned_checker_id')
+
+
+def invalidate_summaries_on_commit(student_ids, checker_ids):
+    # Invalidating before commit lets a concurrent reader re-cache the old
+    # rows for the whole TTL; transition_many defers the same way.
+    transaction.on_commit(lambda: invalidate_summaries(student_ids, checker_ids))
+
+
+@receiver([post_save, post_delete], sender=Application)
+def application_changed(sender, instance, **kwargs):
+    # A reassignment changes the previous checker's summary too
+    invalidate_summaries_on_commit(
+        student_ids=[instance.student_id],
+        checker_ids=[instance.assigned_checker_id, instance._loaded_assigned_checker_id]
+    )
+    instance._loaded_assigned_checker_id = instance.assigned_checker_id
+
+
+@receiver([post_save, post_delete], sender=Review)
+def review_changed(sender, instance, **kwargs):
+    student_id = (
+        Application.objects.filter(pk=instance.application_id)
+        .values_list('student_id', flat=True)
+        .first()
+    )
+    invalidate_summaries_on_commit(student_ids=[student_id], checker_ids=[instance.checker_id])
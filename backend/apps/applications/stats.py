@@ -0,0 +1,149 @@
+"""
+Server-side dashboard summaries for applications and reviews.
+
+Counts and score averages are computed with one grouped aggregate query per
+model over the caller's scope and cached per scope for a short TTL. Saves and
+deletes of applications and reviews invalidate the affected scopes (see
+``signals.py``); bulk writes that bypass signals should call
+``invalidate_summaries`` themselves.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from apps.reviews.models import Review, ReviewDecision
+from .models import Application, ApplicationStatus, ApplicationStage
+
+CACHE_KEY_PREFIX = 'application-summary'
+
+PENDING_STATUSES = (
+    ApplicationStatus.SUBMITTED,
+    ApplicationStatus.UNDER_REVIEW,
+    ApplicationStatus.DOCUMENTS_INCOMPLETE,
+    ApplicationStatus.NEEDS_REVISION,
+)
+COMPLETED_STATUSES = (
+    ApplicationStatus.PASSED,
+    ApplicationStatus.REJECTED,
+    ApplicationStatus.FORWARDED_TO_QS,
+)
+SCORE_FIELDS = (
+    'overall_score', 'academic_score', 'essay_score',
+    'recommendation_score', 'extracurricular_score',
+)
+
+
+def get_scope(user):
+    """Return the cache scope for a user: admins share one, others are per user"""
+    if user.is_admin():
+        return 'admin'
+    if user.is_checker():
+        return f'checker:{user.pk}'
+    if user.is_student():
+        return f'student:{user.pk}'
+    return None
+
+
+def scoped_applications(user):
+    if user.is_student():
+        return Application.objects.filter(student=user)
+    elif user.is_checker():
+        return Application.objects.filter(assigned_checker=user)
+    elif user.is_admin():
+        return Application.objects.all()
+    return Application.objects.none()
+
+
+def scoped_reviews(user):
+    if user.is_checker():
+        return Review.objects.filter(checker=user)
+    elif user.is_admin():
+        return Review.objects.all()
+    elif user.is_student():
+        return Review.objects.filter(application__student=user)
+    return Review.objects.none()
+
+
+def compute_summary(user):
+    """Compute status, stage and decision counts plus score averages"""
+    by_status = {choice: 0 for choice in ApplicationStatus.values}
+    by_stage = {choice: 0 for choice in ApplicationStage.values}
+
+    application_rows = (
+        scoped_applications(user)
+        .order_by()
+        .values('status', 'current_stage')
+        .annotate(count=Count('id'))
+    )
+    for row in application_rows:
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+        by_stage[row['current_stage']] = by_stage.get(row['current_stage'], 0) + row['count']
+
+    aggregates = {'count': Count('id')}
+    for field in SCORE_FIELDS:
+        aggregates[f'{field}_sum'] = Sum(field)
+        aggregates[f'{field}_count'] = Count(field)
+
+    by_decision = {choice: 0 for choice in ReviewDecision.values}
+    completed_reviews = 0
+    score_sums = {field: 0 for field in SCORE_FIELDS}
+    score_counts = {field: 0 for field in SCORE_FIELDS}
+
+    review_rows = (
+        scoped_reviews(user)
+        .order_by()
+        .values('decision', 'is_complete')
+        .annotate(**aggregates)
+    )
+    for row in review_rows:
+        by_decision[row['decision']] = by_decision.get(row['decision'], 0) + row['count']
+        if row['is_complete']:
+            completed_reviews += row['count']
+        for field in SCORE_FIELDS:
+            score_sums[field] += row[f'{field}_sum'] or 0
+            score_counts[field] += row[f'{field}_count']
+
+    total_reviews = sum(by_decision.values())
+    return {
+        'applications': {
+            'total': sum(by_status.values()),
+            'pending': sum(by_status[s] for s in PENDING_STATUSES),
+            'completed': sum(by_status[s] for s in COMPLETED_STATUSES),
+            'by_status': by_status,
+            'by_stage': by_stage,
+        },
+        'reviews': {
+            'total': total_reviews,
+            'completed': completed_reviews,
+            'pending': total_reviews - completed_reviews,
+            'by_decision': by_decision,
+            'average_scores': {
+                field.replace('_score', ''): (
+                    round(score_sums[field] / score_counts[field], 2) if score_counts[field] else None
+                )
+                for field in SCORE_FIELDS
+            },
+        },
+    }
+
+
+def get_summary(user):
+    """Return the cached summary for the user's scope, computing it on a miss"""
+    scope = get_scope(user)
+    if scope is None:
+        return compute_summary(user)
+
+    key = f'{CACHE_KEY_PREFIX}:{scope}'
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary(user)
+        cache.set(key, summary, settings.SUMMARY_CACHE_TTL)
+    return summary
+
+
+def invalidate_summaries(student_ids=(), checker_ids=()):
+    """Drop cached summaries for the admin scope and the given users"""
+    keys = [f'{CACHE_KEY_PREFIX}:admin']
+    keys += [f'{CACHE_KEY_PREFIX}:student:{pk}' for pk in set(student_ids) if pk]
+    keys += [f'{CACHE_KEY_PREFIX}:checker:{pk}' for pk in set(checker_ids) if pk]
+    cache.delete_many(keys)
@@ -0,0 +1,743 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import CheckerProfile, User, UserRole
+from apps.accounts.rbac import permission_matrix
+from apps.notifications.models import Notification, NotificationOutbox
+from apps.reviews.models import Review
+from .backfill import backfill_chunk
+from .models import (
+    Application, ApplicationEvent, ApplicationEventType, ApplicationStatus, ApplicationStatusHistory,
+    ApplicationTimeline, LegacyApplicationStatusHistory, LegacyApplicationTimeline
+)
+from .scheduling import ADVISORY_LOCK_KEY, run_scheduler
+from .search import search_applications
+from .stats import get_summary
+from .transitions import InvalidTransition, Transition, transition, transition_many
+
+
+def select_queries(ctx):
+    return [q for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+
+
+class ApplicationQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def create_applications(self, count):
+        for i in range(count):
+            student = User.objects.create_user(
+                email=f'student{Application.objects.count()}@example.com', password='pass12345',
+                first_name='Stu', last_name=f'Dent {i}', role=UserRole.STUDENT
+            )
+            Application.objects.create(
+                student=student,
+                assigned_checker=self.checker if i % 2 else None,
+                program_name='Computer Science',
+                academic_year='2026-2027',
+                intake_period='Fall 2026',
+                status=ApplicationStatus.SUBMITTED
+            )
+
+    def count_list_queries(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/applications/', {'page': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_is_constant_for_any_page_size(self):
+        self.create_applications(1)
+        single = self.count_list_queries(1)
+
+        self.create_applications(19)
+        full_page = self.count_list_queries(20)
+
+        self.assertEqual(single, full_page)
+
+    def test_list_still_renders_related_names(self):
+        self.create_applications(2)
+        response = self.client.get('/api/applications/')
+        names = {row['checker_name'] for row in response.data['results']}
+        self.assertEqual(names, {'Cole Checker', 'Unassigned'})
+
+    def test_detail_query_count_is_independent_of_history_length(self):
+        self.create_applications(1)
+        application = Application.objects.get()
+        url = f'/api/applications/{application.pk}/'
+
+        def count_detail_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        baseline = count_detail_queries()
+        for _ in range(5):
+            ApplicationEvent.objects.create(
+                application=application, event_type=ApplicationEventType.STATUS_UPDATED,
+                from_status=ApplicationStatus.SUBMITTED, to_status=ApplicationStatus.UNDER_REVIEW,
+                description='Status updated', actor=self.checker
+            )
+        self.assertEqual(baseline, count_detail_queries())
+
+
+class ApplicationEventListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        cls.other = User.objects.create_user(
+            email='other@example.com', password='pass12345',
+            first_name='Otto', last_name='Other', role=UserRole.STUDENT
+        )
+        cls.application = Application.objects.create(
+            student=cls.student, program_name='Computer Science', academic_year='2026-2027',
+            intake_period='Fall 2026', status=ApplicationStatus.SUBMITTED
+        )
+        ApplicationEvent.objects.bulk_create([
+            ApplicationEvent(
+                application=cls.application, event_type=ApplicationEventType.STATUS_UPDATED,
+                from_status=ApplicationStatus.SUBMITTED, to_status=ApplicationStatus.UNDER_REVIEW,
+                description=f'Status {i}', actor=cls.checker
+            )
+            for i in range(12)
+        ])
+        ApplicationEvent.objects.bulk_create([
+            ApplicationEvent(
+                application=cls.application, event_type=ApplicationEventType.NOTE,
+                description=f'Event {i}', actor=cls.checker
+            )
+            for i in range(25)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+
+    def test_detail_embeds_recent_events_and_totals(self):
+        response = self.client.get(f'/api/applications/{self.application.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['timeline']), 10)
+        self.assertEqual(response.data['timeline'][0]['description'], 'Event 24')
+        self.assertEqual(response.data['timeline'][0]['event_type'], 'note')
+        self.assertEqual(response.data['timeline_count'], 37)
+        self.assertEqual(len(response.data['status_history']), 10)
+        self.assertEqual(response.data['status_history_count'], 12)
+
+    def test_timeline_pages_through_every_event(self):
+        url = f'/api/applications/{self.application.pk}/timeline/'
+        seen = []
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(len(select_queries(ctx)), 2)
+        self.assertEqual(len(response.data['results']), 20)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['description'] for row in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(
+            seen, [f'Event {i}' for i in reversed(range(25))] + [f'Status {i}' for i in reversed(range(12))]
+        )
+
+    def test_status_history_lists_every_change(self):
+        response = self.client.get(f'/api/applications/{self.application.pk}/status-history/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertEqual(response.data['results'][0]['changed_by_name'], 'Cole Checker')
+        self.assertIsNone(response.data['next'])
+
+    def test_other_students_get_404(self):
+        self.client.force_authenticate(user=self.other)
+        for suffix in ('timeline', 'status-history'):
+            response = self.client.get(f'/api/applications/{self.application.pk}/{suffix}/')
+            self.assertEqual(response.status_code, 404)
+
+
+class ApplicationEventBackfillTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.applications = [
+            Application.objects.create(
+                student=cls.student, program_name='Computer Science', academic_year='2026-2027',
+                intake_period='Fall 2026', status=ApplicationStatus.UNDER_REVIEW
+            )
+            for _ in range(2)
+        ]
+        first, second = cls.applications
+        LegacyApplicationTimeline.objects.create(
+            application=first, event_type='created', description='Application created',
+            new_status=ApplicationStatus.DRAFT, user=cls.student
+        )
+        LegacyApplicationTimeline.objects.create(
+            application=first, event_type='submitted', description='Application submitted for review',
+            previous_status=ApplicationStatus.DRAFT, new_status=ApplicationStatus.SUBMITTED, user=cls.student
+        )
+        LegacyApplicationStatusHistory.objects.create(
+            application=first, from_status=ApplicationStatus.DRAFT, to_status=ApplicationStatus.SUBMITTED,
+            changed_by=cls.student, note='Application submitted'
+        )
+        LegacyApplicationTimeline.objects.create(
+            application=first, event_type='comment', description='Transcript looks fine', user=cls.admin
+        )
+        LegacyApplicationStatusHistory.objects.create(
+            application=second, from_status=ApplicationStatus.SUBMITTED,
+            to_status=ApplicationStatus.UNDER_REVIEW, changed_by=cls.admin
+        )
+
+    def test_merges_paired_rows_and_empties_legacy_tables_chunk_by_chunk(self):
+        first, second = self.applications
+
+        last_id, written = backfill_chunk(0, chunk_size=1)
+        self.assertEqual((last_id, written), (first.pk, 3))
+        self.assertTrue(LegacyApplicationStatusHistory.objects.filter(application=second).exists())
+
+        self.assertEqual(backfill_chunk(last_id, chunk_size=1), (second.pk, 1))
+        self.assertEqual(backfill_chunk(second.pk, chunk_size=1), (None, 0))
+        self.assertFalse(LegacyApplicationTimeline.objects.exists())
+        self.assertFalse(LegacyApplicationStatusHistory.objects.exists())
+
+        events = list(ApplicationEvent.objects.filter(application=first).order_by('created_at', 'id'))
+        self.assertEqual(
+            [event.event_type for event in events],
+            [ApplicationEventType.CREATED, ApplicationEventType.SUBMITTED, ApplicationEventType.NOTE]
+        )
+        submitted = events[1]
+        self.assertEqual(submitted.description, 'Application submitted for review')
+        self.assertEqual(submitted.note, 'Application submitted')
+        self.assertEqual(submitted.to_status, ApplicationStatus.SUBMITTED)
+
+        unpaired = ApplicationStatusHistory.objects.get(application=second)
+        self.assertEqual(unpaired.event_type, ApplicationEventType.STATUS_UPDATED)
+        self.assertEqual(unpaired.actor, self.admin)
+
+
+class ApplicationSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.other_checker = User.objects.create_user(
+            email='other@example.com', password='pass12345',
+            first_name='Otto', last_name='Other', role=UserRole.CHECKER
+        )
+        cls.student = User.objects.create_user(
+            email='hastings@example.com', password='pass12345',
+            first_name='Margaret', last_name='Hastings', role=UserRole.STUDENT
+        )
+
+        def create(program, statement, checker):
+            return Application.objects.create(
+                student=cls.student, assigned_checker=checker, program_name=program,
+                academic_year='2026-2027', intake_period='Fall 2026',
+                status=ApplicationStatus.UNDER_REVIEW, personal_statement=statement
+            )
+
+        cls.chemistry = create('Chemistry', 'I enjoy organic synthesis.', cls.checker)
+        cls.robotics = create('Mechanical Engineering', 'Robotics and chemistry competitions.', cls.checker)
+        cls.hidden = create('Chemistry', 'Assigned elsewhere.', cls.other_checker)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.checker)
+
+    def search(self, text):
+        response = self.client.get('/api/applications/', {'q': text})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_ranks_matches_within_the_callers_scope(self):
+        # Program name outweighs the personal statement; the other checker's
+        # application never shows up
+        self.assertEqual(self.search('chemistry'), [self.chemistry.pk, self.robotics.pk])
+        self.assertEqual(self.search('competition'), [self.robotics.pk])
+        self.assertEqual(self.search('astronomy'), [])
+
+    def test_vector_follows_application_and_student_changes(self):
+        self.assertEqual(self.search('Hastings'), [self.robotics.pk, self.chemistry.pk])
+
+        self.client.force_authenticate(user=self.student)
+        response = self.client.patch(
+            f'/api/applications/{self.chemistry.pk}/', {'additional_info': 'Volunteer beekeeper'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(user=self.checker)
+        self.assertEqual(self.search('beekeeping'), [self.chemistry.pk])
+
+        User.objects.filter(pk=self.student.pk).update(last_name='Whitfield')
+        self.assertEqual(self.search('Hastings'), [])
+        self.assertEqual(len(self.search('Whitfield')), 2)
+
+    def test_search_uses_the_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        queryset = search_applications(Application.objects.all(), 'chemistry')
+        self.assertIn('applications_search_gin', queryset.explain())
+
+
+class ApplicationStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        for i in range(25):
+            Application.objects.create(
+                student=cls.student,
+                assigned_checker=cls.checker if i < 10 else None,
+                program_name='Computer Science',
+                academic_year='2026-2027',
+                intake_period='Fall 2026',
+                status=ApplicationStatus.UNDER_REVIEW if i < 10 else ApplicationStatus.SUBMITTED
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_counts_cover_every_row_not_just_first_page(self):
+        self.client.force_authenticate(user=self.admin)
+        data = self.client.get('/api/applications/stats/').data
+        self.assertEqual(data['applications']['total'], 25)
+        self.assertEqual(data['applications']['by_status'][ApplicationStatus.SUBMITTED], 15)
+        self.assertEqual(data['applications']['pending'], 25)
+
+    def test_checker_scope_and_review_averages(self):
+        application = Application.objects.filter(assigned_checker=self.checker).first()
+        Review.objects.create(application=application, checker=self.checker, overall_score=8, is_complete=True)
+        Review.objects.create(application=application, checker=self.checker, overall_score=5)
+        Review.objects.create(application=application, checker=self.checker)
+
+        self.client.force_authenticate(user=self.checker)
+        data = self.client.get('/api/analytics/summary/').data
+        self.assertEqual(data['applications']['total'], 10)
+        self.assertEqual(data['reviews']['total'], 3)
+        self.assertEqual(data['reviews']['completed'], 1)
+        self.assertEqual(data['reviews']['average_scores']['overall'], 6.5)
+
+    def test_summary_is_cached_and_invalidated_on_status_change(self):
+        self.client.force_authenticate(user=self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/applications/stats/')
+        self.assertEqual(len(select_queries(ctx)), 2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/applications/stats/')
+        self.assertEqual(len(select_queries(ctx)), 0)
+
+        application = Application.objects.filter(status=ApplicationStatus.SUBMITTED).first()
+        application.status = ApplicationStatus.PASSED
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+
+        data = self.client.get('/api/applications/stats/').data
+        self.assertEqual(data['applications']['completed'], 1)
+
+    def test_reassignment_invalidates_the_previous_checkers_summary(self):
+        other = User.objects.create_user(
+            email='other@example.com', password='pass12345',
+            first_name='Otto', last_name='Checker', role=UserRole.CHECKER
+        )
+        self.assertEqual(get_summary(self.checker)['applications']['total'], 10)
+        first, second, third = Application.objects.filter(assigned_checker=self.checker)[:3]
+
+        first.assigned_checker = other
+        with self.captureOnCommitCallbacks(execute=True):
+            first.save()
+            # Not before commit: a concurrent reader would re-cache the old rows
+            self.assertEqual(get_summary(self.checker)['applications']['total'], 10)
+        self.assertEqual(get_summary(self.checker)['applications']['total'], 9)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_many([
+                Transition(application, ApplicationStatus.UNDER_REVIEW, changes={'assigned_checker': other})
+                for application in (second, third)
+            ], self.admin)
+        self.assertEqual(get_summary(self.checker)['applications']['total'], 7)
+
+
+class ApplicationBulkAssignTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.checkers = []
+        for i, (active_reviews, available) in enumerate([(0, True), (3, True), (0, False)]):
+            checker = User.objects.create_user(
+                email=f'checker{i}@example.com', password='pass12345',
+                first_name='Cole', last_name=f'Checker {i}', role=UserRole.CHECKER
+            )
+            CheckerProfile.objects.create(user=checker, active_reviews=active_reviews, is_available=available)
+            cls.checkers.append(checker)
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        cls.applications = [
+            Application.objects.create(
+                student=cls.student,
+                program_name='Computer Science',
+                academic_year='2026-2027',
+                intake_period='Fall 2026',
+                status=ApplicationStatus.SUBMITTED
+            )
+            for _ in range(7)
+        ]
+
+    def setUp(self):
+        permission_matrix.invalidate()
+        self.addCleanup(permission_matrix.invalidate)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_auto_mode_balances_by_load_and_skips_unavailable(self):
+        ids = [application.pk for application in self.applications]
+        response = self.client.post('/api/applications/bulk-assign/', {'application_ids': ids, 'auto': True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['assigned'], 7)
+        counts = {checker.pk: 0 for checker in self.checkers}
+        for result in response.data['results']:
+            counts[result['checker_id']] += 1
+        # 0 + 5 and 3 + 2 end up level; the unavailable checker gets nothing
+        self.assertEqual(counts, {self.checkers[0].pk: 5, self.checkers[1].pk: 2, self.checkers[2].pk: 0})
+        self.assertEqual(ApplicationStatusHistory.objects.count(), 7)
+        self.assertEqual(ApplicationTimeline.objects.filter(event_type=ApplicationEventType.ASSIGNED).count(), 7)
+        self.assertEqual(NotificationOutbox.objects.count(), 7)
+
+    def test_writes_are_batched(self):
+        ids = [application.pk for application in self.applications]
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post('/api/applications/bulk-assign/', {'application_ids': ids, 'auto': True}, format='json')
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+        # applications, events, notifications, outbox
+        self.assertEqual(len(writes), 4)
+
+    def test_explicit_checkers_and_per_item_failures(self):
+        self.applications[0].status = ApplicationStatus.DRAFT
+        self.applications[0].save()
+        ids = [self.applications[0].pk, self.applications[1].pk, 999999]
+
+        response = self.client.post(
+            '/api/applications/bulk-assign/',
+            {'application_ids': ids, 'checker_ids': [self.checkers[2].pk]},
+            format='json'
+        )
+
+        self.assertEqual(response.data['assigned'], 1)
+        self.assertEqual([r['status'] for r in response.data['results']], ['failed', 'assigned', 'failed'])
+        self.applications[1].refresh_from_db()
+        self.assertEqual(self.applications[1].assigned_checker, self.checkers[2])
+        self.assertEqual(self.applications[1].status, ApplicationStatus.UNDER_REVIEW)
+        self.assertEqual(Notification.objects.filter(user=self.checkers[2]).count(), 1)
+
+    def test_rejects_unknown_checkers_and_ambiguous_mode(self):
+        ids = [self.applications[0].pk]
+        response = self.client.post(
+            '/api/applications/bulk-assign/', {'application_ids': ids, 'checker_ids': [self.student.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            '/api/applications/bulk-assign/',
+            {'application_ids': ids, 'checker_ids': [self.checkers[0].pk], 'auto': True},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_assign_permission(self):
+        self.client.force_authenticate(user=self.checkers[0])
+        response = self.client.post(
+            '/api/applications/bulk-assign/', {'application_ids': [1], 'auto': True}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class AssignmentSchedulerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        cls.cs = cls.create_checker('cs', 'Computer Science, Data Science')
+        cls.law = cls.create_checker('law', 'Law')
+        cls.general = cls.create_checker('general', '')
+        cls.away = cls.create_checker('away', 'Computer Science', is_available=False)
+
+    @classmethod
+    def create_checker(cls, name, specialization, is_available=True):
+        checker = User.objects.create_user(
+            email=f'{name}@example.com', password='pass12345',
+            first_name=name.title(), last_name='Checker', role=UserRole.CHECKER
+        )
+        CheckerProfile.objects.create(user=checker, specialization=specialization, is_available=is_available)
+        return checker
+
+    def create_application(self, program_name, status=ApplicationStatus.SUBMITTED, checker=None):
+        return Application.objects.create(
+            student=self.student,
+            assigned_checker=checker,
+            program_name=program_name,
+            academic_year='2026-2027',
+            intake_period='Fall 2026',
+            status=status
+        )
+
+    def test_matches_specialization_then_falls_back_to_generalists(self):
+        cs_app = self.create_application('MSc Computer Science')
+        law_app = self.create_application('LLB Law')
+        art_app = self.create_application('BA Fine Art')
+
+        self.assertEqual(run_scheduler(), {'assigned': 3, 'waiting': 0})
+
+        for application, checker in [(cs_app, self.cs), (law_app, self.law), (art_app, self.general)]:
+            application.refresh_from_db()
+            self.assertEqual(application.assigned_checker, checker)
+            self.assertEqual(application.status, ApplicationStatus.UNDER_REVIEW)
+
+    def test_specialization_matches_whole_words(self):
+        lawn_app = self.create_application('BSc Lawn Management')
+        joint_app = self.create_application('MA Law and Data  Science')
+
+        run_scheduler()
+
+        lawn_app.refresh_from_db()
+        joint_app.refresh_from_db()
+        self.assertEqual(lawn_app.assigned_checker, self.general)
+        self.assertIn(joint_app.assigned_checker, [self.cs, self.law])
+
+    def test_balances_on_live_load_not_profile_counter(self):
+        # The stale counter says "cs" is idle; live counts say it is busy
+        CheckerProfile.objects.filter(user=self.general).update(active_reviews=50)
+        for _ in range(3):
+            self.create_application('Anything', ApplicationStatus.UNDER_REVIEW, checker=self.cs)
+        CheckerProfile.objects.filter(user=self.cs).update(specialization='')
+        new = [self.create_application('BA History') for _ in range(4)]
+
+        run_scheduler()
+
+        assigned = [Application.objects.get(pk=a.pk).assigned_checker for a in new]
+        self.assertEqual(assigned.count(self.general), 3)
+        self.assertEqual(assigned.count(self.cs), 1)
+
+    def test_max_load_leaves_applications_waiting(self):
+        for _ in range(3):
+            self.create_application('LLB Law')
+        self.assertEqual(run_scheduler(max_load=2), {'assigned': 2, 'waiting': 1})
+        self.assertEqual(run_scheduler(max_load=2), {'assigned': 0, 'waiting': 1})
+
+    def test_second_runner_skips_while_lock_is_held(self):
+        self.create_application('LLB Law')
+        other = connection.copy()
+        try:
+            with other.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_lock(%s)', [ADVISORY_LOCK_KEY])
+            self.assertIsNone(run_scheduler())
+            with other.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [ADVISORY_LOCK_KEY])
+        finally:
+            other.close()
+        self.assertEqual(run_scheduler()['assigned'], 1)
+
+
+class ApplicationTransitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+
+    def setUp(self):
+        permission_matrix.invalidate()
+        self.addCleanup(permission_matrix.invalidate)
+
+    def create_application(self, status):
+        return Application.objects.create(
+            student=self.student,
+            assigned_checker=self.checker,
+            program_name='Computer Science',
+            academic_year='2026-2027',
+            intake_period='Fall 2026',
+            status=status
+        )
+
+    def test_history_records_the_locked_status(self):
+        application = self.create_application(ApplicationStatus.DOCUMENTS_INCOMPLETE)
+        stale = Application.objects.get(pk=application.pk)
+        Application.objects.filter(pk=application.pk).update(status=ApplicationStatus.UNDER_REVIEW)
+
+        transition(stale, ApplicationStatus.PASSED, self.checker, note='Review submitted')
+
+        history = ApplicationStatusHistory.objects.get(application=application)
+        self.assertEqual((history.from_status, history.to_status), ('UNDER_REVIEW', 'PASSED'))
+        self.assertEqual(Notification.objects.get(user=self.student).application_id, application.pk)
+
+    def test_rejects_transitions_outside_the_table(self):
+        application = self.create_application(ApplicationStatus.REJECTED)
+        with self.assertRaises(InvalidTransition):
+            transition(application, ApplicationStatus.PASSED, self.admin)
+        self.assertFalse(ApplicationStatusHistory.objects.exists())
+
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        response = client.patch(f'/api/applications/{application.pk}/status/', {'status': 'UNDER_REVIEW'})
+        self.assertEqual(response.status_code, 400)
+        application.refresh_from_db()
+        self.assertEqual(application.status, ApplicationStatus.REJECTED)
+
+    def test_transition_many_batches_writes_and_reports_per_item(self):
+        applications = [self.create_application(ApplicationStatus.UNDER_REVIEW) for _ in range(5)]
+        applications.append(self.create_application(ApplicationStatus.DRAFT))
+
+        with CaptureQueriesContext(connection) as ctx:
+            errors = transition_many(
+                [Transition(application, ApplicationStatus.PASSED) for application in applications],
+                self.admin
+            )
+
+        self.assertEqual(errors[:5], [None] * 5)
+        self.assertIn('DRAFT', str(errors[5]))
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+        # applications, events, notifications, outbox
+        self.assertEqual(len(writes), 4)
+        self.assertEqual(Application.objects.filter(status=ApplicationStatus.PASSED).count(), 5)
+        self.assertEqual(ApplicationTimeline.objects.count(), 5)
+
+
+class ApplicationConcurrencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+
+    def setUp(self):
+        permission_matrix.invalidate()
+        self.addCleanup(permission_matrix.invalidate)
+        self.application = Application.objects.create(
+            student=self.student,
+            program_name='Computer Science',
+            academic_year='2026-2027',
+            intake_period='Fall 2026',
+            status=ApplicationStatus.SUBMITTED
+        )
+        self.url = f'/api/applications/{self.application.pk}/'
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+
+    def test_etag_from_get_works_as_if_match(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertTrue(etag.startswith('W/"1.'))
+
+        response = self.client.patch(self.url, {'additional_info': 'Updated'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+
+        response = self.client.patch(self.url, {'additional_info': 'Again'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+
+    def test_if_none_match_returns_304_without_loading_nested_data(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(select_queries(ctx)), 1)
+
+        ApplicationEvent.objects.create(
+            application=self.application, event_type=ApplicationEventType.NOTE, description='Checker note'
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_stale_if_match_returns_412_with_a_single_update(self):
+        Application.objects.filter(pk=self.application.pk).update(version=2, additional_info='Theirs')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.url, {'additional_info': 'Mine'}, HTTP_IF_MATCH='"1"')
+
+        self.assertEqual(response.status_code, 412)
+        statements = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertTrue(statements[-1].startswith('UPDATE'))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.additional_info, 'Theirs')
+
+    def test_write_without_if_match_is_conditional_on_the_read_version(self):
+        response = self.client.patch(self.url, {'additional_info': 'Mine'})
+        self.assertEqual(response.status_code, 200)
+        self.application.refresh_from_db()
+        self.assertEqual((self.application.additional_info, self.application.version), ('Mine', 2))
+
+    def test_status_change_honours_if_match_and_bumps_version(self):
+        self.client.force_authenticate(user=self.admin)
+        url = f'/api/applications/{self.application.pk}/status/'
+
+        response = self.client.patch(url, {'status': 'REJECTED'}, HTTP_IF_MATCH='"7"')
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.patch(url, {'status': 'REJECTED'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+        self.application.refresh_from_db()
+        self.assertEqual((self.application.status, self.application.version), ('REJECTED', 2))
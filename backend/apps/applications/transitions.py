@@ -0,0 +1,176 @@
+"""
+Application status state machine.
+
+Every status change goes through ``transition`` (one application) or
+``transition_many`` (a batch). Both lock the rows with ``SELECT ... FOR
+UPDATE``, validate the change against ``TRANSITIONS`` using the locked
+status, save only the changed columns, and write the side effects with one
+``bulk_create`` per table: one ``ApplicationEvent`` per change and the
+notifications (plus their email outbox entries), however many applications
+are in the batch.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.concurrency import VersionConflict
+from apps.notifications.models import Notification, NotificationType
+from apps.notifications.utils import bulk_create_notifications
+from .models import Application, ApplicationEvent, ApplicationEventType, ApplicationStatus
+from .stats import invalidate_summaries
+
+S = ApplicationStatus
+
+REVIEW_OUTCOMES = {S.PASSED, S.REJECTED, S.NEEDS_REVISION, S.FORWARDED_TO_QS}
+
+TRANSITIONS = {
+    S.DRAFT: {S.SUBMITTED},
+    S.SUBMITTED: {S.UNDER_REVIEW, S.DOCUMENTS_INCOMPLETE, S.REJECTED},
+    # UNDER_REVIEW -> UNDER_REVIEW is a reassignment to another checker
+    S.UNDER_REVIEW: {S.UNDER_REVIEW, S.DOCUMENTS_INCOMPLETE} | REVIEW_OUTCOMES,
+    S.DOCUMENTS_INCOMPLETE: {S.SUBMITTED, S.UNDER_REVIEW} | REVIEW_OUTCOMES,
+    S.NEEDS_REVISION: {S.SUBMITTED, S.UNDER_REVIEW, S.REJECTED},
+    S.PASSED: {S.FORWARDED_TO_QS},
+    S.REJECTED: set(),
+    S.FORWARDED_TO_QS: set(),
+}
+
+
+class InvalidTransition(Exception):
+    pass
+
+
+def can_transition(from_status, to_status):
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+class Transition:
+    """
+    One requested status change.
+
+    ``changes`` are extra field values saved with the status (for example
+    ``assigned_checker``). ``notification`` holds ``Notification`` field
+    values; by default the student is told about the new status. With
+    ``expected_version`` the change only applies if the row is still at that
+    version.
+    """
+
+    def __init__(self, application, to_status, note='', event_type=ApplicationEventType.STATUS_UPDATED,
+                 description=None, changes=None, notification=None, expected_version=None):
+        self.application = application
+        self.to_status = to_status
+        self.note = note
+        self.event_type = event_type
+        self.description = description
+        self.changes = changes or {}
+        self.notification = notification
+        self.expected_version = expected_version
+        self.from_status = None
+        self.from_version = None
+        self.from_checker_id = None
+
+    def default_notification(self):
+        return {
+            'user_id': self.application.student_id,
+            'notification_type': NotificationType.STATUS_CHANGED,
+            'title': 'Application Status Updated',
+            'message': f'Your application status has been updated to: {self.application.get_status_display()}',
+        }
+
+
+def transition_many(transitions, actor):
+    """
+    Apply a batch of transitions in one transaction.
+
+    Returns a list aligned with ``transitions`` holding ``None`` for applied
+    changes or the ``InvalidTransition``/``VersionConflict`` that rejected
+    them; rejected entries leave their application untouched.
+    """
+    errors = []
+    applied = []
+    now = timezone.now()
+
+    with transaction.atomic():
+        locked = Application.objects.select_for_update().in_bulk(
+            [t.application.pk for t in transitions]
+        )
+        for t in transitions:
+            current = locked.get(t.application.pk)
+            if current is None:
+                errors.append(InvalidTransition('Application not found'))
+                continue
+            if t.expected_version is not None and t.expected_version != current.version:
+                errors.append(VersionConflict(f'Application {current.pk} is at version {current.version}'))
+                continue
+            if not can_transition(current.status, t.to_status):
+                errors.append(InvalidTransition(f'Cannot change status from {current.status} to {t.to_status}'))
+                continue
+            errors.append(None)
+            t.from_status = current.status
+            t.from_version = current.version
+            t.from_checker_id = current.assigned_checker_id
+            t.application.status = t.to_status
+            t.application.updated_at = now
+            for field, value in t.changes.items():
+                setattr(t.application, field, value)
+            # Later transitions of the same application start from here
+            current.status = t.to_status
+            current.version += 1
+            current.assigned_checker_id = t.application.assigned_checker_id
+            applied.append(t)
+
+        if applied:
+            save_applications(applied)
+            write_side_effects(applied, actor)
+    return errors
+
+
+def transition(application, to_status, actor, note='', **options):
+    """Change one application's status; raises InvalidTransition or VersionConflict"""
+    t = Transition(application, to_status, note=note, **options)
+    error = transition_many([t], actor)[0]
+    if error:
+        raise error
+    return t
+
+
+def save_applications(applied):
+    fields = {'status', 'updated_at'}
+    for t in applied:
+        fields.update(t.changes)
+
+    if len(applied) == 1:
+        # save() bumps the version from the locked one
+        t = applied[0]
+        t.application.version = t.from_version
+        t.application.save(update_fields=sorted(fields))
+        return
+
+    for t in applied:
+        t.application.version = t.from_version + 1
+    applications = list({t.application.pk: t.application for t in applied}.values())
+    Application.objects.bulk_update(applications, sorted(fields | {'version'}))
+    # bulk_update skips post_save, so invalidate the summaries here
+    student_ids = [a.student_id for a in applications]
+    # Previous checkers too, for reassignments
+    checker_ids = [a.assigned_checker_id for a in applications] + [t.from_checker_id for t in applied]
+    transaction.on_commit(lambda: invalidate_summaries(student_ids, checker_ids))
+
+
+def write_side_effects(applied, actor):
+    events = []
+    notifications = []
+    for t in applied:
+        events.append(ApplicationEvent(
+            application=t.application,
+            event_type=t.event_type,
+            from_status=t.from_status,
+            to_status=t.to_status,
+            actor=actor,
+            description=t.description or f'Status changed from {t.from_status} to {t.to_status}',
+            note=t.note
+        ))
+        fields = t.notification or t.default_notification()
+        notifications.append(Notification(application_id=t.application.pk, **fields))
+
+    ApplicationEvent.objects.bulk_create(events)
+    bulk_create_notifications(notifications)
@@ -1,12 +1,17 @@
 from django.urls import path
 from .views import (
-    ApplicationListCreateView, ApplicationDetailView,
-    ApplicationSubmitView, ApplicationAssignView, ApplicationStatusView
+    ApplicationListCreateView, ApplicationDetailView, ApplicationStatsView,
+    ApplicationSubmitView, ApplicationAssignView, ApplicationBulkAssignView, ApplicationStatusView,
+    ApplicationTimelineView, ApplicationStatusHistoryView
 )
 
 urlpatterns = [
     path('', ApplicationListCreateView.as_view(), name='application-list-create'),
+    path('stats/', ApplicationStatsView.as_view(), name='application-stats'),
+    path('bulk-assign/', ApplicationBulkAssignView.as_view(), name='application-bulk-assign'),
     path('<int:pk>/', ApplicationDetailView.as_view(), name='application-detail'),
+    path('<int:pk>/timeline/', ApplicationTimelineView.as_view(), name='application-timeline'),
+    path('<int:pk>/status-history/', ApplicationStatusHistoryView.as_view(), name='application-status-history'),
     path('<int:pk>/submit/', ApplicationSubmitView.as_view(), name='application-submit'),
     path('<int:pk>/assign/', ApplicationAssignView.as_view(), name='application-assign'),
     path('<int:pk>/status/', ApplicationStatusView.as_view(), name='application-status'),
@@ -2,20 +2,36 @@ from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django.utils import timezone
-from .models import Application, ApplicationTimeline, ApplicationStatus, ApplicationStatusHistory
+from apps.common.concurrency import (
+    OptimisticConcurrencyMixin, PreconditionFailed, VersionConflict, format_etag, parse_if_match
+)
+from apps.common.conditional import ConditionalGetMixin, latest_related_id
+from apps.common.pagination import CursorOptInPagination, KeysetPagination
+from apps.common.query_plans import QueryPlanMixin
+from .models import (
+    Application, ApplicationEvent, ApplicationEventType, ApplicationStatus, ApplicationStatusHistory,
+    ApplicationTimeline
+)
 from .serializers import (
     ApplicationListSerializer, ApplicationDetailSerializer,
     ApplicationCreateSerializer, ApplicationUpdateSerializer,
-    ApplicationStatusUpdateSerializer, ApplicationTimelineSerializer
+    ApplicationStatusUpdateSerializer, ApplicationTimelineSerializer, ApplicationStatusHistorySerializer,
+    BulkAssignSerializer
 )
-from apps.notifications.utils import create_notification
+from .assignment import bulk_assign, get_candidate_checkers
+from .transitions import InvalidTransition, transition
+from .search import SEARCH_PARAM, search_applications
+from .stats import get_summary, scoped_applications
+from apps.accounts.permissions import HasPermission
 from apps.notifications.models import NotificationType
 
 
-class ApplicationListCreateView(generics.ListCreateAPIView):
+class ApplicationListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     """List and create applications"""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -28,6 +44,14 @@ class ApplicationListCreateView(generics.ListCreateAPIView):
             return Application.objects.all()
         
         return Application.objects.none()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        text = self.request.query_params.get(SEARCH_PARAM, '').strip()
+        if text:
+            # Ranked full-text search within the caller's scope
+            queryset = search_applications(queryset, text)
+        return queryset
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -38,18 +62,34 @@ class ApplicationListCreateView(generics.ListCreateAPIView):
         application = serializer.save()
         
         # Create timeline event
-        ApplicationTimeline.objects.create(
+        ApplicationEvent.objects.create(
             application=application,
-            event_type='created',
+            event_type=ApplicationEventType.CREATED,
             description='Application created',
-            new_status=application.status,
-            user=self.request.user
+            to_status=application.status,
+            actor=self.request.user
         )
 
 
-class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ApplicationStatsView(APIView):
+    """Status, stage and review decision counts for the caller's scope"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_summary(request.user), status=status.HTTP_200_OK)
+
+
+class ApplicationDetailView(
+    ConditionalGetMixin, OptimisticConcurrencyMixin, QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """Retrieve, update, and delete application"""
     permission_classes = [permissions.IsAuthenticated]
+    etag_fields = ('version', 'updated_at')
+
+    def get_etag_annotations(self):
+        return {
+            'events': latest_related_id(ApplicationEvent.objects.all(), 'application'),
+        }
     
     def get_queryset(self):
         user = self.request.user
@@ -69,6 +109,30 @@ class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
         return ApplicationDetailSerializer
 
 
+class ApplicationEventListView(generics.ListAPIView):
+    """Base for the cursor-paginated event lists of one application"""
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    event_model = None
+
+    def get_queryset(self):
+        if not scoped_applications(self.request.user).filter(pk=self.kwargs['pk']).exists():
+            raise NotFound('Application not found')
+        return self.event_model.objects.select_related('actor').filter(application_id=self.kwargs['pk'])
+
+
+class ApplicationTimelineView(ApplicationEventListView):
+    """Full timeline of an application, newest first"""
+    serializer_class = ApplicationTimelineSerializer
+    event_model = ApplicationTimeline
+
+
+class ApplicationStatusHistoryView(ApplicationEventListView):
+    """Full status history of an application, newest first"""
+    serializer_class = ApplicationStatusHistorySerializer
+    event_model = ApplicationStatusHistory
+
+
 class ApplicationSubmitView(APIView):
     """Submit application"""
     permission_classes = [permissions.IsAuthenticated]
@@ -96,38 +160,22 @@ class ApplicationSubmitView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update application status
-        old_status = application.status
-        application.status = ApplicationStatus.SUBMITTED
-        application.submitted_at = timezone.now()
-        application.save()
-
-        ApplicationStatusHistory.objects.create(
-            application=application,
-            from_status=old_status,
-            to_status=application.status,
-            changed_by=request.user,
-            note='Application submitted'
-        )
-        
-        # Create timeline event
-        ApplicationTimeline.objects.create(
-            application=application,
-            event_type='submitted',
-            description='Application submitted for review',
-            previous_status=old_status,
-            new_status=application.status,
-            user=request.user
-        )
-        
-        # Create notification
-        create_notification(
-            user=request.user,
-            notification_type=NotificationType.APPLICATION_SUBMITTED,
-            title='Application Submitted',
-            message=f'Your application for {application.program_name} has been submitted successfully.',
-            application_id=application.id
-        )
+        try:
+            transition(
+                application, ApplicationStatus.SUBMITTED, request.user,
+                note='Application submitted',
+                event_type=ApplicationEventType.SUBMITTED,
+                description='Application submitted for review',
+                changes={'submitted_at': timezone.now()},
+                notification={
+                    'user': request.user,
+                    'notification_type': NotificationType.APPLICATION_SUBMITTED,
+                    'title': 'Application Submitted',
+                    'message': f'Your application for {application.program_name} has been submitted successfully.',
+                },
+            )
+        except InvalidTransition as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = ApplicationDetailSerializer(application)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -135,15 +183,11 @@ class ApplicationSubmitView(APIView):
 
 class ApplicationAssignView(APIView):
     """Assign application to checker (admin only)"""
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [
+        HasPermission('applications.assign', message='Only admins can assign applications')
+    ]
     
     def post(self, request, pk):
-        if not request.user.is_admin():
-            return Response(
-                {'error': 'Only admins can assign applications'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         try:
             application = Application.objects.get(pk=pk)
         except Application.DoesNotExist:
@@ -159,89 +203,97 @@ class ApplicationAssignView(APIView):
         except User.DoesNotExist:
             return Response({'error': 'Checker not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        application.assigned_checker = checker
-        application.status = ApplicationStatus.UNDER_REVIEW
-        application.review_started_at = timezone.now()
-        application.save()
-
-        ApplicationStatusHistory.objects.create(
-            application=application,
-            from_status=ApplicationStatus.SUBMITTED,
-            to_status=application.status,
-            changed_by=request.user,
-            note='Application assigned to checker'
-        )
-        
-        # Create timeline event
-        ApplicationTimeline.objects.create(
-            application=application,
-            event_type='assigned',
-            description=f'Application assigned to {checker.full_name}',
-            new_status=application.status,
-            user=request.user
-        )
-        
-        # Notify checker
-        create_notification(
-            user=checker,
-            notification_type=NotificationType.REVIEW_ASSIGNED,
-            title='New Application Assigned',
-            message=f'Application #{application.id} for {application.program_name} has been assigned to you.',
-            application_id=application.id
-        )
+        try:
+            transition(
+                application, ApplicationStatus.UNDER_REVIEW, request.user,
+                note='Application assigned to checker',
+                event_type=ApplicationEventType.ASSIGNED,
+                description=f'Application assigned to {checker.full_name}',
+                changes={'assigned_checker': checker, 'review_started_at': timezone.now()},
+                notification={
+                    'user': checker,
+                    'notification_type': NotificationType.REVIEW_ASSIGNED,
+                    'title': 'New Application Assigned',
+                    'message': f'Application #{application.id} for {application.program_name} has been assigned to you.',
+                },
+            )
+        except InvalidTransition as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = ApplicationDetailSerializer(application)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class ApplicationBulkAssignView(APIView):
+    """Assign many applications at once, to given checkers or balanced automatically (admin only)"""
+    permission_classes = [
+        HasPermission('applications.assign', message='Only admins can assign applications')
+    ]
+
+    def post(self, request):
+        serializer = BulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data['auto']:
+            checkers = get_candidate_checkers()
+        else:
+            checker_ids = set(data['checker_ids'])
+            checkers = get_candidate_checkers(checker_ids)
+            missing = checker_ids - {checker.pk for checker in checkers}
+            if missing:
+                return Response(
+                    {'error': f'Checkers not found: {", ".join(map(str, sorted(missing)))}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        results = bulk_assign(data['application_ids'], checkers, assigned_by=request.user)
+        assigned = sum(1 for result in results if result['status'] == 'assigned')
+        return Response({
+            'assigned': assigned,
+            'failed': len(results) - assigned,
+            'results': results,
+        }, status=status.HTTP_200_OK)
+
+
 class ApplicationStatusView(APIView):
     """Update application status (checker/admin only)"""
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [
+        HasPermission(
+            'applications.change_status',
+            message='Only checkers and admins can update application status'
+        )
+    ]
     
     def patch(self, request, pk):
-        if not (request.user.is_checker() or request.user.is_admin()):
-            return Response(
-                {'error': 'Only checkers and admins can update application status'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         try:
             application = Application.objects.get(pk=pk)
         except Application.DoesNotExist:
             return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = ApplicationStatusUpdateSerializer(application, data=request.data, partial=True)
+        expected_version = parse_if_match(request)
+        serializer = ApplicationStatusUpdateSerializer(
+            application, data=request.data, partial=True,
+            context={'expected_version': expected_version}
+        )
         if serializer.is_valid():
-            old_status = application.status
-            application = serializer.save()
-
-            ApplicationStatusHistory.objects.create(
-                application=application,
-                from_status=old_status,
-                to_status=application.status,
-                changed_by=request.user,
-                note='Status updated'
-            )
-            
-            # Create timeline event
-            ApplicationTimeline.objects.create(
-                application=application,
-                event_type='status_updated',
-                description=f'Status changed from {old_status} to {application.status}',
-                previous_status=old_status,
-                new_status=application.status,
-                user=request.user
-            )
-            
-            # Notify student
-            create_notification(
-                user=application.student,
-                notification_type=NotificationType.STATUS_CHANGED,
-                title='Application Status Updated',
-                message=f'Your application status has been updated to: {application.get_status_display()}',
-                application_id=application.id
+            changes = dict(serializer.validated_data)
+            new_status = changes.pop('status', application.status)
+            if new_status == application.status:
+                serializer.save()
+            else:
+                try:
+                    transition(
+                        application, new_status, request.user, note='Status updated',
+                        changes=changes, expected_version=expected_version
+                    )
+                except VersionConflict:
+                    raise PreconditionFailed()
+                except InvalidTransition as exc:
+                    return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                serializer.data, status=status.HTTP_200_OK,
+                headers={'ETag': format_etag(application.version)}
             )
-            
-            return Response(serializer.data, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,77 @@
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User, UserRole
+from .models import Log
+
+
+class LogCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        Log.objects.bulk_create([
+            Log(action=f'action {i}', entity_type='application', entity_id=i)
+            for i in range(45)
+        ])
+        # Force timestamp ties so the id tiebreaker is exercised.
+        Log.objects.filter(entity_id__lt=30).update(created_at=timezone.now())
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_cursor_pages_cover_every_row_once_in_order(self):
+        seen = self.walk('/api/audit/logs/?paginate=cursor')
+        expected = list(Log.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_concurrent_inserts_do_not_shift_pages(self):
+        first = self.client.get('/api/audit/logs/?paginate=cursor')
+        first_ids = [row['id'] for row in first.data['results']]
+        Log.objects.create(action='late', entity_type='application')
+
+        rest = self.walk(first.data['next'])
+        self.assertFalse(set(first_ids) & set(rest))
+        self.assertEqual(len(first_ids) + len(rest), 45)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get('/api/audit/logs/?paginate=cursor')
+        self.assertNotIn('count', first.data)
+        self.assertIsNone(first.data['previous'])
+
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']]
+        )
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/api/audit/logs/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_estimated_count(self):
+        response = self.client.get('/api/audit/logs/?paginate=cursor&count=estimated')
+        self.assertIsInstance(response.data['count'], int)
+
+        response = self.client.get('/api/audit/logs/?count=estimated')
+        self.assertIsInstance(response.data['count'], int)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_page_number_mode_is_unchanged(self):
+        response = self.client.get('/api/audit/logs/?page=3')
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 5)
@@ -1,5 +1,6 @@
 from rest_framework import viewsets
 from apps.accounts.permissions import IsAdminRole
+from apps.common.pagination import CursorOptInPagination
 from .models import Log, SystemEvent, FeatureFlag, SystemSetting
 from .serializers import LogSerializer, SystemEventSerializer, FeatureFlagSerializer, SystemSettingSerializer
 
@@ -8,6 +9,7 @@ class LogViewSet(viewsets.ReadOnlyModelViewSet):
 	queryset = Log.objects.select_related('actor_user').all()
 	serializer_class = LogSerializer
 	permission_classes = [IsAdminRole]
+	pagination_class = CursorOptInPagination
 
 
 class SystemEventViewSet(viewsets.ReadOnlyModelViewSet):
@@ -0,0 +1,145 @@
+"""
+Optimistic concurrency control.
+
+``VersionedModel`` adds a ``version`` column that every save increments.
+Detail endpoints expose it as an ``ETag`` and accept ``If-Match``; updates go
+through ``versioned_save``, a single ``UPDATE ... WHERE pk = %s AND version
+= %s``. When another writer got there first the UPDATE matches no row and
+the request fails with 412 without any further reads.
+"""
+from django.db import models
+from django.db.models.signals import post_save
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class VersionConflict(Exception):
+    pass
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified. Reload it and try again.'
+    default_code = 'precondition_failed'
+
+
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+
+
+def versioned_save(instance, expected_version, fields):
+    """
+    Write ``fields`` of ``instance`` only if the row is still at ``expected_version``.
+
+    ``auto_now`` fields are refreshed and ``post_save`` is sent as for a
+    regular save. Raises ``VersionConflict`` when the row has moved on.
+    """
+    model = type(instance)
+    names = set(fields)
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            field.pre_save(instance, add=False)
+            names.add(field.name)
+
+    values = {}
+    for name in names:
+        attname = model._meta.get_field(name).attname
+        values[attname] = getattr(instance, attname)
+
+    updated = model._default_manager.filter(pk=instance.pk, version=expected_version).update(
+        version=expected_version + 1, **values
+    )
+    if not updated:
+        raise VersionConflict(f'{model.__name__} {instance.pk} is no longer at version {expected_version}')
+
+    instance.version = expected_version + 1
+    post_save.send(
+        sender=model, instance=instance, created=False,
+        update_fields=frozenset(names | {'version'}), raw=False, using=instance._state.db
+    )
+    return instance
+
+
+def format_etag(version):
+    return f'"{version}"'
+
+
+def parse_if_match(request):
+    """
+    Version required by the request's ``If-Match`` header.
+
+    Returns ``None`` without a header (or for ``*``). Any tag that is not one
+    of our version tags can never match, so it raises ``PreconditionFailed``.
+    """
+    header = request.headers.get('If-Match')
+    if not header or header.strip() == '*':
+        return None
+    tag = header.split(',')[0].strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"').split('.')[0])
+    except ValueError:
+        raise PreconditionFailed()
+
+
+class VersionedSerializerMixin:
+    """ModelSerializer mixin whose updates are conditional on the version"""
+
+    def update(self, instance, validated_data):
+        expected = self.context.get('expected_version')
+        if expected is None:
+            expected = instance.version
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        try:
+            return versioned_save(instance, expected, validated_data.keys())
+        except VersionConflict:
+            raise PreconditionFailed()
+
+
+class OptimisticConcurrencyMixin:
+    """
+    Generic view mixin for versioned detail endpoints.
+
+    Adds an ``ETag`` to successful responses and makes updates and deletes
+    conditional on ``If-Match``. Without the header, updates still only
+    apply to the version that was read for the request.
+    """
+
+    def get_object(self):
+        obj = super().get_object()
+        self.versioned_object = obj
+        return obj
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method in ('PUT', 'PATCH'):
+            context['expected_version'] = parse_if_match(self.request)
+        return context
+
+    def perform_destroy(self, instance):
+        expected = parse_if_match(self.request)
+        if expected is not None and expected != instance.version:
+            raise PreconditionFailed()
+        super().perform_destroy(instance)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        obj = getattr(self, 'versioned_object', None)
+        if (
+            obj is not None and status.is_success(response.status_code)
+            and request.method != 'DELETE' and not response.has_header('ETag')
+        ):
+            response['ETag'] = format_etag(obj.version)
+        return response
@@ -0,0 +1,218 @@
+"""
+Pagination for high-volume list endpoints.
+
+``CursorOptInPagination`` keeps the global page-number behaviour by default and
+switches to keyset pagination on ``(created_at, id)`` when the client asks for
+it with ``?paginate=cursor`` (or follows a ``cursor`` link). Keyset pages cost
+an index range scan instead of an OFFSET scan and stay stable while new rows
+are inserted at the head of the list.
+
+Either mode accepts ``?count=estimated`` to read the row count from Postgres
+planner statistics instead of running an exact ``COUNT(*)``.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Estimate the number of rows a queryset returns from planner statistics.
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones read the
+    top-level row estimate of ``EXPLAIN``. Falls back to an exact count on
+    other databases or when the table has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+        return queryset.count()
+
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def wants_estimated_count(request):
+    return request.query_params.get('count') == 'estimated'
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator whose count comes from planner statistics"""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a ``(timestamp, id)`` ordering.
+
+    The cursor encodes the last row's position rather than an offset, so each
+    page is a range scan and rows inserted concurrently never shift or
+    duplicate entries across pages.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    position_field = 'created_at'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.count = estimate_count(queryset) if wants_estimated_count(request) else None
+
+        position, pk, reverse = self.decode_cursor(request)
+        field = self.position_field
+
+        if reverse:
+            queryset = queryset.order_by(field, 'id')
+            if position is not None:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__gt': position}) | Q(**{field: position, 'id__gt': pk})
+                )
+        else:
+            queryset = queryset.order_by(f'-{field}', '-id')
+            if position is not None:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__lt': position}) | Q(**{field: position, 'id__lt': pk})
+                )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = parse_datetime(data['p'])
+            pk = int(data['i'])
+            reverse = bool(data.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if position is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, pk, reverse
+
+    def encode_cursor(self, obj, reverse):
+        data = {'p': getattr(obj, self.position_field).isoformat(), 'i': obj.pk}
+        if reverse:
+            data['r'] = True
+        encoded = b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+
+class CursorOptInPagination(PageNumberPagination):
+    """
+    Page-number pagination with opt-in keyset mode.
+
+    ``?paginate=cursor`` (or a ``cursor`` parameter) selects keyset mode and
+    ``?count=estimated`` replaces the exact count with a planner estimate.
+    Views using this class must be ordered by ``created_at``/``id``.
+    """
+    keyset_class = KeysetPagination
+    mode_query_param = 'paginate'
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if wants_estimated_count(request):
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" to use keyset pagination.',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.keyset_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Keyset pagination cursor.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': 'count',
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "estimated" to use planner statistics for the count.',
+                'schema': {'type': 'string', 'enum': ['estimated']},
+            },
+        ]
+        return parameters
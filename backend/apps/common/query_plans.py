@@ -0,0 +1,50 @@
+"""
+Declarative queryset shaping for serializers.
+
+A serializer declares the relations and columns it reads through a
+``query_plan`` attribute; views mixing in ``QueryPlanMixin`` apply that plan
+to their (already scoped) queryset so that rendering a page costs a constant
+number of queries regardless of its size.
+"""
+
+
+class QueryPlan:
+    """select_related / prefetch_related / only() / annotate() sets for one serializer"""
+
+    def __init__(self, select_related=(), prefetch_related=(), only=(), annotations=None):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.only = tuple(only)
+        self.annotations = dict(annotations or {})
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset
+
+
+def get_query_plan(serializer_class):
+    return getattr(serializer_class, 'query_plan', None)
+
+
+class QueryPlanMixin:
+    """
+    Apply the active serializer's query plan to the view queryset.
+
+    The plan is applied in ``filter_queryset`` so that it wraps whatever
+    role scoping the view performs in ``get_queryset`` and is used by both
+    ``list`` and ``get_object``.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        plan = get_query_plan(self.get_serializer_class())
+        if plan is not None:
+            queryset = plan.apply(queryset)
+        return queryset
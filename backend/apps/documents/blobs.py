@@ -0,0 +1,151 @@
+"""
+Content-addressed document storage.
+
+File contents are stored once per SHA-256 as a ``DocumentBlob`` under
+``blobs/ab/cd/<sha256>``; a ``Document`` points at its blob and its ``file``
+field names the same path. Uploading bytes that are already stored only
+inserts the ``Document`` row and bumps the blob's ``ref_count``.
+
+Concurrency rules:
+
+* ``attach_blob`` locks the blob row (``SELECT ... FOR UPDATE``, creating it
+  if needed) before it checks for or writes the file, and increments
+  ``ref_count`` in the same transaction as the document insert.
+* ``release_blob`` decrements the count when a document goes away; the row
+  and file are left for the collector.
+* ``collect_garbage`` only takes blobs that are unreferenced, unlocked
+  (``SKIP LOCKED``) and untouched for a grace period, and deletes the file
+  while still holding the row lock. An upload that wants the same blob waits
+  for that lock and then finds no row, so it writes the file again.
+* Files with no row at all (an upload that died between writing the file
+  and committing) are swept once they are older than the grace period,
+  which in-flight uploads never are.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Document, DocumentBlob, blob_path
+
+BLOB_ROOT = 'blobs'
+
+
+def gc_grace_period():
+    return timedelta(seconds=getattr(settings, 'DOCUMENT_BLOB_GC_GRACE', 3600))
+
+
+def write_blob_file(name, file_obj):
+    if default_storage.exists(name):
+        return
+    saved = default_storage.save(name, file_obj)
+    if saved != name:
+        # A concurrent writer stored the same bytes first
+        default_storage.delete(saved)
+
+
+def attach_blob(file_obj, checksum, size, mime_type):
+    """
+    Blob for ``file_obj``, with one more reference.
+
+    Must run in the transaction that creates the referencing document.
+    """
+    name = blob_path(checksum)
+    with transaction.atomic():
+        blob, created = DocumentBlob.objects.select_for_update().get_or_create(
+            checksum=checksum,
+            defaults={'file': name, 'size': size, 'mime_type': mime_type}
+        )
+        if created or not default_storage.exists(blob.file.name):
+            write_blob_file(blob.file.name, file_obj)
+        DocumentBlob.objects.filter(pk=blob.pk).update(
+            ref_count=F('ref_count') + 1, updated_at=timezone.now()
+        )
+    blob.ref_count += 1
+    return blob
+
+
+def release_blob(blob_id):
+    if blob_id is None:
+        return
+    DocumentBlob.objects.filter(pk=blob_id).update(
+        ref_count=Greatest(F('ref_count') - 1, 0), updated_at=timezone.now()
+    )
+
+
+def unreferenced_blobs(cutoff):
+    return (
+        DocumentBlob.objects
+        .filter(ref_count=0, updated_at__lt=cutoff)
+        .exclude(Exists(Document.objects.filter(blob=OuterRef('pk'))))
+    )
+
+
+def collect_blobs(cutoff, batch_size):
+    """Delete unreferenced blobs idle since before ``cutoff``; returns how many"""
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            blobs = list(
+                unreferenced_blobs(cutoff).select_for_update(skip_locked=True).order_by('pk')[:batch_size]
+            )
+            if not blobs:
+                return deleted
+            for blob in blobs:
+                default_storage.delete(blob.file.name)
+            DocumentBlob.objects.filter(pk__in=[blob.pk for blob in blobs]).delete()
+        deleted += len(blobs)
+
+
+def walk_files(directory):
+    subdirectories, files = default_storage.listdir(directory)
+    for name in files:
+        yield f'{directory}/{name}'
+    for subdirectory in subdirectories:
+        yield from walk_files(f'{directory}/{subdirectory}')
+
+
+def sweep_orphan_files(cutoff, batch_size):
+    """Delete blob files with no row that were last written before ``cutoff``"""
+    if not default_storage.exists(BLOB_ROOT):
+        return 0
+
+    def sweep(names):
+        known = set(DocumentBlob.objects.filter(file__in=names).values_list('file', flat=True))
+        swept = 0
+        for name in names:
+            if name not in known and default_storage.get_modified_time(name) < cutoff:
+                default_storage.delete(name)
+                swept += 1
+        return swept
+
+    swept = 0
+    pending = []
+    for name in walk_files(BLOB_ROOT):
+        pending.append(name)
+        if len(pending) >= batch_size:
+            swept += sweep(pending)
+            pending = []
+    if pending:
+        swept += sweep(pending)
+    return swept
+
+
+def collect_garbage(grace=None, batch_size=500, dry_run=False):
+    """
+    Remove unreferenced blobs and orphaned blob files.
+
+    Returns ``{'blobs': n, 'orphans': m}``; with ``dry_run`` only the
+    unreferenced blobs are counted and nothing is deleted.
+    """
+    cutoff = timezone.now() - (grace if grace is not None else gc_grace_period())
+    if dry_run:
+        return {'blobs': unreferenced_blobs(cutoff).count(), 'orphans': None}
+    return {
+        'blobs': collect_blobs(cutoff, batch_size),
+        'orphans': sweep_orphan_files(cutoff, batch_size),
+    }
@@ -0,0 +1,172 @@
+"""
+Document downloads.
+
+``serve_file`` answers a download the caller has already authorised, by
+storage name; ``serve_document`` does so for a ``Document``. Python never
+holds more than one block of the file in memory:
+
+* With ``DOCUMENT_DOWNLOAD_OFFLOAD = 'x-accel-redirect'`` the response only
+  names the file, as ``DOCUMENT_ACCEL_REDIRECT_PREFIX`` + its storage name,
+  and nginx sends it from an ``internal`` location aliased to MEDIA_ROOT.
+  ``'x-sendfile'`` does the same with the absolute path for Apache
+  (mod_xsendfile) or lighttpd. The proxy handles ranges itself.
+* Otherwise ``FileResponse`` streams the file in ``BLOCK_SIZE`` chunks. A
+  single ``Range: bytes=...`` is answered with ``206`` and only that slice;
+  multiple or malformed ranges get the whole file, as RFC 9110 allows.
+* Storage without local paths (S3) redirects to the storage's own URL,
+  which is presigned when querystring auth is on.
+
+Only ``INLINE_MIME_TYPES`` are served inline with their own type. Anything
+else, such as a file stored before uploads were sniffed, is sent as an
+``application/octet-stream`` attachment, so the browser never renders it on
+the API's origin.
+"""
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.utils.http import content_disposition_header
+
+from .uploads import ALLOWED_MIME_TYPES
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+X_ACCEL_REDIRECT = 'x-accel-redirect'
+X_SENDFILE = 'x-sendfile'
+
+INLINE_MIME_TYPES = ALLOWED_MIME_TYPES
+
+
+def download_offload():
+    return getattr(settings, 'DOCUMENT_DOWNLOAD_OFFLOAD', '').lower()
+
+
+def accel_redirect_prefix():
+    return getattr(settings, 'DOCUMENT_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Inclusive ``(start, end)`` of a single byte range, or None for the whole file.
+
+    Raises ``RangeNotSatisfiable`` when the range starts past the end.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = size - 1 if not last else min(int(last), size - 1)
+        if last and int(last) < start:
+            return None
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable()
+        start, end = max(size - suffix, 0), size - 1
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+class FileSlice:
+    """Read-only view of ``length`` bytes of ``file`` from its current position"""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def etag_for(document):
+    return f'"{document.checksum}"' if document.checksum else None
+
+
+def safe_content_headers(file_name, mime_type):
+    """``(Content-Type, Content-Disposition)`` to send a stored file with"""
+    if mime_type in INLINE_MIME_TYPES:
+        return mime_type, content_disposition_header(False, file_name)
+    return 'application/octet-stream', content_disposition_header(True, file_name)
+
+
+def with_download_headers(response, file_name, mime_type, etag):
+    response['Content-Type'], response['Content-Disposition'] = safe_content_headers(file_name, mime_type)
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['Cache-Control'] = 'private'
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
+def offloaded_response(name, path):
+    response = HttpResponse()
+    if download_offload() == X_SENDFILE:
+        response['X-Sendfile'] = path
+    else:
+        response['X-Accel-Redirect'] = quote(accel_redirect_prefix() + name)
+    return response
+
+
+def streamed_response(request, name, etag):
+    size = default_storage.size(name)
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if if_range is None or (etag and if_range == etag):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = default_storage.open(name, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(FileSlice(file, end - start + 1), status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response.block_size = BLOCK_SIZE
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve_file(request, name, file_name, mime_type, etag=None):
+    """Response sending stored file ``name``, downloaded as ``file_name``"""
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        return HttpResponseRedirect(default_storage.url(name))
+    if not default_storage.exists(name):
+        raise Http404('File not found')
+    if download_offload() in (X_ACCEL_REDIRECT, X_SENDFILE):
+        response = offloaded_response(name, path)
+    else:
+        response = streamed_response(request, name, etag)
+    if response.status_code == 416:
+        return response
+    return with_download_headers(response, file_name, mime_type, etag)
+
+
+def serve_document(request, document):
+    return serve_file(request, document.file.name, document.file_name, document.mime_type, etag_for(document))
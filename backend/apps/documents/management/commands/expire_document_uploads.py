@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.documents.resumable import expire_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete resumable document uploads that have been idle too long, with their partial files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--idle-hours', type=int, default=None,
+            help='Expire sessions idle for at least this long (default DOCUMENT_UPLOAD_SESSION_TTL)'
+        )
+
+    def handle(self, *args, **options):
+        idle = options['idle_hours']
+        expired = expire_sessions(ttl=timedelta(hours=idle) if idle is not None else None)
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} upload sessions'))
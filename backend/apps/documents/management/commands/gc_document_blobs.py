@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.documents.blobs import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete stored document blobs that no document references any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes', type=int, default=None,
+            help='Only collect blobs unreferenced for at least this long (default DOCUMENT_BLOB_GC_GRACE)'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Blobs deleted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Count collectable blobs without deleting')
+
+    def handle(self, *args, **options):
+        grace = options['grace_minutes']
+        result = collect_garbage(
+            grace=timedelta(minutes=grace) if grace is not None else None,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{result['blobs']} unreferenced blobs would be deleted"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {result['blobs']} unreferenced blobs and {result['orphans']} orphaned files"
+            ))
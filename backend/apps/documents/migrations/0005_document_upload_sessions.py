@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('applications', '0005_application_search_vector'),
+        ('documents', '0004_document_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentUploadSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document_type', models.CharField(choices=[('TRANSCRIPT', 'Academic Transcript'), ('TEST_SCORE', 'Standardized Test Score'), ('ESSAY', 'Essay/Personal Statement'), ('RECOMMENDATION_LETTER', 'Recommendation Letter'), ('PORTFOLIO', 'Portfolio'), ('CERTIFICATE', 'Certificate'), ('ID_DOCUMENT', 'ID Document'), ('OTHER', 'Other')], max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(help_text='Declared file size in bytes')),
+                ('offset', models.BigIntegerField(default=0, help_text='Bytes received so far')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='applications.application')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'document_upload_sessions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['updated_at'], name='doc_upload_sessions_upd_idx')],
+            },
+        ),
+    ]
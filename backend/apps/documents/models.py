@@ -22,11 +22,46 @@ class DocumentStatus(models.TextChoices):
     NEEDS_RESUBMISSION = 'NEEDS_RESUBMISSION', 'Needs Resubmission'
 
 
+DOCUMENT_EXTENSIONS = ['pdf', 'jpg', 'jpeg', 'png']
+
+
 def document_upload_path(instance, filename):
     """Generate upload path: documents/{application_id}/{document_type}/{filename}"""
     return f'documents/{instance.application.id}/{instance.document_type}/{filename}'
 
 
+def blob_path(checksum):
+    """Content-addressed path: blobs/ab/cd/abcd..."""
+    return f'blobs/{checksum[:2]}/{checksum[2:4]}/{checksum}'
+
+
+class DocumentBlob(models.Model):
+    """
+    Stored file contents, shared by every document with the same SHA-256.
+
+    ``ref_count`` is the number of ``Document`` rows pointing at the blob; see
+    blobs.py for how it is maintained and when unreferenced blobs are deleted.
+    """
+
+    checksum = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField()
+    mime_type = models.CharField(max_length=100)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'document_blobs'
+        indexes = [
+            models.Index(fields=['updated_at'], condition=models.Q(ref_count=0), name='document_blobs_unref_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.checksum} ({self.ref_count} refs)"
+
+
 class Document(models.Model):
     """Document uploads for applications"""
     
@@ -46,13 +81,21 @@ class Document(models.Model):
         upload_to=document_upload_path,
         validators=[
             FileExtensionValidator(
-                allowed_extensions=['pdf', 'jpg', 'jpeg', 'png']
+                allowed_extensions=DOCUMENT_EXTENSIONS
             )
         ]
     )
     file_name = models.CharField(max_length=255)
     file_size = models.IntegerField(help_text="File size in bytes")
     mime_type = models.CharField(max_length=100, blank=True)
+    checksum = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the file contents")
+    blob = models.ForeignKey(
+        DocumentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='documents'
+    )
     
     # Document details
     title = models.CharField(max_length=255, help_text="Document title/description")
@@ -113,6 +156,46 @@ class Document(models.Model):
         return self.status == DocumentStatus.VERIFIED
 
 
+class DocumentUploadSession(models.Model):
+    """
+    A resumable upload in progress; becomes a ``Document`` once complete.
+
+    ``offset`` is how many bytes of the file are stored so far; see
+    resumable.py for the protocol.
+    """
+
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    document_type = models.CharField(max_length=30, choices=DocumentType.choices)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    file_name = models.CharField(max_length=255)
+    size = models.BigIntegerField(help_text="Declared file size in bytes")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received so far")
+
+    uploaded_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='document_upload_sessions'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'document_upload_sessions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at'], name='doc_upload_sessions_upd_idx'),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.file_name} ({self.offset}/{self.size} bytes)"
+
+
 class RecommendationLetterRequest(models.Model):
     """Track recommendation letter requests sent to recommenders"""
     
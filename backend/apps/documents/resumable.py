@@ -0,0 +1,186 @@
+"""
+Resumable document uploads.
+
+A client opens a ``DocumentUploadSession`` with the file's name and total
+size, sends the bytes in any number of ``PATCH`` requests that each carry the
+``Upload-Offset`` they start at, and finally completes the session, which
+creates the ``Document`` through ``DocumentUploadSerializer`` like a normal
+upload. After a dropped connection the client asks for the session's offset
+and carries on from there.
+
+The partial file lives under ``DOCUMENT_PARTIAL_UPLOAD_DIR`` on local disk,
+one file per session, written in place at the requested offset. Bytes that
+arrived before a connection dropped are kept. A chunk holds an exclusive
+``flock`` on the partial file, so two requests can never write one session
+at the same time; the database row only records how far the file is known
+to be good.
+
+On completion the partial file is wrapped as an uploaded file that reports
+its own path, so ``FileSystemStorage`` moves it into blob storage instead of
+copying it. It is read once, in chunks, for its checksum and content type.
+
+Sessions idle for longer than ``DOCUMENT_UPLOAD_SESSION_TTL`` are removed by
+``expire_document_uploads`` together with their partial files.
+"""
+import errno
+import fcntl
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from .models import DocumentUploadSession
+from .uploads import (
+    ALLOWED_MIME_TYPES, SNIFF_BYTES, UploadRejected, file_metadata, sniff_mime_type, unsupported_type
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def partial_upload_dir():
+    return str(getattr(settings, 'DOCUMENT_PARTIAL_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'partial_uploads')))
+
+
+def max_resumable_size():
+    return getattr(settings, 'DOCUMENT_RESUMABLE_MAX_SIZE', 500 * 1024 * 1024)
+
+
+def session_ttl():
+    return timedelta(seconds=getattr(settings, 'DOCUMENT_UPLOAD_SESSION_TTL', 24 * 3600))
+
+
+def partial_path(session_id):
+    return os.path.join(partial_upload_dir(), str(session_id))
+
+
+def start_partial_file(session_id):
+    os.makedirs(partial_upload_dir(), exist_ok=True)
+    open(partial_path(session_id), 'wb').close()
+
+
+def discard_partial_file(session_id):
+    try:
+        os.remove(partial_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def append_chunk(session, offset, stream, length):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset``; returns the new offset.
+
+    The session's offset is saved even when the client disconnects part way,
+    so the next chunk can start from the last byte that reached the disk.
+    """
+    if offset != session.offset:
+        raise UploadRejected(f'Upload-Offset must be {session.offset}', 409)
+    if length > session.size - offset:
+        raise UploadRejected('Chunk runs past the declared upload size', 413)
+
+    try:
+        partial = open(partial_path(session.pk), 'r+b')
+    except FileNotFoundError:
+        raise UploadRejected('Upload data is missing; start a new upload', 410)
+
+    with partial:
+        try:
+            fcntl.flock(partial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as exc:
+            if exc.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            raise UploadRejected('Another chunk of this upload is in progress', 409)
+
+        # Re-read under the lock: a chunk that finished meanwhile moved the offset
+        session.refresh_from_db(fields=['offset'])
+        if offset != session.offset:
+            raise UploadRejected(f'Upload-Offset must be {session.offset}', 409)
+
+        partial.seek(offset)
+        head = b''
+        interrupted = False
+        remaining = length
+        while remaining:
+            try:
+                chunk = stream.read(min(CHUNK_SIZE, remaining))
+            except UnreadablePostError:
+                interrupted = True
+                break
+            if not chunk:
+                interrupted = True
+                break
+            if offset == 0 and len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+                if len(head) >= SNIFF_BYTES and sniff_mime_type(head) not in ALLOWED_MIME_TYPES:
+                    raise unsupported_type()
+            partial.write(chunk)
+            remaining -= len(chunk)
+        partial.flush()
+        # Drop anything an earlier, unrecorded write left past this point
+        partial.truncate()
+        new_offset = partial.tell()
+
+        DocumentUploadSession.objects.filter(pk=session.pk).update(offset=new_offset, updated_at=timezone.now())
+        session.offset = new_offset
+
+    if interrupted:
+        raise UploadRejected('Upload interrupted; resume from the returned offset', 400)
+    return new_offset
+
+
+class PartialUploadFile(UploadedFile):
+    """A finished partial upload, moved rather than copied by file storage"""
+
+    def __init__(self, session):
+        self.path = partial_path(session.pk)
+        super().__init__(open(self.path, 'rb'), session.file_name, None, session.size)
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def open_completed_upload(session):
+    """
+    The session's file, ready to hand to ``DocumentUploadSerializer``.
+
+    Carries ``content_type`` and ``checksum`` like a streamed upload does.
+    """
+    if session.offset != session.size:
+        raise UploadRejected(f'Upload is incomplete: {session.offset} of {session.size} bytes received', 409)
+    try:
+        upload = PartialUploadFile(session)
+    except FileNotFoundError:
+        raise UploadRejected('Upload data is missing; start a new upload', 410)
+
+    try:
+        size, mime_type, checksum = file_metadata(upload)
+    except UploadRejected:
+        upload.close()
+        raise
+    if size != session.size:
+        upload.close()
+        raise UploadRejected('Upload data does not match the session', 409)
+    upload.content_type = mime_type
+    upload.checksum = checksum
+    return upload
+
+
+def expire_sessions(ttl=None):
+    """Delete idle sessions and stray partial files; returns how many sessions"""
+    cutoff = timezone.now() - (ttl if ttl is not None else session_ttl())
+    expired = list(DocumentUploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in expired:
+        discard_partial_file(session.pk)
+    DocumentUploadSession.objects.filter(pk__in=[session.pk for session in expired]).delete()
+
+    directory = partial_upload_dir()
+    if os.path.isdir(directory):
+        live = {str(pk) for pk in DocumentUploadSession.objects.values_list('pk', flat=True)}
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            modified = datetime.fromtimestamp(os.path.getmtime(path), tz=dt_timezone.utc)
+            if name not in live and modified < cutoff:
+                os.remove(path)
+    return len(expired)
@@ -1,5 +1,25 @@
+from django.core.files import File
+from django.core.validators import FileExtensionValidator
 from rest_framework import serializers
-from .models import Document, RecommendationLetterRequest, DocumentStatus
+from .models import DOCUMENT_EXTENSIONS, Document, DocumentUploadSession, RecommendationLetterRequest, DocumentStatus
+from .blobs import attach_blob, release_blob
+from .resumable import max_resumable_size, session_ttl
+from .signing import signed_url
+from .uploads import UploadRejected, file_metadata, max_upload_size
+
+
+def store_upload(validated_data):
+    """Replace the uploaded file in ``validated_data`` with its shared blob"""
+    file_obj = validated_data.pop('file')
+    try:
+        size, mime_type, checksum = file_metadata(file_obj)
+    except UploadRejected as rejection:
+        raise serializers.ValidationError({'file': [str(rejection)]})
+    blob = attach_blob(file_obj, checksum, size, mime_type)
+    validated_data.update(
+        blob=blob, file=blob.file.name, file_name=file_obj.name,
+        file_size=size, mime_type=mime_type, checksum=checksum
+    )
 
 
 class DocumentSerializer(serializers.ModelSerializer):
@@ -16,27 +36,40 @@ class DocumentSerializer(serializers.ModelSerializer):
         model = Document
         fields = '__all__'
         read_only_fields = [
-            'file_name', 'file_size', 'mime_type', 'uploaded_at', 'updated_at',
-            'status', 'verified_by', 'verified_at', 'verification_notes', 'uploaded_by'
+            'file_name', 'file_size', 'mime_type', 'checksum', 'uploaded_at', 'updated_at',
+            'status', 'verified_by', 'verified_at', 'verification_notes', 'uploaded_by', 'blob'
         ]
 
     def get_file_url(self, obj):
         request = self.context.get('request')
         if not obj.file:
             return None
-        url = obj.file.url
+        # Only signs, no queries: cheap for every document in a list
+        url = signed_url(obj)
         return request.build_absolute_uri(url) if request else url
     
+    def validate_file(self, file_obj):
+        # Files not streamed through the upload handler (other parsers, scripts)
+        limit = max_upload_size()
+        if file_obj and file_obj.size > limit:
+            raise serializers.ValidationError(f'File exceeds the {limit // (1024 * 1024)} MB upload limit')
+        return file_obj
+
     def create(self, validated_data):
-        # Extract file metadata
-        file_obj = validated_data.get('file')
-        if file_obj:
-            validated_data['file_name'] = file_obj.name
-            validated_data['file_size'] = file_obj.size
-            validated_data['mime_type'] = file_obj.content_type
+        if validated_data.get('file'):
+            store_upload(validated_data)
         
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        replaced_blob_id = None
+        if validated_data.get('file'):
+            replaced_blob_id = instance.blob_id
+            store_upload(validated_data)
+        instance = super().update(instance, validated_data)
+        release_blob(replaced_blob_id)
+        return instance
+
 
 class DocumentUploadSerializer(serializers.ModelSerializer):
     """Simplified serializer for document upload"""
@@ -46,16 +79,45 @@ class DocumentUploadSerializer(serializers.ModelSerializer):
         fields = ['application', 'document_type', 'file', 'title', 'description']
     
     def create(self, validated_data):
-        file_obj = validated_data.get('file')
-        if file_obj:
-            validated_data['file_name'] = file_obj.name
-            validated_data['file_size'] = file_obj.size
-            validated_data['mime_type'] = file_obj.content_type
+        if validated_data.get('file'):
+            store_upload(validated_data)
         
         validated_data['status'] = DocumentStatus.PENDING
         return super().create(validated_data)
 
 
+class DocumentUploadSessionSerializer(serializers.ModelSerializer):
+    """Resumable upload: the future document's fields plus upload progress"""
+    expires_at = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DocumentUploadSession
+        fields = [
+            'id', 'application', 'document_type', 'title', 'description', 'file_name',
+            'size', 'offset', 'created_at', 'updated_at', 'expires_at'
+        ]
+        read_only_fields = ['offset', 'created_at', 'updated_at']
+
+    def get_expires_at(self, obj):
+        return obj.updated_at + session_ttl()
+
+    def validate_application(self, application):
+        user = self.context['request'].user
+        if user.is_student() and application.student_id != user.id:
+            raise serializers.ValidationError('You can only upload documents to your own applications')
+        return application
+
+    def validate_file_name(self, file_name):
+        FileExtensionValidator(allowed_extensions=DOCUMENT_EXTENSIONS)(File(None, name=file_name))
+        return file_name
+
+    def validate_size(self, size):
+        limit = max_resumable_size()
+        if size <= 0 or size > limit:
+            raise serializers.ValidationError(f'Size must be between 1 and {limit} bytes')
+        return size
+
+
 class DocumentVerificationSerializer(serializers.ModelSerializer):
     """Serializer for document verification"""
     
@@ -0,0 +1,342 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, UserRole
+from apps.applications.models import Application, ApplicationStatus
+from .blobs import collect_garbage
+from .models import Document, DocumentBlob, DocumentUploadSession
+from .resumable import append_chunk, partial_path
+from .signing import current_expiry, signed_url
+from .uploads import UploadRejected, file_metadata
+
+PDF = b'%PDF-1.7\n' + b'0' * 200_000
+
+
+class DocumentTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+        cls.application = Application.objects.create(
+            student=cls.student, program_name='Computer Science', academic_year='2026-2027',
+            intake_period='Fall 2026', status=ApplicationStatus.DRAFT
+        )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+
+    def upload(self, content, name='transcript.pdf', content_type='application/pdf'):
+        return self.client.post('/api/documents/', {
+            'application': self.application.pk,
+            'document_type': 'TRANSCRIPT',
+            'title': 'Transcript',
+            'file': SimpleUploadedFile(name, content, content_type=content_type),
+        }, format='multipart')
+
+
+class DocumentUploadTests(DocumentTestCase):
+    def test_records_streamed_size_checksum_and_sniffed_type(self):
+        # The client's content type is ignored in favour of the file's bytes
+        response = self.upload(PDF, content_type='image/png')
+        self.assertEqual(response.status_code, 201)
+
+        document = Document.objects.get()
+        self.assertEqual(document.file_size, len(PDF))
+        self.assertEqual(document.mime_type, 'application/pdf')
+        self.assertEqual(document.checksum, hashlib.sha256(PDF).hexdigest())
+        with document.file.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_rejects_disallowed_content_with_an_allowed_extension(self):
+        response = self.upload(b'MZ\x90\x00' + b'\x00' * 1000, name='transcript.pdf')
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Document.objects.exists())
+
+    def test_files_not_streamed_through_the_handler_are_sniffed_too(self):
+        self.assertEqual(
+            file_metadata(SimpleUploadedFile('scan.png', PDF, content_type='image/png'))[1], 'application/pdf'
+        )
+        with self.assertRaises(UploadRejected):
+            file_metadata(SimpleUploadedFile('evil.pdf', b'<html>' * 100, content_type='application/pdf'))
+
+    @override_settings(DOCUMENT_UPLOAD_MAX_SIZE=150_000)
+    def test_rejects_oversize_files_mid_stream(self):
+        response = self.upload(PDF)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('error', response.data)
+        self.assertFalse(Document.objects.exists())
+
+
+class DocumentReplaceTests(DocumentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.assertEqual(self.upload(PDF).status_code, 201)
+        self.document = Document.objects.get()
+        self.url = f'/api/documents/{self.document.pk}/'
+
+    def replace(self, content, name='transcript.pdf', content_type='application/pdf'):
+        return self.client.patch(self.url, {
+            'file': SimpleUploadedFile(name, content, content_type=content_type),
+        }, format='multipart')
+
+    def test_replacement_is_sniffed_and_measured_like_an_upload(self):
+        png = b'\x89PNG\r\n\x1a\n' + b'0' * 1000
+        response = self.replace(png, name='transcript.png', content_type='text/html')
+        self.assertEqual(response.status_code, 200)
+
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.mime_type, 'image/png')
+        self.assertEqual(self.document.file_size, len(png))
+        self.assertEqual(self.document.checksum, hashlib.sha256(png).hexdigest())
+
+    def test_rejects_disallowed_replacements(self):
+        html = b'<html><script>alert(1)</script></html>' * 100
+        response = self.replace(html, name='evil.pdf', content_type='text/html')
+        self.assertEqual(response.status_code, 415)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.mime_type, 'application/pdf')
+
+    @override_settings(DOCUMENT_UPLOAD_MAX_SIZE=1000)
+    def test_rejects_oversize_replacements(self):
+        response = self.replace(PDF)
+        self.assertEqual(response.status_code, 413)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.file_size, len(PDF))
+
+    def test_metadata_updates_still_accept_json(self):
+        response = self.client.patch(self.url, {'title': 'Final transcript'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.title, 'Final transcript')
+
+
+class DocumentBlobTests(DocumentTestCase):
+    def test_reuploads_share_one_blob(self):
+        self.assertEqual(self.upload(PDF).status_code, 201)
+        self.assertEqual(self.upload(PDF, name='copy.pdf').status_code, 201)
+
+        blob = DocumentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.checksum, hashlib.sha256(PDF).hexdigest())
+        names = {document.file.name for document in Document.objects.all()}
+        self.assertEqual(names, {blob.file.name})
+        self.assertEqual(default_storage.listdir(blob.file.name.rsplit('/', 1)[0])[1], [blob.checksum])
+        self.assertEqual(
+            sorted(Document.objects.values_list('file_name', flat=True)), ['copy.pdf', 'transcript.pdf']
+        )
+
+    def test_garbage_collection_waits_for_the_last_reference_and_grace_period(self):
+        self.upload(PDF)
+        self.upload(PDF)
+        blob = DocumentBlob.objects.get()
+        first, second = Document.objects.all()
+
+        first.delete()
+        self.assertEqual(collect_garbage(grace=timedelta(0))['blobs'], 0)
+
+        second.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertEqual(collect_garbage()['blobs'], 0)
+        self.assertTrue(default_storage.exists(blob.file.name))
+
+        self.assertEqual(collect_garbage(grace=timedelta(0))['blobs'], 1)
+        self.assertFalse(DocumentBlob.objects.exists())
+        self.assertFalse(default_storage.exists(blob.file.name))
+
+    def test_sweeps_only_old_orphan_files(self):
+        name = default_storage.save('blobs/00/00/0000orphan', ContentFile(b'left behind'))
+        self.assertEqual(collect_garbage()['orphans'], 0)
+        self.assertEqual(collect_garbage(grace=timedelta(0))['orphans'], 1)
+        self.assertFalse(default_storage.exists(name))
+
+
+class ResumableUploadTests(DocumentTestCase):
+    def setUp(self):
+        super().setUp()
+        partial_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, partial_dir, ignore_errors=True)
+        settings_override = override_settings(DOCUMENT_PARTIAL_UPLOAD_DIR=partial_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def start(self, size=len(PDF), file_name='portfolio.pdf'):
+        response = self.client.post('/api/documents/uploads/', {
+            'application': self.application.pk,
+            'document_type': 'PORTFOLIO',
+            'title': 'Portfolio',
+            'file_name': file_name,
+            'size': size,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def send(self, session_id, offset, data):
+        return self.client.patch(
+            f'/api/documents/uploads/{session_id}/', data,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunks_resume_from_the_stored_offset_and_complete_into_a_document(self):
+        session_id = self.start()
+        self.assertEqual(self.send(session_id, 0, PDF[:100_000]).data['offset'], 100_000)
+
+        # A client that lost track asks where to carry on
+        response = self.client.get(f'/api/documents/uploads/{session_id}/')
+        self.assertEqual(response['Upload-Offset'], '100000')
+        stale = self.send(session_id, 0, PDF[:100_000])
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.data['offset'], 100_000)
+
+        early = self.client.post(f'/api/documents/uploads/{session_id}/complete/')
+        self.assertEqual(early.status_code, 409)
+
+        self.assertEqual(self.send(session_id, 100_000, PDF[100_000:]).data['offset'], len(PDF))
+        response = self.client.post(f'/api/documents/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+
+        document = Document.objects.get()
+        self.assertEqual(document.document_type, 'PORTFOLIO')
+        self.assertEqual(document.file_name, 'portfolio.pdf')
+        self.assertEqual(document.uploaded_by, self.student)
+        self.assertEqual(document.checksum, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(document.blob.ref_count, 1)
+        with document.file.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF)
+        self.assertFalse(DocumentUploadSession.objects.exists())
+        self.assertFalse(os.path.exists(partial_path(session_id)))
+
+    def test_keeps_bytes_received_before_a_disconnect(self):
+        session = DocumentUploadSession.objects.get(pk=self.start())
+        with self.assertRaises(UploadRejected):
+            append_chunk(session, 0, io.BytesIO(PDF[:70_000]), 150_000)
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 70_000)
+        with open(partial_path(session.pk), 'rb') as partial:
+            self.assertEqual(partial.read(), PDF[:70_000])
+
+    def test_rejects_disallowed_content_and_other_users_sessions(self):
+        session_id = self.start()
+        self.assertEqual(self.send(session_id, 0, b'MZ\x90\x00' + b'\x00' * 1000).status_code, 415)
+        self.assertEqual(DocumentUploadSession.objects.get().offset, 0)
+
+        self.client.force_authenticate(user=User.objects.create_user(
+            email='other@example.com', password='pass12345',
+            first_name='Oth', last_name='Er', role=UserRole.STUDENT
+        ))
+        self.assertEqual(self.client.post(f'/api/documents/uploads/{session_id}/complete/').status_code, 404)
+        self.assertEqual(self.send(session_id, 0, PDF).status_code, 404)
+
+
+class DocumentDownloadTests(DocumentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.assertEqual(self.upload(PDF).status_code, 201)
+        self.document = Document.objects.get()
+        self.url = f'/api/documents/{self.document.pk}/download/'
+
+    def test_streams_the_file_to_users_who_can_see_the_document(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), PDF)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Length'], str(len(PDF)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        self.client.force_authenticate(user=User.objects.create_user(
+            email='other@example.com', password='pass12345',
+            first_name='Oth', last_name='Er', role=UserRole.STUDENT
+        ))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_serves_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(PDF)}')
+        self.assertEqual(b''.join(response.streaming_content), PDF[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), PDF[-10:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(PDF)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(PDF)}')
+
+        # A range for an older version of the file gets the whole current file
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), PDF)
+
+    @override_settings(DOCUMENT_DOWNLOAD_OFFLOAD='x-accel-redirect', DOCUMENT_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_hands_the_transfer_to_the_proxy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.document.file.name}')
+        self.assertEqual(response.content, b'')
+
+
+class SignedDocumentURLTests(DocumentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.assertEqual(self.upload(PDF).status_code, 201)
+        self.document = Document.objects.get()
+
+    def test_file_url_serves_the_file_without_credentials_or_queries(self):
+        file_url = self.client.get(f'/api/documents/{self.document.pk}/').data['file_url']
+        self.assertIn('/api/documents/files/', file_url)
+
+        with self.assertNumQueries(0):
+            response = APIClient().get(file_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), PDF)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('transcript.pdf', response['Content-Disposition'])
+
+    def test_serves_only_allowed_types_inline(self):
+        response = APIClient().get(signed_url(self.document))
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+        # A type stored before uploads were sniffed must not render on the API origin
+        Document.objects.filter(pk=self.document.pk).update(mime_type='text/html', file_name='evil.pdf')
+        self.document.refresh_from_db()
+        response = APIClient().get(signed_url(self.document))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="evil.pdf"')
+
+    def test_rejects_altered_and_expired_urls(self):
+        url = signed_url(self.document)
+        self.assertEqual(APIClient().get(url.replace('application%2Fpdf', 'text%2Fhtml')).status_code, 403)
+        self.assertEqual(APIClient().get(url.split('?')[0]).status_code, 403)
+
+        expired = signed_url(self.document, expires=int(time.time()) - 1)
+        self.assertEqual(APIClient().get(expired).status_code, 403)
+
+    @override_settings(DOCUMENT_URL_TTL=600)
+    def test_urls_are_stable_within_a_window_and_live_half_to_one_ttl(self):
+        self.assertEqual(current_expiry(now=999_900), current_expiry(now=1_000_199))
+        self.assertNotEqual(current_expiry(now=1_000_199), current_expiry(now=1_000_200))
+        for now in (999_900, 1_000_199, 1_000_200):
+            self.assertGreaterEqual(current_expiry(now=now) - now, 300)
+            self.assertLessEqual(current_expiry(now=now) - now, 600)
@@ -0,0 +1,136 @@
+"""
+Streaming document uploads.
+
+``StreamingDocumentUploadHandler`` replaces Django's default handlers on the
+upload endpoint. Every upload is spooled to a temporary file on disk, never
+to memory, and each chunk updates a SHA-256 digest and byte count as it
+arrives. The content type is sniffed from the first bytes instead of being
+taken from the client. A file over ``DOCUMENT_UPLOAD_MAX_SIZE`` or of a type
+outside ``ALLOWED_MIME_TYPES`` is abandoned at the chunk where that becomes
+known; the view then answers 413 or 415.
+
+The finished upload is a ``TemporaryUploadedFile``, so ``FileSystemStorage``
+moves it into place without copying and S3 storage streams it from disk.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+# (magic prefix, MIME type)
+SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+]
+SNIFF_BYTES = max(len(magic) for magic, _ in SIGNATURES)
+
+ALLOWED_MIME_TYPES = {mime_type for _, mime_type in SIGNATURES}
+
+
+def max_upload_size():
+    return getattr(settings, 'DOCUMENT_UPLOAD_MAX_SIZE', 20 * 1024 * 1024)
+
+
+def sniff_mime_type(head):
+    for magic, mime_type in SIGNATURES:
+        if head.startswith(magic):
+            return mime_type
+    return None
+
+
+class UploadRejected(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def unsupported_type():
+    return UploadRejected('Only PDF, JPEG and PNG files are accepted', 415)
+
+
+class StreamingDocumentUploadHandler(TemporaryFileUploadHandler):
+    """Disk-spooling upload handler that hashes, measures and sniffs each file"""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = max_upload_size()
+        self.rejection = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # The whole body is already too large: refuse files without reading them
+        if content_length and content_length > self.max_size + 64 * 1024:
+            self.rejection = self.too_large()
+
+    def new_file(self, *args, **kwargs):
+        if self.rejection is not None:
+            raise SkipFile()
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b''
+        self.sniffed_type = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.reject(self.too_large())
+
+        if self.sniffed_type is None:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES or sniff_mime_type(self.head):
+                self.sniffed_type = sniff_mime_type(self.head)
+                if self.sniffed_type not in ALLOWED_MIME_TYPES:
+                    self.reject(unsupported_type())
+
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.rejection is not None:
+            return None
+        if self.sniffed_type is None:
+            # Too short to identify; SkipFile is not allowed at this point
+            self.rejection = unsupported_type()
+            self.file.close()
+            return None
+        upload = super().file_complete(self.size)
+        upload.content_type = self.sniffed_type
+        upload.checksum = self.digest.hexdigest()
+        return upload
+
+    def reject(self, rejection):
+        self.rejection = rejection
+        self.file.close()
+        raise SkipFile()
+
+    def too_large(self):
+        limit = self.max_size // (1024 * 1024)
+        return UploadRejected(f'File exceeds the {limit} MB upload limit', 413)
+
+
+def file_metadata(file_obj):
+    """
+    ``(size, mime_type, checksum)`` of an uploaded file.
+
+    Streamed uploads come with all three from the handler; other files (admin,
+    scripts) are read once here. The type is always sniffed, never taken from
+    the client: contents outside ``ALLOWED_MIME_TYPES`` raise ``UploadRejected``.
+    """
+    checksum = getattr(file_obj, 'checksum', None)
+    if checksum is not None:
+        return file_obj.size, file_obj.content_type, checksum
+
+    digest = hashlib.sha256()
+    head = b''
+    size = 0
+    for chunk in file_obj.chunks():
+        if len(head) < SNIFF_BYTES:
+            head += chunk[:SNIFF_BYTES - len(head)]
+        digest.update(chunk)
+        size += len(chunk)
+    file_obj.seek(0)
+    mime_type = sniff_mime_type(head)
+    if mime_type not in ALLOWED_MIME_TYPES:
+        raise unsupported_type()
+    return size, mime_type, digest.hexdigest()
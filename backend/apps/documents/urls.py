@@ -1,13 +1,20 @@
 from django.urls import path
 from .views import (
-    DocumentListCreateView, DocumentDetailView, DocumentVerifyView,
+    DocumentListCreateView, DocumentDetailView, DocumentDownloadView, DocumentVerifyView, SignedDocumentFileView,
+    DocumentUploadSessionCreateView, DocumentUploadSessionDetailView, DocumentUploadSessionCompleteView,
     RecommendationLetterRequestListCreateView, RecommendationLetterRequestDetailView
 )
 
 urlpatterns = [
     path('', DocumentListCreateView.as_view(), name='document-list-create'),
     path('<int:pk>/', DocumentDetailView.as_view(), name='document-detail'),
+    path('<int:pk>/download/', DocumentDownloadView.as_view(), name='document-download'),
+    path('files/<path:name>', SignedDocumentFileView.as_view(), name='document-signed-file'),
     path('<int:pk>/verify/', DocumentVerifyView.as_view(), name='document-verify'),
+
+    path('uploads/', DocumentUploadSessionCreateView.as_view(), name='document-upload-create'),
+    path('uploads/<int:pk>/', DocumentUploadSessionDetailView.as_view(), name='document-upload-detail'),
+    path('uploads/<int:pk>/complete/', DocumentUploadSessionCompleteView.as_view(), name='document-upload-complete'),
     
     path('recommendations/', RecommendationLetterRequestListCreateView.as_view(), name='recommendation-list-create'),
     path('recommendations/<int:pk>/', RecommendationLetterRequestDetailView.as_view(), name='recommendation-detail'),
@@ -1,36 +1,82 @@
 from rest_framework import generics, status, permissions, parsers
 from rest_framework.response import Response
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.views import APIView
+from django.db import transaction
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.shortcuts import get_object_or_404
-from .models import Document, RecommendationLetterRequest, DocumentStatus
+from .models import Document, DocumentUploadSession, RecommendationLetterRequest, DocumentStatus
+from .downloads import serve_document, serve_file
+from .signing import InvalidSignature, current_expiry, verify
+from .resumable import append_chunk, discard_partial_file, open_completed_upload, start_partial_file
+from .uploads import StreamingDocumentUploadHandler, UploadRejected
 from .serializers import (
-    DocumentSerializer, DocumentUploadSerializer, DocumentVerificationSerializer,
+    DocumentSerializer, DocumentUploadSerializer, DocumentUploadSessionSerializer, DocumentVerificationSerializer,
     RecommendationLetterRequestSerializer, RecommendationLetterRequestCreateSerializer
 )
 from apps.applications.models import Application
+from apps.accounts.permissions import HasPermission
+from apps.common.conditional import ConditionalGetMixin
 from apps.notifications.utils import create_notification
 from apps.notifications.models import NotificationType
 
 
-class DocumentListCreateView(generics.ListCreateAPIView):
+def documents_for(user):
+    """Documents ``user`` may see"""
+    if user.is_student():
+        return Document.objects.filter(application__student=user)
+    elif user.is_checker():
+        return Document.objects.filter(application__assigned_checker=user)
+    elif user.is_admin():
+        return Document.objects.all()
+    return Document.objects.none()
+
+
+def notify_document_uploaded(document):
+    # Notify assigned checker if exists
+    if document.application.assigned_checker:
+        create_notification(
+            user=document.application.assigned_checker,
+            notification_type=NotificationType.APPLICATION_UPDATED,
+            title='New Document Uploaded',
+            message=f'A new document has been uploaded for Application #{document.application.id}',
+            application_id=document.application.id,
+            document_id=document.id
+        )
+
+
+class StreamingUploadMixin:
+    """Parse uploaded files through ``StreamingDocumentUploadHandler``"""
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Must be in place before the body is parsed
+        self.upload_handler = StreamingDocumentUploadHandler(request)
+        request.upload_handlers = [self.upload_handler]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def upload_rejection_response(self, request):
+        """413/415 response if the handler refused the upload, else None"""
+        # Accessing request.data parses the body through the upload handler
+        request.data
+        rejection = self.upload_handler.rejection
+        if rejection is not None:
+            return Response({'error': str(rejection)}, status=rejection.status_code)
+        return None
+
+
+class DocumentListCreateView(StreamingUploadMixin, generics.ListCreateAPIView):
     """List and upload documents"""
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+
+    def create(self, request, *args, **kwargs):
+        return self.upload_rejection_response(request) or super().create(request, *args, **kwargs)
     
     def get_queryset(self):
-        user = self.request.user
+        queryset = documents_for(self.request.user)
         application_id = self.request.query_params.get('application_id')
         
-        if user.is_student():
-            queryset = Document.objects.filter(application__student=user)
-        elif user.is_checker():
-            queryset = Document.objects.filter(application__assigned_checker=user)
-        elif user.is_admin():
-            queryset = Document.objects.all()
-        else:
-            queryset = Document.objects.none()
-        
         if application_id:
             queryset = queryset.filter(application_id=application_id)
         
@@ -43,48 +89,160 @@ class DocumentListCreateView(generics.ListCreateAPIView):
     
     def perform_create(self, serializer):
         document = serializer.save(uploaded_by=self.request.user)
-        
-        # Notify assigned checker if exists
-        if document.application.assigned_checker:
-            create_notification(
-                user=document.application.assigned_checker,
-                notification_type=NotificationType.APPLICATION_UPDATED,
-                title='New Document Uploaded',
-                message=f'A new document has been uploaded for Application #{document.application.id}',
-                application_id=document.application.id,
-                document_id=document.id
-            )
+        notify_document_uploaded(document)
 
 
-class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DocumentDetailView(StreamingUploadMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, and delete document"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = DocumentSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        
-        if user.is_student():
-            return Document.objects.filter(application__student=user)
-        elif user.is_checker():
-            return Document.objects.filter(application__assigned_checker=user)
-        elif user.is_admin():
-            return Document.objects.all()
-        
-        return Document.objects.none()
+        return documents_for(self.request.user)
+
+    def update(self, request, *args, **kwargs):
+        # A replacement file gets the same size and type checks as an upload
+        return self.upload_rejection_response(request) or super().update(request, *args, **kwargs)
+
+    def get_etag_extra(self):
+        # file_url is re-signed every window; a cached copy's URL may have expired
+        return (current_expiry(),)
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """The response is the file itself, whatever the client asks to Accept"""
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class DocumentDownloadView(APIView):
+    """Document contents, for anyone who may see the document"""
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, pk):
+        document = get_object_or_404(documents_for(request.user), pk=pk)
+        return serve_document(request, document)
+
+
+# Checked from the URL alone: no authentication, permission lookups or transaction
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class SignedDocumentFileView(APIView):
+    """Document contents behind an expiring signed URL from ``file_url``"""
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, name):
+        try:
+            file_name, mime_type = verify(name, request.query_params)
+        except InvalidSignature as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_403_FORBIDDEN)
+        return serve_file(request, name, file_name, mime_type)
+
+
+class DocumentUploadSessionCreateView(generics.CreateAPIView):
+    """Start a resumable upload"""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DocumentUploadSessionSerializer
+
+    def perform_create(self, serializer):
+        session = serializer.save(uploaded_by=self.request.user)
+        start_partial_file(session.pk)
+
+
+def upload_progress_headers(session):
+    return {'Upload-Offset': str(session.offset), 'Upload-Length': str(session.size)}
+
+
+# A chunk can take minutes to arrive; don't hold a transaction open meanwhile
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class DocumentUploadSessionDetailView(generics.RetrieveDestroyAPIView):
+    """
+    Upload progress (GET/HEAD), the next chunk (PATCH) or abandon (DELETE).
+
+    PATCH bodies are raw bytes and must carry an ``Upload-Offset`` header
+    equal to the session's current offset.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DocumentUploadSessionSerializer
+
+    def get_queryset(self):
+        return DocumentUploadSession.objects.filter(uploaded_by=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        session = self.get_object()
+        return Response(self.get_serializer(session).data, headers=upload_progress_headers(session))
+
+    def patch(self, request, *args, **kwargs):
+        session = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({'error': 'Upload-Offset header is required'}, status=status.HTTP_400_BAD_REQUEST)
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+
+        try:
+            append_chunk(session, offset, request.stream, length)
+        except UploadRejected as rejection:
+            return Response(
+                {'error': str(rejection), 'offset': session.offset},
+                status=rejection.status_code, headers=upload_progress_headers(session)
+            )
+        return Response(self.get_serializer(session).data, headers=upload_progress_headers(session))
+
+    def perform_destroy(self, instance):
+        session_id = instance.pk
+        instance.delete()
+        discard_partial_file(session_id)
+
+
+class DocumentUploadSessionCompleteView(APIView):
+    """Turn a fully received upload into a document"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        # Explicit, not left to ATOMIC_REQUESTS: the row lock must cover creating
+        # the document and deleting the session, or two completes both succeed
+        with transaction.atomic():
+            session = get_object_or_404(
+                DocumentUploadSession.objects.select_for_update(), pk=pk, uploaded_by=request.user
+            )
+            try:
+                upload = open_completed_upload(session)
+            except UploadRejected as rejection:
+                return Response({'error': str(rejection)}, status=rejection.status_code)
+
+            serializer = DocumentUploadSerializer(data={
+                'application': session.application_id,
+                'document_type': session.document_type,
+                'title': session.title,
+                'description': session.description,
+                'file': upload,
+            }, context={'request': request})
+            with upload:
+                serializer.is_valid(raise_exception=True)
+                document = serializer.save(uploaded_by=request.user)
+            notify_document_uploaded(document)
+
+            session_id = session.pk
+            session.delete()
+            # Already moved into storage unless the contents were a duplicate
+            transaction.on_commit(lambda: discard_partial_file(session_id))
+        return Response(DocumentSerializer(document, context={'request': request}).data, status=status.HTTP_201_CREATED)
 
 
 class DocumentVerifyView(APIView):
     """Verify or reject document (checker/admin only)"""
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [
+        HasPermission('documents.verify', message='Only checkers and admins can verify documents')
+    ]
     
     def post(self, request, pk):
-        if not (request.user.is_checker() or request.user.is_admin()):
-            return Response(
-                {'error': 'Only checkers and admins can verify documents'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         document = get_object_or_404(Document, pk=pk)
         serializer = DocumentVerificationSerializer(document, data=request.data, partial=True)
         
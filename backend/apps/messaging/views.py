@@ -1,5 +1,6 @@
 from django.db.models import Q
 from rest_framework import viewsets, permissions
+from apps.common.pagination import CursorOptInPagination
 from .models import Message
 from .serializers import MessageSerializer
 
@@ -7,6 +8,7 @@ from .serializers import MessageSerializer
 class MessageViewSet(viewsets.ModelViewSet):
 	serializer_class = MessageSerializer
 	permission_classes = [permissions.IsAuthenticated]
+	pagination_class = CursorOptInPagination
 
 	def get_queryset(self):
 		user = self.request.user
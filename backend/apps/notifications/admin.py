@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, EmailTemplate
+from .models import Notification, EmailTemplate, NotificationOutbox
 
 
 @admin.register(Notification)
@@ -16,3 +16,10 @@ class EmailTemplateAdmin(admin.ModelAdmin):
     list_display = ('notification_type', 'subject', 'is_active', 'updated_at')
     list_filter = ('is_active',)
     search_fields = ('subject', 'body_html', 'body_text')
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'notification', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    raw_id_fields = ('notification',)
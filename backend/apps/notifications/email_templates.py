@@ -0,0 +1,153 @@
+"""
+Compiled, cached rendering of ``EmailTemplate`` rows.
+
+Templates are compiled into Django ``Template`` objects once and kept in a
+process-local LRU keyed by notification type, including "no template"
+answers. The LRU is checked against the database at most every
+``VERSION_CHECK_INTERVAL`` seconds with one aggregate query (latest
+``updated_at`` plus total and active counts), and is dropped when that
+changes. Edits, new templates and deletes made by any process, including
+the admin in front of a separate worker, are picked up within the
+interval. ``post_save``/``post_delete`` signals clear the local process
+immediately.
+
+``render_many`` renders a whole batch of notifications with at most one
+query for templates that are not compiled yet.
+"""
+import re
+import time
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+from django.db.models import Count, Max, Q
+from django.template import Context, Template
+
+from .models import EmailTemplate
+
+MAX_TEMPLATES = 64
+# Seconds between checks of the templates table for changes
+VERSION_CHECK_INTERVAL = 30
+
+RenderedEmail = namedtuple('RenderedEmail', ['subject', 'body_text', 'body_html'])
+
+# Templates written for the old str.format renderer use "{name}" placeholders.
+LEGACY_PLACEHOLDER = re.compile(r'(?<!\{)\{(\w+)\}(?!\})')
+
+
+def to_django_syntax(source):
+    if '{{' in source or '{%' in source:
+        return source
+    return LEGACY_PLACEHOLDER.sub(r'{{ \1 }}', source)
+
+
+class CompiledEmailTemplate:
+    def __init__(self, template):
+        self.subject = Template(to_django_syntax(template.subject))
+        self.body_text = Template(to_django_syntax(template.body_text))
+        self.body_html = Template(to_django_syntax(template.body_html)) if template.body_html else None
+
+    def render(self, context):
+        plain = Context(context, autoescape=False)
+        subject = ' '.join(self.subject.render(plain).split())
+        body_text = self.body_text.render(plain)
+        body_html = self.body_html.render(Context(context)) if self.body_html else None
+        return RenderedEmail(subject, body_text, body_html)
+
+
+class EmailTemplateRegistry:
+    """Process-local LRU of compiled templates, revalidated against the database"""
+
+    def __init__(self, max_size=MAX_TEMPLATES, check_interval=VERSION_CHECK_INTERVAL):
+        self.max_size = max_size
+        self.check_interval = check_interval
+        self._templates = OrderedDict()
+        self._version = None
+        self._checked_at = None
+        self._lock = Lock()
+
+    def _check_version(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = EmailTemplate.objects.aggregate(
+            latest=Max('updated_at'), total=Count('id'), active=Count('id', filter=Q(is_active=True))
+        )
+        if version != self._version:
+            self._templates.clear()
+            self._version = version
+
+    def _store(self, notification_type, compiled):
+        self._templates[notification_type] = compiled
+        self._templates.move_to_end(notification_type)
+        while len(self._templates) > self.max_size:
+            self._templates.popitem(last=False)
+
+    def get_many(self, notification_types):
+        """Return {notification_type: CompiledEmailTemplate or None}"""
+        with self._lock:
+            self._check_version()
+            found = {}
+            missing = set()
+            for notification_type in set(notification_types):
+                if notification_type in self._templates:
+                    self._templates.move_to_end(notification_type)
+                    found[notification_type] = self._templates[notification_type]
+                else:
+                    missing.add(notification_type)
+
+            if missing:
+                rows = {
+                    template.notification_type: template
+                    for template in EmailTemplate.objects.filter(
+                        notification_type__in=missing, is_active=True
+                    )
+                }
+                for notification_type in missing:
+                    template = rows.get(notification_type)
+                    compiled = CompiledEmailTemplate(template) if template else None
+                    self._store(notification_type, compiled)
+                    found[notification_type] = compiled
+            return found
+
+    def clear(self):
+        """Drop compiled templates and recheck the database on the next render"""
+        with self._lock:
+            self._templates.clear()
+            self._version = None
+            self._checked_at = None
+
+
+registry = EmailTemplateRegistry()
+
+
+def build_context(notification):
+    return {
+        'user': notification.user,
+        'notification': notification,
+        'title': notification.title,
+        'message': notification.message,
+        'action_url': notification.action_url,
+        'action_label': notification.action_label,
+    }
+
+
+def render_many(notifications):
+    """
+    Render a batch of notifications.
+
+    Returns a list aligned with ``notifications`` holding a ``RenderedEmail``,
+    or ``None`` where no active template exists for the notification type.
+    Callers should load ``notification.user`` up front (``select_related``).
+    """
+    templates = registry.get_many(n.notification_type for n in notifications)
+    rendered = []
+    for notification in notifications:
+        compiled = templates.get(notification.notification_type)
+        rendered.append(compiled.render(build_context(notification)) if compiled else None)
+    return rendered
+
+
+def invalidate_templates():
+    """Recompile templates in this process; others notice within VERSION_CHECK_INTERVAL"""
+    registry.clear()
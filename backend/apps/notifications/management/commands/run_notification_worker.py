@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.notifications.outbox import BATCH_SIZE, process_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Entries claimed per batch')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain due entries and exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(f'Notification worker started (batch size {batch_size})')
+
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    results = process_batch(batch_size)
+                except Exception as exc:
+                    # Database outage or a bug: keep the worker alive and try again later
+                    if options['once']:
+                        raise
+                    self.stderr.write(f'Batch failed: {exc!r}')
+                    time.sleep(options['interval'])
+                    continue
+                processed = sum(results.values())
+                if processed:
+                    self.stdout.write(
+                        'sent={sent} retried={retried} failed={failed} skipped={skipped}'.format(**results)
+                    )
+                if processed < batch_size:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write('Notification worker stopped')
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from apps.accounts.models import User
 
 
@@ -101,3 +102,46 @@ class EmailTemplate(models.Model):
     
     def __str__(self):
         return f"{self.get_notification_type_display()} Template"
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    SENT = 'SENT', 'Sent'
+    FAILED = 'FAILED', 'Failed'
+    SKIPPED = 'SKIPPED', 'Skipped'
+
+
+class NotificationOutbox(models.Model):
+    """Email deliveries queued in the same transaction as their notification"""
+
+    notification = models.OneToOneField(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name='outbox_entry'
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_outbox'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_pending_idx',
+                condition=models.Q(status='PENDING')
+            ),
+        ]
+
+    def __str__(self):
+        return f"Outbox #{self.id} - Notification #{self.notification_id} ({self.status})"
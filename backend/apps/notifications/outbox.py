@@ -0,0 +1,172 @@
+"""
+Outbox worker for notification emails.
+
+``create_notification`` writes a ``NotificationOutbox`` row in the request
+transaction. ``process_batch`` claims due rows with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` so several workers can run side by side, leases them and
+commits, sends the batch over a single mail connection outside any
+transaction, and records the results with bulk updates. If the mail server
+cannot be reached, every claimed entry is retried with backoff.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.accounts.models import UserPreference
+from .email_templates import render_many
+from .models import Notification, NotificationOutbox, OutboxStatus
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=6)
+# How long claimed entries are reserved for the worker that claimed them
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 1, 2, 4, ... minutes, capped at RETRY_MAX_DELAY"""
+    return min(RETRY_BASE_DELAY * (2 ** (attempts - 1)), RETRY_MAX_DELAY)
+
+
+def enqueue(notification):
+    return NotificationOutbox.objects.create(notification=notification)
+
+
+def enqueue_many(notifications):
+    return NotificationOutbox.objects.bulk_create(
+        [NotificationOutbox(notification=notification) for notification in notifications]
+    )
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """
+    Lease up to ``batch_size`` due entries to this worker.
+
+    The rows are locked only long enough to move ``next_attempt_at`` past
+    ``CLAIM_LEASE``, then the claim commits, so no transaction stays open
+    while mail is sent. If the worker dies, the entries fall due again once
+    the lease runs out.
+    """
+    with transaction.atomic():
+        entries = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('notification__user')
+            .filter(status=OutboxStatus.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if entries:
+            NotificationOutbox.objects.filter(id__in=[entry.id for entry in entries]).update(
+                next_attempt_at=timezone.now() + CLAIM_LEASE
+            )
+    return entries
+
+
+def build_message(notification, rendered, connection):
+    """Build the email, falling back to the notification text without a template"""
+    if rendered is None:
+        return EmailMultiAlternatives(
+            subject=notification.title,
+            body=notification.message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[notification.user.email],
+            connection=connection,
+        )
+
+    message = EmailMultiAlternatives(
+        subject=rendered.subject,
+        body=rendered.body_text,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[notification.user.email],
+        connection=connection,
+    )
+    if rendered.body_html:
+        message.attach_alternative(rendered.body_html, 'text/html')
+    return message
+
+
+def record_failure(entry, exc, now):
+    entry.attempts += 1
+    entry.last_error = str(exc)[:2000]
+    if entry.attempts >= MAX_ATTEMPTS:
+        entry.status = OutboxStatus.FAILED
+    else:
+        entry.next_attempt_at = now + retry_delay(entry.attempts)
+
+
+def process_batch(batch_size=BATCH_SIZE):
+    """
+    Claim and deliver one batch of outbox entries.
+
+    Returns a dict with the number of sent, retried, failed and skipped entries.
+    """
+    results = {'sent': 0, 'retried': 0, 'failed': 0, 'skipped': 0}
+
+    entries = claim_batch(batch_size)
+    if not entries:
+        return results
+
+    notifications = [entry.notification for entry in entries]
+    rendered = dict(zip((n.id for n in notifications), render_many(notifications)))
+    opted_out = set(
+        UserPreference.objects.filter(
+            user_id__in={n.user_id for n in notifications},
+            email_notifications=False
+        ).values_list('user_id', flat=True)
+    )
+
+    now = timezone.now()
+    sent, skipped, retry, deliverable = [], [], [], []
+    for entry in entries:
+        notification = entry.notification
+        if notification.user_id in opted_out or not notification.user.email:
+            skipped.append(entry.id)
+        else:
+            deliverable.append(entry)
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        # Mail server unreachable: the whole batch backs off
+        for entry in deliverable:
+            record_failure(entry, exc, now)
+        retry = deliverable
+    else:
+        try:
+            for entry in deliverable:
+                try:
+                    build_message(entry.notification, rendered[entry.notification_id], connection).send()
+                except Exception as exc:
+                    record_failure(entry, exc, now)
+                    retry.append(entry)
+                else:
+                    sent.append(entry)
+        finally:
+            connection.close()
+
+    with transaction.atomic():
+        if sent:
+            NotificationOutbox.objects.filter(id__in=[e.id for e in sent]).update(
+                status=OutboxStatus.SENT, sent_at=now, attempts=F('attempts') + 1
+            )
+            Notification.objects.filter(id__in=[e.notification_id for e in sent]).update(
+                is_sent_email=True, email_sent_at=now
+            )
+        if skipped:
+            NotificationOutbox.objects.filter(id__in=skipped).update(status=OutboxStatus.SKIPPED)
+        if retry:
+            NotificationOutbox.objects.bulk_update(
+                retry, ['attempts', 'last_error', 'status', 'next_attempt_at']
+            )
+
+    results['sent'] = len(sent)
+    results['skipped'] = len(skipped)
+    results['failed'] = sum(1 for e in retry if e.status == OutboxStatus.FAILED)
+    results['retried'] = len(retry) - results['failed']
+    return results
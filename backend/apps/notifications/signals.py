@@ -0,0 +1,11 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .email_templates import invalidate_templates
+from .models import EmailTemplate
+
+
+@receiver([post_save, post_delete], sender=EmailTemplate)
+def email_template_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_templates)
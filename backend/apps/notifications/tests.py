@@ -0,0 +1,186 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, UserRole, UserPreference
+from .models import EmailTemplate, Notification, NotificationOutbox, NotificationType, OutboxStatus
+from .email_templates import VERSION_CHECK_INTERVAL, registry, render_many
+from .outbox import MAX_ATTEMPTS, claim_batch, process_batch
+from .utils import create_notification
+
+
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+
+    def notify(self, **kwargs):
+        return create_notification(
+            user=kwargs.pop('user', self.student),
+            notification_type=NotificationType.STATUS_CHANGED,
+            title='Application Status Updated',
+            message='Your application status has been updated to: Passed',
+            **kwargs
+        )
+
+    def test_create_notification_queues_without_sending(self):
+        notification = self.notify()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(notification.outbox_entry.status, OutboxStatus.PENDING)
+
+        self.notify(send_email=False)
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+    def test_worker_sends_batch_and_marks_notifications(self):
+        EmailTemplate.objects.create(
+            notification_type=NotificationType.STATUS_CHANGED,
+            subject='Status update', body_html='<p>{message}</p>', body_text='{title}: {message}'
+        )
+        for _ in range(3):
+            self.notify()
+
+        # Claim + lease and the result updates run in two short transactions;
+        # the cold template registry checks its version once
+        with self.assertNumQueries(11):
+            results = process_batch()
+
+        self.assertEqual(results['sent'], 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, 'Status update')
+        self.assertTrue(mail.outbox[0].body.startswith('Application Status Updated:'))
+        self.assertEqual(Notification.objects.filter(is_sent_email=True, email_sent_at__isnull=False).count(), 3)
+        self.assertFalse(NotificationOutbox.objects.exclude(status=OutboxStatus.SENT).exists())
+        self.assertEqual(process_batch()['sent'], 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        notification = self.notify()
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError('smtp down')):
+            results = process_batch()
+
+        self.assertEqual(results['retried'], 1)
+        entry = NotificationOutbox.objects.get(notification=notification)
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, 'smtp down')
+        self.assertGreater(entry.next_attempt_at, entry.created_at)
+        self.assertEqual(process_batch()['sent'], 0)
+
+        NotificationOutbox.objects.filter(pk=entry.pk).update(
+            attempts=MAX_ATTEMPTS - 1, next_attempt_at=entry.created_at
+        )
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError('smtp down')):
+            self.assertEqual(process_batch()['failed'], 1)
+        self.assertEqual(NotificationOutbox.objects.get(pk=entry.pk).status, OutboxStatus.FAILED)
+
+    def test_unreachable_mail_server_backs_off_the_whole_batch(self):
+        for _ in range(2):
+            self.notify()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('connection refused')):
+            results = process_batch()
+
+        self.assertEqual(results['retried'], 2)
+        self.assertEqual(len(mail.outbox), 0)
+        for entry in NotificationOutbox.objects.all():
+            self.assertEqual(entry.status, OutboxStatus.PENDING)
+            self.assertEqual(entry.attempts, 1)
+            self.assertEqual(entry.last_error, 'connection refused')
+
+    def test_claimed_entries_are_leased_to_one_worker(self):
+        self.notify()
+        self.assertEqual(len(claim_batch()), 1)
+        # Committed claim: a second worker finds nothing due until the lease runs out
+        self.assertEqual(claim_batch(), [])
+
+    def test_opted_out_users_are_skipped(self):
+        UserPreference.objects.create(user=self.student, email_notifications=False)
+        self.notify()
+        self.assertEqual(process_batch()['skipped'], 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class EmailTemplateRegistryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', password='pass12345',
+            first_name='Ada', last_name='Admin', role=UserRole.ADMIN
+        )
+        cls.template = EmailTemplate.objects.create(
+            notification_type=NotificationType.STATUS_CHANGED,
+            subject='{{ title }} for {{ user.first_name }}',
+            body_text='Hi {{ user.first_name }}, {{ message }}',
+            body_html='<p>{{ message }}</p>'
+        )
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+
+    def make_notifications(self, count, notification_type=NotificationType.STATUS_CHANGED):
+        return [
+            Notification(
+                id=i, user=self.admin, notification_type=notification_type,
+                title='Status', message=f'Update <{i}>'
+            )
+            for i in range(count)
+        ]
+
+    def test_batch_renders_with_two_queries_then_none(self):
+        notifications = self.make_notifications(50)
+        # Version check and template load
+        with self.assertNumQueries(2):
+            rendered = render_many(notifications)
+        self.assertEqual(rendered[3].subject, 'Status for Ada')
+        self.assertEqual(rendered[3].body_text, 'Hi Ada, Update <3>')
+        self.assertEqual(rendered[3].body_html, '<p>Update &lt;3&gt;</p>')
+
+        with self.assertNumQueries(0):
+            render_many(notifications)
+
+    def test_missing_template_renders_none(self):
+        with self.assertNumQueries(2):
+            rendered = render_many(self.make_notifications(2, NotificationType.GENERAL))
+        self.assertEqual(rendered, [None, None])
+        with self.assertNumQueries(0):
+            render_many(self.make_notifications(2, NotificationType.GENERAL))
+
+    def test_changes_from_other_processes_are_seen_after_the_check_interval(self):
+        clock = 'apps.notifications.email_templates.time.monotonic'
+        with mock.patch(clock, return_value=1000.0):
+            self.assertEqual(render_many(self.make_notifications(1, NotificationType.GENERAL)), [None])
+
+        # Written by another process: no signal reaches this one
+        EmailTemplate.objects.bulk_create([EmailTemplate(
+            notification_type=NotificationType.GENERAL, subject='General notice', body_text='{{ message }}'
+        )])
+        EmailTemplate.objects.filter(pk=self.template.pk).update(is_active=False)
+
+        with mock.patch(clock, return_value=1000.0 + VERSION_CHECK_INTERVAL - 1):
+            self.assertEqual(render_many(self.make_notifications(1, NotificationType.GENERAL)), [None])
+        with mock.patch(clock, return_value=1000.0 + VERSION_CHECK_INTERVAL):
+            self.assertEqual(
+                render_many(self.make_notifications(1, NotificationType.GENERAL))[0].subject, 'General notice'
+            )
+            self.assertEqual(render_many(self.make_notifications(1)), [None])
+
+    def test_detail_view_save_invalidates_compiled_template(self):
+        render_many(self.make_notifications(1))
+
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(
+                f'/api/notifications/templates/{self.template.pk}/',
+                {'subject': 'New subject'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(render_many(self.make_notifications(1))[0].subject, 'New subject')
@@ -1,8 +1,9 @@
 """
 Utility functions for creating and sending notifications
 """
-from django.utils import timezone
+from django.db import transaction
 from .models import Notification, NotificationType, NotificationPriority
+from .outbox import enqueue, enqueue_many
 
 
 def create_notification(
@@ -32,77 +33,61 @@ def create_notification(
         application_id: Optional related application ID
         document_id: Optional related document ID
         review_id: Optional related review ID
-        send_email: Whether to send email notification
+        send_email: Whether to queue an email notification
     
     Returns:
         Notification object
     """
-    notification = Notification.objects.create(
-        user=user,
-        notification_type=notification_type,
-        priority=priority,
-        title=title,
-        message=message,
-        action_url=action_url,
-        action_label=action_label,
-        application_id=application_id,
-        document_id=document_id,
-        review_id=review_id
-    )
+    with transaction.atomic():
+        notification = Notification.objects.create(
+            user=user,
+            notification_type=notification_type,
+            priority=priority,
+            title=title,
+            message=message,
+            action_url=action_url,
+            action_label=action_label,
+            application_id=application_id,
+            document_id=document_id,
+            review_id=review_id
+        )
+
+        if send_email:
+            send_email_notification(notification)
+
+    return notification
+
+
+def bulk_create_notifications(notifications, send_email=True):
+    """
+    Create many notifications at once
     
-    # TODO: Send email notification
-    if send_email:
-        # send_email_notification(notification)
-        pass
+    Args:
+        notifications: Unsaved Notification objects
+        send_email: Whether to queue an email for each notification
     
-    return notification
+    Returns:
+        List of created Notification objects
+    """
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create(notifications)
+        if send_email:
+            enqueue_many(notifications)
+    return notifications
 
 
 def send_email_notification(notification):
     """
-    Send email notification based on notification object
+    Queue an email for a notification
+    
+    The email is written to the outbox in the caller's transaction and
+    delivered by ``manage.py run_notification_worker``, so the request never
+    waits on SMTP and nothing is sent if the transaction rolls back.
     
     Args:
         notification: Notification object
-    """
-    from django.core.mail import send_mail
-    from django.conf import settings
-    from .models import EmailTemplate
     
-    try:
-        template = EmailTemplate.objects.get(
-            notification_type=notification.notification_type,
-            is_active=True
-        )
-        
-        # Render template with context
-        context = {
-            'user': notification.user,
-            'title': notification.title,
-            'message': notification.message,
-            'action_url': notification.action_url,
-            'action_label': notification.action_label,
-        }
-        
-        # Simple template rendering (could use Django templates for more complex)
-        subject = template.subject
-        body = template.body_text.format(**context)
-        
-        send_mail(
-            subject=subject,
-            message=body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[notification.user.email],
-            fail_silently=False,
-        )
-        
-        notification.is_sent_email = True
-        notification.email_sent_at = timezone.now()
-        notification.save()
-        
-    except EmailTemplate.DoesNotExist:
-        # No template found, skip email
-        pass
-    except Exception as e:
-        # Log error
-        print(f"Error sending email notification: {e}")
+    Returns:
+        NotificationOutbox object
+    """
+    return enqueue(notification)
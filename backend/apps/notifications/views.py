@@ -8,12 +8,14 @@ from .serializers import (
     NotificationMarkReadSerializer, EmailTemplateSerializer
 )
 from apps.accounts.permissions import IsAdminRole
+from apps.common.pagination import CursorOptInPagination
 
 
 class NotificationListView(generics.ListAPIView):
     """List notifications for authenticated user"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -0,0 +1,79 @@
+"""
+``CheckerProfile.total_reviews`` / ``active_reviews`` maintenance.
+
+The counters are changed with single ``UPDATE ... SET x = x + 1`` statements
+so concurrent reviews never lose increments, and only the counter columns are
+written. ``reconcile_counters`` recomputes both from ``Review`` and
+``Application`` and repairs any drift (run ``manage.py
+reconcile_checker_stats``).
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.accounts.models import CheckerProfile
+from apps.applications.stats import PENDING_STATUSES
+from .models import Review
+
+
+def review_started(checker_id):
+    CheckerProfile.objects.filter(user_id=checker_id).update(
+        active_reviews=F('active_reviews') + 1,
+        updated_at=timezone.now()
+    )
+
+
+def review_completed(checker_id):
+    CheckerProfile.objects.filter(user_id=checker_id).update(
+        total_reviews=F('total_reviews') + 1,
+        active_reviews=Greatest(F('active_reviews') - 1, 0),
+        updated_at=timezone.now()
+    )
+
+
+def actual_counters():
+    """
+    {checker_id: (total_reviews, active_reviews)} from one grouped query.
+
+    Total counts submitted reviews; active counts unsubmitted reviews whose
+    application is still open.
+    """
+    rows = (
+        Review.objects
+        .values('checker')
+        .annotate(
+            total=Count('id', filter=Q(is_complete=True)),
+            active=Count('id', filter=Q(is_complete=False, application__status__in=PENDING_STATUSES)),
+        )
+        .order_by()
+    )
+    return {row['checker']: (row['total'], row['active']) for row in rows}
+
+
+def reconcile_counters(dry_run=False):
+    """
+    Fix profiles whose counters disagree with the reviews; returns them.
+
+    Profiles are locked before counting, so a review submitted meanwhile
+    either is counted here or applies its increment after we commit.
+    """
+    with transaction.atomic():
+        profiles = list(
+            CheckerProfile.objects.select_for_update()
+            .only('id', 'user_id', 'total_reviews', 'active_reviews')
+            .order_by('id')
+        )
+        actual = actual_counters()
+
+        drifted = []
+        for profile in profiles:
+            total, active = actual.get(profile.user_id, (0, 0))
+            if (profile.total_reviews, profile.active_reviews) != (total, active):
+                profile.total_reviews = total
+                profile.active_reviews = active
+                drifted.append(profile)
+
+        if drifted and not dry_run:
+            CheckerProfile.objects.bulk_update(drifted, ['total_reviews', 'active_reviews'], batch_size=500)
+    return drifted
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute CheckerProfile review counters from reviews and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_counters(dry_run=options['dry_run'])
+        for profile in drifted:
+            self.stdout.write(
+                f'checker {profile.user_id}: total_reviews={profile.total_reviews} '
+                f'active_reviews={profile.active_reviews}'
+            )
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(drifted)} drifted profiles'))
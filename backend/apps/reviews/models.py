@@ -1,6 +1,7 @@
 from django.db import models
 from apps.applications.models import Application
 from apps.accounts.models import User, UserRole
+from apps.common.concurrency import VersionedModel
 
 
 class ReviewDecision(models.TextChoices):
@@ -23,7 +24,7 @@ class ReviewTag(models.TextChoices):
     NEEDS_INTERVIEW = 'NEEDS_INTERVIEW', 'Needs Interview'
 
 
-class Review(models.Model):
+class Review(VersionedModel):
     """Review records created by admission checkers"""
     
     application = models.ForeignKey(
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.common.concurrency import VersionedSerializerMixin
 from .models import Review, ReviewTagAssignment, DocumentReview, ReviewDecision
 
 
@@ -71,7 +72,7 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReviewUpdateSerializer(serializers.ModelSerializer):
+class ReviewUpdateSerializer(VersionedSerializerMixin, serializers.ModelSerializer):
     """Update review serializer"""
     
     class Meta:
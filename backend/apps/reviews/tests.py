@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import CheckerProfile, User, UserRole
+from apps.applications.models import Application, ApplicationStatus
+from .counters import reconcile_counters
+from .models import Review, ReviewDecision, ReviewTag, ReviewTagAssignment
+
+
+class CheckerCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.checker = User.objects.create_user(
+            email='checker@example.com', password='pass12345',
+            first_name='Cole', last_name='Checker', role=UserRole.CHECKER
+        )
+        cls.profile = CheckerProfile.objects.create(user=cls.checker, specialization='Law')
+        cls.student = User.objects.create_user(
+            email='student@example.com', password='pass12345',
+            first_name='Stu', last_name='Dent', role=UserRole.STUDENT
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.checker)
+
+    def create_application(self, status=ApplicationStatus.UNDER_REVIEW):
+        return Application.objects.create(
+            student=self.student,
+            assigned_checker=self.checker,
+            program_name='LLB Law',
+            academic_year='2026-2027',
+            intake_period='Fall 2026',
+            status=status
+        )
+
+    def test_create_and_submit_update_counters_in_place(self):
+        application = self.create_application()
+        response = self.client.post(
+            '/api/reviews/', {'application': application.pk, 'decision': ReviewDecision.PASS}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.total_reviews, self.profile.active_reviews), (0, 1))
+
+        # A concurrent edit of another column must survive the counter update
+        CheckerProfile.objects.filter(pk=self.profile.pk).update(specialization='Law, Politics')
+        review = Review.objects.get(application=application)
+        response = self.client.post(f'/api/reviews/{review.pk}/submit/')
+        self.assertEqual(response.status_code, 200)
+
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.total_reviews, self.profile.active_reviews), (1, 0))
+        self.assertEqual(self.profile.specialization, 'Law, Politics')
+
+    def test_reconcile_repairs_drift(self):
+        Review.objects.create(application=self.create_application(), checker=self.checker, is_complete=True)
+        Review.objects.create(application=self.create_application(), checker=self.checker)
+        Review.objects.create(application=self.create_application(ApplicationStatus.REJECTED), checker=self.checker)
+        CheckerProfile.objects.filter(pk=self.profile.pk).update(total_reviews=7, active_reviews=9)
+
+        drifted = reconcile_counters(dry_run=True)
+        self.assertEqual(len(drifted), 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.active_reviews, 9)
+
+        with CaptureQueriesContext(connection) as ctx:
+            reconcile_counters()
+        statements = [q for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        # lock profiles, one grouped count, one bulk update
+        self.assertEqual(len(statements), 3)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.total_reviews, self.profile.active_reviews), (1, 1))
+
+        call_command('reconcile_checker_stats', stdout=StringIO())
+        self.assertEqual(reconcile_counters(), [])
+
+    def test_review_update_conflict_returns_412(self):
+        review = Review.objects.create(application=self.create_application(), checker=self.checker)
+        Review.objects.filter(pk=review.pk).update(version=2)
+
+        response = self.client.patch(f'/api/reviews/{review.pk}/', {'overall_score': 8}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.patch(f'/api/reviews/{review.pk}/', {'overall_score': 8}, HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"3"')
+
+    def test_review_etag_tracks_removed_tags(self):
+        review = Review.objects.create(application=self.create_application(), checker=self.checker)
+        first = ReviewTagAssignment.objects.create(review=review, tag=ReviewTag.values[0])
+        ReviewTagAssignment.objects.create(review=review, tag=ReviewTag.values[1])
+        url = f'/api/reviews/{review.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        first.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -1,6 +1,7 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.utils import timezone
 from .models import Review, ReviewTagAssignment, DocumentReview, ReviewDecision
 from .serializers import (
@@ -8,14 +9,26 @@ from .serializers import (
     ReviewCreateSerializer, ReviewUpdateSerializer,
     ReviewTagSerializer, DocumentReviewSerializer
 )
-from apps.applications.models import Application, ApplicationStatus, ApplicationStatusHistory
-from apps.notifications.utils import create_notification
+from apps.applications.models import ApplicationEventType, ApplicationStatus
+from apps.applications.transitions import InvalidTransition, transition
+from apps.common.concurrency import OptimisticConcurrencyMixin
+from apps.common.conditional import ConditionalGetMixin, latest_related_id, related_count
+from apps.common.pagination import CursorOptInPagination
 from apps.notifications.models import NotificationType
+from .counters import review_completed, review_started
+
+DECISION_STATUSES = {
+    ReviewDecision.PASS: ApplicationStatus.PASSED,
+    ReviewDecision.REJECT: ApplicationStatus.REJECTED,
+    ReviewDecision.REQUEST_CLARIFICATION: ApplicationStatus.NEEDS_REVISION,
+    ReviewDecision.FORWARD_TO_QS: ApplicationStatus.FORWARDED_TO_QS,
+}
 
 
 class ReviewListCreateView(generics.ListCreateAPIView):
     """List and create reviews"""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -43,17 +56,24 @@ class ReviewListCreateView(generics.ListCreateAPIView):
     
     def perform_create(self, serializer):
         review = serializer.save()
-        
-        # Update checker's active reviews count
-        if hasattr(self.request.user, 'checker_profile'):
-            profile = self.request.user.checker_profile
-            profile.active_reviews += 1
-            profile.save()
+        review_started(review.checker_id)
 
 
-class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReviewDetailView(ConditionalGetMixin, OptimisticConcurrencyMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, and delete review"""
     permission_classes = [permissions.IsAuthenticated]
+    etag_fields = ('version', 'updated_at')
+
+    def get_etag_annotations(self):
+        # Tags and document reviews can be removed, so count them too
+        tags = ReviewTagAssignment.objects.all()
+        document_reviews = DocumentReview.objects.all()
+        return {
+            'tags': latest_related_id(tags, 'review'),
+            'tag_count': related_count(tags, 'review'),
+            'document_reviews': latest_related_id(document_reviews, 'review'),
+            'document_review_count': related_count(document_reviews, 'review'),
+        }
     
     def get_queryset(self):
         user = self.request.user
@@ -95,50 +115,39 @@ class ReviewSubmitView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Mark review as complete
-        review.is_complete = True
-        review.submitted_at = timezone.now()
-        review.save()
-        
-        # Update application based on decision
         application = review.application
-        
-        if review.decision == ReviewDecision.PASS:
-            application.status = ApplicationStatus.PASSED
-        elif review.decision == ReviewDecision.REJECT:
-            application.status = ApplicationStatus.REJECTED
-        elif review.decision == ReviewDecision.REQUEST_CLARIFICATION:
-            application.status = ApplicationStatus.NEEDS_REVISION
-        elif review.decision == ReviewDecision.FORWARD_TO_QS:
-            application.status = ApplicationStatus.FORWARDED_TO_QS
-        
-        application.review_completed_at = timezone.now()
-        application.save()
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                # Mark review as complete
+                review.is_complete = True
+                review.submitted_at = now
+                review.save()
 
-        ApplicationStatusHistory.objects.create(
-            application=application,
-            from_status=ApplicationStatus.UNDER_REVIEW,
-            to_status=application.status,
-            changed_by=request.user,
-            note='Review submitted'
-        )
-        
-        # Update checker stats
-        if hasattr(request.user, 'checker_profile'):
-            profile = request.user.checker_profile
-            profile.total_reviews += 1
-            profile.active_reviews = max(0, profile.active_reviews - 1)
-            profile.save()
-        
-        # Notify student
-        create_notification(
-            user=application.student,
-            notification_type=NotificationType.REVIEW_COMPLETED,
-            title='Application Review Completed',
-            message=f'Your application for {application.program_name} has been reviewed.',
-            application_id=application.id,
-            review_id=review.id
-        )
+                # Update application based on decision
+                to_status = DECISION_STATUSES.get(review.decision)
+                if to_status is None:
+                    application.review_completed_at = now
+                    application.save(update_fields=['review_completed_at', 'updated_at'])
+                else:
+                    transition(
+                        application, to_status, request.user,
+                        note='Review submitted',
+                        event_type=ApplicationEventType.REVIEW_SUBMITTED,
+                        description=f'Review submitted: {review.get_decision_display()}',
+                        changes={'review_completed_at': now},
+                        notification={
+                            'user_id': application.student_id,
+                            'notification_type': NotificationType.REVIEW_COMPLETED,
+                            'title': 'Application Review Completed',
+                            'message': f'Your application for {application.program_name} has been reviewed.',
+                            'review_id': review.id,
+                        },
+                    )
+        except InvalidTransition as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        review_completed(review.checker_id)
         
         serializer = ReviewDetailSerializer(review)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:58
+
+import warnings
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def exists(schema_editor, sql):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchone() is not None
+
+
+def trigram_available(schema_editor):
+    return exists(schema_editor, "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+
+
+def trigram_installed(schema_editor):
+    return exists(schema_editor, "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+
+
+class OptionalTrigramExtension(TrigramExtension):
+    """Skipped with a warning where the server lacks pg_trgm (postgresql-contrib)"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if trigram_available(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            warnings.warn('pg_trgm is not available: university typeahead will not work until it is installed')
+
+
+class AddTrigramIndex(migrations.AddIndex):
+    """Only created when OptionalTrigramExtension could install pg_trgm"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if trigram_installed(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if trigram_installed(schema_editor):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0001_initial'),
+    ]
+
+    operations = [
+        OptionalTrigramExtension(),
+        AddTrigramIndex(
+            model_name='program',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='programs_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddTrigramIndex(
+            model_name='university',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='universities_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from apps.countries.models import Country
 
@@ -21,6 +22,7 @@ class University(models.Model):
 			models.Index(fields=['name']),
 			models.Index(fields=['country']),
 			models.Index(fields=['qs_university_id']),
+			GinIndex(fields=['name'], name='universities_name_trgm', opclasses=['gin_trgm_ops']),
 		]
 
 	def __str__(self):
@@ -53,6 +55,7 @@ class Program(models.Model):
 		indexes = [
 			models.Index(fields=['university']),
 			models.Index(fields=['name']),
+			GinIndex(fields=['name'], name='programs_name_trgm', opclasses=['gin_trgm_ops']),
 		]
 
 	def __str__(self):
@@ -0,0 +1,61 @@
+"""
+Typeahead over university and program names.
+
+Names carry ``pg_trgm`` GIN indexes, so the ``<%`` (word similarity)
+filter is answered from the index: a query matches any name containing a
+word similar to it, which covers prefixes, substrings and small typos.
+Only the top ``limit`` rows by similarity are fetched, as plain values.
+The extension is required; the migration only skips it, with a warning,
+on servers without postgresql-contrib.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F
+
+from .models import Program, University
+
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 100
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+
+def trigram_installed():
+	with connection.cursor() as cursor:
+		cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+		return cursor.fetchone() is not None
+
+
+def search_universities(text, limit):
+	return list(
+		University.objects
+		.filter(is_active=True, name__trigram_word_similar=text)
+		.annotate(similarity=TrigramWordSimilarity(text, 'name'), country_name=F('country__name'))
+		.order_by('-similarity', 'name')
+		.values('id', 'name', 'country', 'country_name')[:limit]
+	)
+
+
+def search_programs(text, limit):
+	return list(
+		Program.objects
+		.filter(is_active=True, university__is_active=True, name__trigram_word_similar=text)
+		.annotate(
+			similarity=TrigramWordSimilarity(text, 'name'),
+			university_name=F('university__name'),
+			country_name=F('university__country__name'),
+		)
+		.order_by('-similarity', 'name')
+		.values('id', 'name', 'level', 'intake_period', 'university', 'university_name', 'country_name')[:limit]
+	)
+
+
+def typeahead(text, limit=DEFAULT_LIMIT):
+	"""Best-matching universities and programs for ``text``"""
+	text = text.strip()[:MAX_QUERY_LENGTH]
+	if len(text) < MIN_QUERY_LENGTH:
+		return {'universities': [], 'programs': []}
+	return {
+		'universities': search_universities(text, limit),
+		'programs': search_programs(text, limit),
+	}
@@ -1,3 +1,60 @@
+from unittest import SkipTest
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.countries.models import Country
+from .models import Program, University
+from .search import trigram_installed
+
+
+class TypeaheadTests(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		if not trigram_installed():
+			raise SkipTest('pg_trgm is not installed in the test database')
+		super().setUpClass()
+
+	@classmethod
+	def setUpTestData(cls):
+		uk = Country.objects.create(name='United Kingdom', iso_code='GBR')
+		japan = Country.objects.create(name='Japan', iso_code='JPN')
+		cls.imperial = University.objects.create(name='Imperial College London', country=uk, qs_university_id='1')
+		cls.tokyo = University.objects.create(name='University of Tokyo', country=japan, qs_university_id='2')
+		University.objects.create(name='Closed Institute of London', country=uk, qs_university_id='3', is_active=False)
+		cls.computing = Program.objects.create(
+			university=cls.imperial, name='MSc Computing', level='MASTER',
+			intake_period='Fall', duration_months=12
+		)
+		Program.objects.create(
+			university=cls.tokyo, name='Computer Science', level='BACHELOR',
+			intake_period='Spring', duration_months=48
+		)
+		Program.objects.create(
+			university=cls.tokyo, name='Mechanical Engineering', level='PHD',
+			intake_period='Spring', duration_months=36
+		)
+
+	def setUp(self):
+		self.client = APIClient()
+
+	def search(self, **params):
+		response = self.client.get('/api/universities/search/', params)
+		self.assertEqual(response.status_code, 200)
+		return response.data
+
+	def test_matches_substrings_and_typos_with_country_and_level(self):
+		data = self.search(q='londn')
+		self.assertEqual([row['name'] for row in data['universities']], ['Imperial College London'])
+		self.assertEqual(data['universities'][0]['country_name'], 'United Kingdom')
+
+		programs = self.search(q='comput')['programs']
+		self.assertEqual({row['name'] for row in programs}, {'MSc Computing', 'Computer Science'})
+		computing = next(row for row in programs if row['id'] == self.computing.pk)
+		self.assertEqual(computing['level'], 'MASTER')
+		self.assertEqual(computing['university_name'], 'Imperial College London')
+		self.assertEqual(computing['country_name'], 'United Kingdom')
 
-# Create your tests here.
+	def test_limit_and_short_queries(self):
+		self.assertEqual(len(self.search(q='comput', limit=1)['programs']), 1)
+		self.assertEqual(self.search(q='c'), {'universities': [], 'programs': []})
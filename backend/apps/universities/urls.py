@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import UniversityViewSet, ProgramViewSet
+from .views import UniversityViewSet, ProgramViewSet, TypeaheadView
 
 router = DefaultRouter()
 router.register(r'universities', UniversityViewSet, basename='universities')
 router.register(r'programs', ProgramViewSet, basename='programs')
 
-urlpatterns = router.urls
+urlpatterns = [
+	path('search/', TypeaheadView.as_view(), name='university-typeahead'),
+] + router.urls
@@ -1,5 +1,8 @@
 from rest_framework import viewsets, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import University, Program
+from .search import DEFAULT_LIMIT, MAX_LIMIT, typeahead
 from .serializers import UniversitySerializer, ProgramSerializer
 
 
@@ -20,3 +23,15 @@ class ProgramViewSet(viewsets.ReadOnlyModelViewSet):
 		if university_id:
 			queryset = queryset.filter(university_id=university_id)
 		return queryset
+
+
+class TypeaheadView(APIView):
+	"""Top matching universities and programs for ?q=, for the application form"""
+	permission_classes = [permissions.AllowAny]
+
+	def get(self, request):
+		try:
+			limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+		except ValueError:
+			limit = DEFAULT_LIMIT
+		return Response(typeahead(request.query_params.get('q', ''), limit))
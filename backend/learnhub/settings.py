@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -185,8 +187,42 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Conditional requests: let the SPA read ETags and send If-Match/If-None-Match
+CORS_ALLOW_HEADERS = (*default_headers, 'if-match', 'if-none-match')
+CORS_EXPOSE_HEADERS = ['ETag']
+
+# Cache Configuration
+CACHE_URL = os.environ.get('CACHE_URL', '')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Dashboard summary cache lifetime (seconds)
+SUMMARY_CACHE_TTL = int(os.environ.get('SUMMARY_CACHE_TTL', '60'))
+
+# UserSession.last_seen_at write coalescing: maximum staleness (seconds) and
+# the number of buffered sessions that triggers an immediate flush
+SESSION_ACTIVITY_FLUSH_INTERVAL = int(os.environ.get('SESSION_ACTIVITY_FLUSH_INTERVAL', '30'))
+SESSION_ACTIVITY_MAX_BUFFER = int(os.environ.get('SESSION_ACTIVITY_MAX_BUFFER', '500'))
+
+# Automatic assignment (manage.py schedule_assignments): applications examined
+# per run and the open applications a checker may hold (empty for no limit)
+ASSIGNMENT_BATCH_SIZE = int(os.environ.get('ASSIGNMENT_BATCH_SIZE', '500'))
+ASSIGNMENT_MAX_LOAD = int(os.environ['ASSIGNMENT_MAX_LOAD']) if os.environ.get('ASSIGNMENT_MAX_LOAD') else None
+
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
 EMAIL_USE_TLS = True
@@ -197,6 +233,20 @@ DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@learnhub.com'
 # File Upload Configuration
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# Document uploads stream to disk and are cut off past this size
+DOCUMENT_UPLOAD_MAX_SIZE = int(os.environ.get('DOCUMENT_UPLOAD_MAX_SIZE', 20 * 1024 * 1024))
+# Seconds an unreferenced document blob is kept before gc_document_blobs may delete it
+DOCUMENT_BLOB_GC_GRACE = int(os.environ.get('DOCUMENT_BLOB_GC_GRACE', 3600))
+# Resumable uploads: size limit, local directory for partial files, idle seconds before expiry
+DOCUMENT_RESUMABLE_MAX_SIZE = int(os.environ.get('DOCUMENT_RESUMABLE_MAX_SIZE', 500 * 1024 * 1024))
+DOCUMENT_PARTIAL_UPLOAD_DIR = os.environ.get('DOCUMENT_PARTIAL_UPLOAD_DIR', str(BASE_DIR / 'partial_uploads'))
+DOCUMENT_UPLOAD_SESSION_TTL = int(os.environ.get('DOCUMENT_UPLOAD_SESSION_TTL', 24 * 3600))
+# Hand document downloads to the front proxy: '' (stream from Django), 'x-accel-redirect' (nginx) or 'x-sendfile'
+DOCUMENT_DOWNLOAD_OFFLOAD = os.environ.get('DOCUMENT_DOWNLOAD_OFFLOAD', '')
+DOCUMENT_ACCEL_REDIRECT_PREFIX = os.environ.get('DOCUMENT_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+# Signed document URLs (file_url): HMAC key (defaults to SECRET_KEY) and lifetime in seconds
+DOCUMENT_URL_SIGNING_KEY = os.environ.get('DOCUMENT_URL_SIGNING_KEY', '')
+DOCUMENT_URL_TTL = int(os.environ.get('DOCUMENT_URL_TTL', 3600))
 
 # S3 Storage Configuration (Optional)
 USE_S3 = os.environ.get('USE_S3', 'False') == 'True'
@@ -206,7 +256,9 @@ if USE_S3:
     AWS_SECRET_ACCESS_KEY = os.environ.get('AWS_SECRET_ACCESS_KEY')
     AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
     AWS_S3_REGION_NAME = os.environ.get('AWS_S3_REGION_NAME', 'us-east-1')
-    AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
+    # Private objects behind presigned URLs (a custom domain would disable signing)
+    AWS_QUERYSTRING_AUTH = True
+    AWS_QUERYSTRING_EXPIRE = DOCUMENT_URL_TTL
     AWS_S3_FILE_OVERWRITE = False
     AWS_DEFAULT_ACL = None
     DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
@@ -80,6 +80,8 @@ export const authAPI = {
   revokeSession: (sessionId: string) => api.post(`/auth/sessions/revoke/${sessionId}/`),
   revokeOtherSessions: (currentSessionId?: string) =>
     api.post('/auth/sessions/revoke-others/', { current_session_id: currentSessionId }),
+  revokeAllSessions: (target: { user_id?: number; role?: string }) =>
+    api.post('/auth/sessions/revoke-all/', target),
   listUsers: (role?: string) => api.get('/auth/users/', { params: { role } }),
   createUser: (data: any) => api.post('/auth/users/', data),
   listRoles: () => api.get('/auth/roles/'),
@@ -90,14 +92,23 @@ export const authAPI = {
 
 // Applications API
 export const applicationsAPI = {
-  list: () => api.get('/applications/'),
+  list: (q?: string) => api.get('/applications/', { params: { q } }),
+  stats: () => api.get('/applications/stats/'),
   create: (data: any) => api.post('/applications/', data),
   get: (id: number) => api.get(`/applications/${id}/`),
+  timeline: (id: number, cursor?: string) =>
+    api.get(`/applications/${id}/timeline/`, { params: { cursor } }),
+  statusHistory: (id: number, cursor?: string) =>
+    api.get(`/applications/${id}/status-history/`, { params: { cursor } }),
   update: (id: number, data: any) => api.patch(`/applications/${id}/`, data),
   delete: (id: number) => api.delete(`/applications/${id}/`),
   submit: (id: number) => api.post(`/applications/${id}/submit/`),
   assign: (id: number, checkerId: number) =>
     api.post(`/applications/${id}/assign/`, { checker_id: checkerId }),
+  bulkAssign: (applicationIds: number[], checkerIds?: number[]) =>
+    api.post('/applications/bulk-assign/', checkerIds
+      ? { application_ids: applicationIds, checker_ids: checkerIds }
+      : { application_ids: applicationIds, auto: true }),
   updateStatus: (id: number, data: any) => api.patch(`/applications/${id}/status/`, data),
 };
 
@@ -110,9 +121,26 @@ export const documentsAPI = {
       headers: { 'Content-Type': 'multipart/form-data' },
     }),
   get: (id: number) => api.get(`/documents/${id}/`),
+  download: (id: number) => api.get<Blob>(`/documents/${id}/download/`, { responseType: 'blob' }),
   delete: (id: number) => api.delete(`/documents/${id}/`),
   verify: (id: number, status: string, notes?: string) =>
     api.post(`/documents/${id}/verify/`, { status, verification_notes: notes }),
+  // Resumable uploads: start, send chunks from the returned offset, then complete
+  startUpload: (data: {
+    application: number;
+    document_type: string;
+    title: string;
+    description?: string;
+    file_name: string;
+    size: number;
+  }) => api.post('/documents/uploads/', data),
+  uploadProgress: (uploadId: number) => api.get(`/documents/uploads/${uploadId}/`),
+  uploadChunk: (uploadId: number, offset: number, chunk: Blob) =>
+    api.patch(`/documents/uploads/${uploadId}/`, chunk, {
+      headers: { 'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': String(offset) },
+    }),
+  completeUpload: (uploadId: number) => api.post(`/documents/uploads/${uploadId}/complete/`),
+  cancelUpload: (uploadId: number) => api.delete(`/documents/uploads/${uploadId}/`),
 };
 
 // Reviews API
@@ -147,6 +175,7 @@ export const universitiesAPI = {
   list: () => api.get('/universities/universities/'),
   programs: (universityId?: number) =>
     api.get('/universities/programs/', { params: { university_id: universityId } }),
+  search: (q: string, limit?: number) => api.get('/universities/search/', { params: { q, limit } }),
 };
 
 // QS Rankings API
@@ -163,6 +192,7 @@ export const countriesAPI = {
 // Analytics API (Admin)
 export const analyticsAPI = {
   daily: () => api.get('/analytics/daily/'),
+  summary: () => api.get('/analytics/summary/'),
 };
 
 // Audit API (Admin)
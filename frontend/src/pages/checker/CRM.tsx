@@ -6,6 +6,17 @@ export default function CheckerCRM() {
     applicationsAPI.list().then((res) => res.data)
   );
 
+  const { data: summary } = useQuery('checker-summary', () =>
+    applicationsAPI.stats().then((res) => res.data)
+  );
+
+  const byStatus = summary?.applications?.by_status || {};
+  const totals: Record<string, number> = {
+    New: byStatus.SUBMITTED || 0,
+    'In Review': byStatus.UNDER_REVIEW || 0,
+    Completed: (byStatus.PASSED || 0) + (byStatus.REJECTED || 0),
+  };
+
   const grouped = {
     New: applications?.results?.filter((a: any) => a.status === 'SUBMITTED') || [],
     'In Review': applications?.results?.filter((a: any) => a.status === 'UNDER_REVIEW') || [],
@@ -21,7 +32,9 @@ export default function CheckerCRM() {
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
         {Object.entries(grouped).map(([stage, list]) => (
           <div key={stage} className="bg-white dark:bg-gray-800 rounded-lg shadow-lg p-4">
-            <h2 className="text-sm font-semibold text-gray-700 dark:text-gray-200 mb-3">{stage}</h2>
+            <h2 className="text-sm font-semibold text-gray-700 dark:text-gray-200 mb-3">
+              {stage} <span className="text-gray-400">({totals[stage]})</span>
+            </h2>
             <div className="space-y-3">
               {list.map((app: any) => (
                 <div key={app.id} className="p-3 bg-gray-50 dark:bg-gray-700 rounded-lg">
@@ -1,6 +1,6 @@
 import { useMemo, useState } from 'react';
 import { useQuery } from 'react-query';
-import { applicationsAPI, notificationsAPI, reviewsAPI } from '@/api/client';
+import { applicationsAPI, notificationsAPI } from '@/api/client';
 import { Link, useNavigate } from 'react-router-dom';
 import {
   ClipboardDocumentListIcon,
@@ -20,22 +20,19 @@ export default function CheckerDashboard() {
     applicationsAPI.list().then((res) => res.data)
   );
 
-  const { data: reviews } = useQuery('checker-reviews', () =>
-    reviewsAPI.list().then((res) => res.data)
-  );
-
   const { data: notifications } = useQuery('checker-notifications', () =>
     notificationsAPI.list().then((res) => res.data)
   );
 
-  const assignedCount = applications?.results?.length || 0;
-  const completedReviews = reviews?.results?.filter((r: any) => r.is_complete).length || 0;
-  const pendingReviews = reviews?.results?.filter((r: any) => !r.is_complete).length || 0;
-  const averageScore = reviews?.results?.length
-    ? (
-        reviews.results.reduce((sum: number, r: any) => sum + (r.overall_score || 0), 0) /
-        reviews.results.length
-      ).toFixed(1)
+  const { data: summary } = useQuery('checker-summary', () =>
+    applicationsAPI.stats().then((res) => res.data)
+  );
+
+  const assignedCount = summary?.applications?.total || 0;
+  const completedReviews = summary?.reviews?.completed || 0;
+  const pendingReviews = summary?.reviews?.pending || 0;
+  const averageScore = summary?.reviews?.average_scores?.overall != null
+    ? Number(summary.reviews.average_scores.overall).toFixed(1)
     : '0.0';
 
   const stats = [